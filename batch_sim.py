@@ -0,0 +1,325 @@
+"""Headless batch simulation runner for balancing Space Station Siege.
+
+Fans whole game sessions out over a multiprocessing pool, one seed per job.
+Each session is played by a scripted or random agent through the same input
+handlers and update pipeline the game uses, with no window or GL drawing.
+Results stream back as compact tuples and are aggregated as they arrive.
+
+Example:
+    python batch_sim.py --sessions 2000 --agent scripted --set tank.speed=75
+"""
+
+import argparse
+import math
+import multiprocessing
+import os
+import random
+import sys
+import time
+from collections import deque
+
+import project as game
+
+# Fields of each result record, in order
+RECORD_FIELDS = ("seed", "survival_time", "score", "damage_taken", "level", "won")
+# Metrics aggregated across sessions
+AGGREGATE_FIELDS = ("survival_time", "score", "damage_taken", "level", "won")
+
+AGENT_AIM_RANGE = 600.0  # Scripted agent only shoots at enemies this close
+AGENT_DECISION_INTERVAL = 0.5  # Seconds between random agent decisions
+
+# (forward, strafe) key combinations and the keys that produce them
+MOVE_KEYS = {
+    (1, 0): [b"w"],
+    (-1, 0): [b"s"],
+    (0, 1): [b"d"],
+    (0, -1): [b"a"],
+    (1, 1): [b"w", b"d"],
+    (1, -1): [b"w", b"a"],
+    (-1, 1): [b"s", b"d"],
+    (-1, -1): [b"s", b"a"],
+}
+
+
+# --- Agents ---
+def press_move_towards(target_angle):
+    """Presses the W/A/S/D combination that moves closest to target_angle."""
+    best_keys = []
+    best_diff = 360.0
+    for (forward, strafe), move_keys in MOVE_KEYS.items():
+        # update_player moves along angle for W and angle + 90 for D
+        move_angle = game.player["angle"] + math.degrees(math.atan2(strafe, forward))
+        diff = abs((target_angle - move_angle + 180) % 360 - 180)
+        if diff < best_diff:
+            best_diff = diff
+            best_keys = move_keys
+    game.keys_pressed.update(best_keys)
+
+
+def fire():
+    """Pulls the trigger through the normal mouse handler."""
+    game.mouse_click(game.GLUT_LEFT_BUTTON, game.GLUT_DOWN, 0, 0)
+
+
+def find_path_step(target_x, target_y):
+    """Returns the centre of the next grid cell on a shortest path to the target."""
+    layout = game.LEVEL_LAYOUTS[game.level - 1]
+    start = (int(game.player["x"] // game.CELL_SIZE), int(game.player["y"] // game.CELL_SIZE))
+    goal = (int(target_x // game.CELL_SIZE), int(target_y // game.CELL_SIZE))
+    came_from = {start: None}
+    frontier = deque([start])
+    while frontier:
+        cell = frontier.popleft()
+        if cell == goal:
+            break
+        x, y = cell
+        for next_cell in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+            nx, ny = next_cell
+            if next_cell not in came_from and layout[ny][nx] != 1:
+                came_from[next_cell] = cell
+                frontier.append(next_cell)
+
+    if goal not in came_from or goal == start:
+        return target_x, target_y
+    cell = goal
+    while came_from[cell] != start:
+        cell = came_from[cell]
+    return (cell[0] + 0.5) * game.CELL_SIZE, (cell[1] + 0.5) * game.CELL_SIZE
+
+
+def scripted_agent(rng, memory):
+    """Heads for the nearest broken system, repairs it, and shoots what it can."""
+    player = game.player
+    targets = [s for s in game.systems if not s["repaired"]]
+    if targets:
+        target = min(
+            targets, key=lambda s: game.distance(player["x"], player["y"], s["x"], s["y"])
+        )
+        if game.distance(player["x"], player["y"], target["x"], target["y"]) < (
+            game.SYSTEM_REPAIR_RADIUS * 0.8
+        ):
+            game.keys_pressed.add(b"r")
+        else:
+            step_x, step_y = find_path_step(target["x"], target["y"])
+            press_move_towards(
+                math.degrees(math.atan2(step_y - player["y"], step_x - player["x"]))
+            )
+
+    if game.enemies and not game.repairing:
+        enemy = min(
+            game.enemies,
+            key=lambda e: game.distance(player["x"], player["y"], e["x"], e["y"]),
+        )
+        dist = game.distance(player["x"], player["y"], enemy["x"], enemy["y"])
+        if dist < AGENT_AIM_RANGE:
+            size = game.ENEMY_TYPES[enemy["type"]]["size"]
+            player["angle"] = math.degrees(
+                math.atan2(enemy["y"] - player["y"], enemy["x"] - player["x"])
+            ) % 360
+            gun_z = player["z"] + game.PLAYER_GUN_UP  # Bullet spawn height used by mouse_click
+            player["pitch"] = max(
+                game.PITCH_MIN,
+                min(game.PITCH_MAX, math.degrees(math.atan2(enemy["z"] + size * 0.7 - gun_z, dist))),
+            )
+            fire()
+
+
+def random_agent(rng, memory):
+    """Wanders, turns and fires at random, re-deciding every AGENT_DECISION_INTERVAL."""
+    if game.sim_time >= memory.get("next_decision", 0.0):
+        memory["next_decision"] = game.sim_time + AGENT_DECISION_INTERVAL
+        memory["keys"] = rng.choice(list(MOVE_KEYS.values()) + [[], [b"r"]])
+        memory["turn"] = rng.uniform(-180.0, 180.0)
+        memory["firing"] = rng.random() < 0.5
+    game.keys_pressed.update(memory["keys"])
+    game.player["angle"] = (
+        game.player["angle"] + memory["turn"] / game.SIM_TICK_RATE
+    ) % 360
+    if memory["firing"]:
+        fire()
+
+
+AGENTS = {"scripted": scripted_agent, "random": random_agent}
+
+
+def handle_menus(rng):
+    """Gets past the level complete and upgrade screens like a player would."""
+    if game.level_complete:
+        game.keyboard_down(b" ", 0, 0)
+    elif game.upgrading:
+        affordable = [
+            choice
+            for choice, cost in ((1, 50), (2, 30), (3, 40), (4, 80))
+            if game.points_available >= cost
+        ]
+        if affordable:
+            game.keyboard_down(str(rng.choice(affordable)).encode(), 0, 0)
+        else:
+            game.keyboard_down(b" ", 0, 0)
+
+
+# --- Sessions ---
+def apply_overrides(enemy_overrides, spawn_overrides):
+    """Applies balancing overrides to this process's copy of the game tables."""
+    for enemy_type, field, value in enemy_overrides:
+        game.ENEMY_TYPES[enemy_type][field] = value
+    for enemy_type, counts in spawn_overrides:
+        game.SPAWN_COUNTS[enemy_type] = counts
+    game.compile_enemy_archetypes()
+
+
+def init_worker(enemy_overrides, spawn_overrides):
+    """Pool initializer: silences the game log and applies overrides."""
+    game.set_event_log_level("off")
+    game.AI_BUDGET_US = 0  # A wall-clock budget would make sessions irreproducible
+    apply_overrides(enemy_overrides, spawn_overrides)
+
+
+def run_session(job):
+    """Plays one session to game over or the time limit; returns a result record."""
+    seed, agent_name, max_time = job
+    random.seed(seed)  # Enemy spawns and powerups use the global generator
+    rng = random.Random(seed)
+    agent = AGENTS[agent_name]
+    memory = {}
+    tick = 1.0 / game.SIM_TICK_RATE
+
+    game.keys_pressed.clear()
+    game.special_keys_pressed.clear()
+    game.reset_game()
+    start_time = game.sim_time
+    damage_taken = 0
+
+    while not game.game_over and game.sim_time - start_time < max_time:
+        if game.level_complete or game.upgrading:
+            handle_menus(rng)
+            continue
+        game.keys_pressed.clear()
+        agent(rng, memory)
+        before = game.player["health"] + game.player.get("shield", 0)
+        game.step_simulation(tick)
+        after = game.player["health"] + game.player.get("shield", 0)
+        if after < before:
+            damage_taken += before - after
+
+    won = game.level > len(game.LEVEL_LAYOUTS)
+    return (
+        seed,
+        round(game.sim_time - start_time, 3),
+        game.score,
+        damage_taken,
+        min(game.level, len(game.LEVEL_LAYOUTS)),
+        int(won),
+    )
+
+
+# --- Aggregation ---
+def new_aggregate():
+    """Returns empty running statistics for every aggregated metric."""
+    return {
+        field: {"count": 0, "mean": 0.0, "m2": 0.0, "min": math.inf, "max": -math.inf}
+        for field in AGGREGATE_FIELDS
+    }
+
+
+def update_aggregate(aggregate, record):
+    """Folds one record into the running statistics (Welford's algorithm)."""
+    values = dict(zip(RECORD_FIELDS, record))
+    for field, stats in aggregate.items():
+        value = values[field]
+        stats["count"] += 1
+        delta = value - stats["mean"]
+        stats["mean"] += delta / stats["count"]
+        stats["m2"] += delta * (value - stats["mean"])
+        stats["min"] = min(stats["min"], value)
+        stats["max"] = max(stats["max"], value)
+
+
+def format_aggregate(aggregate):
+    """Returns the running statistics as a small text table."""
+    lines = [f"{'metric':<14}{'mean':>10}{'std':>10}{'min':>10}{'max':>10}"]
+    for field, stats in aggregate.items():
+        std = math.sqrt(stats["m2"] / stats["count"]) if stats["count"] else 0.0
+        lines.append(
+            f"{field:<14}{stats['mean']:>10.2f}{std:>10.2f}"
+            f"{stats['min']:>10.2f}{stats['max']:>10.2f}"
+        )
+    return "\n".join(lines)
+
+
+def parse_enemy_override(text):
+    """Parses TYPE.FIELD=VALUE into an ENEMY_TYPES override."""
+    key, value = text.split("=", 1)
+    enemy_type, field = key.split(".", 1)
+    if enemy_type not in game.ENEMY_TYPES:
+        raise argparse.ArgumentTypeError(f"unknown enemy type {enemy_type!r}")
+    return enemy_type, field, float(value)
+
+
+def parse_spawn_override(text):
+    """Parses TYPE=BASE,PER_LEVEL into a SPAWN_COUNTS override."""
+    enemy_type, counts = text.split("=", 1)
+    base, per_level = (int(count) for count in counts.split(","))
+    return enemy_type, (base, per_level)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=1000)
+    parser.add_argument("--agent", choices=sorted(AGENTS), default="scripted")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first session")
+    parser.add_argument(
+        "--max-time", type=float, default=300.0, help="simulated seconds per session"
+    )
+    parser.add_argument("--processes", type=int, default=os.cpu_count())
+    parser.add_argument(
+        "--set", dest="enemy_overrides", action="append", default=[],
+        type=parse_enemy_override, metavar="TYPE.FIELD=VALUE",
+        help="override an ENEMY_TYPES value, e.g. scout.speed=120",
+    )
+    parser.add_argument(
+        "--spawn", dest="spawn_overrides", action="append", default=[],
+        type=parse_spawn_override, metavar="TYPE=BASE,PER_LEVEL",
+        help="override a SPAWN_COUNTS entry, e.g. tank=0,1",
+    )
+    parser.add_argument("--output", help="also write every record to this CSV file")
+    args = parser.parse_args(argv)
+
+    jobs = [
+        (seed, args.agent, args.max_time)
+        for seed in range(args.seed, args.seed + args.sessions)
+    ]
+    # Large enough chunks to amortise IPC, small enough to keep every core busy
+    chunksize = max(1, args.sessions // (args.processes * 8))
+    aggregate = new_aggregate()
+    output = open(args.output, "w") if args.output else None
+    if output:
+        output.write(",".join(RECORD_FIELDS) + "\n")
+
+    start = time.perf_counter()
+    with multiprocessing.Pool(
+        args.processes,
+        initializer=init_worker,
+        initargs=(args.enemy_overrides, args.spawn_overrides),
+    ) as pool:
+        for done, record in enumerate(
+            pool.imap_unordered(run_session, jobs, chunksize), start=1
+        ):
+            update_aggregate(aggregate, record)
+            if output:
+                output.write(",".join(str(value) for value in record) + "\n")
+            if done % max(1, args.sessions // 10) == 0:
+                print(f"{done}/{args.sessions} sessions", file=sys.stderr)
+    elapsed = time.perf_counter() - start
+
+    if output:
+        output.close()
+    print(format_aggregate(aggregate))
+    print(
+        f"{args.sessions} sessions in {elapsed:.1f}s "
+        f"({args.sessions / elapsed:.1f}/s on {args.processes} processes)"
+    )
+
+
+if __name__ == "__main__":
+    main()
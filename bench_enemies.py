@@ -0,0 +1,65 @@
+"""Enemy update benchmark for large waves.
+
+Fills level 3 with enemies and times update_enemies per tick, with the
+separation pass timed on its own, for several wave sizes. Cost per enemy
+should stay roughly flat as waves grow, since neighbours come from a grid.
+
+Example:
+    python bench_enemies.py --counts 500 1000 2000
+"""
+
+import argparse
+import random
+import time
+
+import project as game
+
+
+def run(count, ticks, seed):
+    """Returns (update_enemies us/tick, separate_enemies us/tick) for a wave of count enemies."""
+    random.seed(seed)
+    game.reset_game()
+    game.level = 3
+    game.reset_level()
+    game.player["health"] = float("inf")  # Keep the wave alive for every tick
+    names = list(game.SPAWN_COUNTS)
+    while len(game.enemies) < count:
+        game.spawn_enemy(names[len(game.enemies) % len(names)])
+
+    separate = game.separate_enemies
+    separation_time = [0.0]
+
+    def timed_separate(group, dt):
+        start = time.perf_counter()
+        separate(group, dt)
+        separation_time[0] += time.perf_counter() - start
+
+    game.separate_enemies = timed_separate
+    try:
+        dt = 1.0 / game.SIM_TICK_RATE
+        start = time.perf_counter()
+        for _ in range(ticks):
+            game.step_simulation(dt)
+        elapsed = time.perf_counter() - start
+    finally:
+        game.separate_enemies = separate
+    return elapsed / ticks * 1e6, separation_time[0] / ticks * 1e6
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--counts", type=int, nargs="+", default=[250, 500, 1000, 2000])
+    parser.add_argument("--ticks", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    game.set_event_log_level("off")
+    game.AI_BUDGET_US = 0  # Time every decision, not just what fits the budget
+    print(f"{'enemies':>8}{'tick us':>10}{'separation us':>15}{'us/enemy':>10}")
+    for count in args.counts:
+        tick_us, separation_us = run(count, args.ticks, args.seed)
+        print(f"{count:>8}{tick_us:>10.0f}{separation_us:>15.0f}{separation_us / count:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
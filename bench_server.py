@@ -0,0 +1,172 @@
+"""Localhost load test for server.py.
+
+Starts a server process and scripted bot clients on 127.0.0.1 for each
+player count, and reports snapshot size, bandwidth per client and the
+server's tick time as players are added. Bots use the same protocol as
+client.py: they join, send an INPUT every tick, and decode every snapshot
+that arrives. Like batch_sim's random agent, they wander, turn and pull
+the trigger at random.
+
+Example:
+    python bench_server.py --players 2
+    python bench_server.py --players 1 2 4 8 16 --seconds 10
+"""
+
+import argparse
+import multiprocessing
+import random
+import select
+import socket
+import time
+
+import net_protocol as net
+import project as game
+import server
+from game_data import *
+
+STARTUP_SECONDS = 5.0  # Longest wait for the server process to answer joins
+BOT_DECISION_INTERVAL = 0.5  # Seconds between bot decisions
+BOT_BUTTONS = (0, 1, 2, 4, 8, 1 | 4, 1 | 8, 16)  # Idle, W, S, A, D, W+A, W+D, R
+
+
+def find_free_port():
+    """Returns a UDP port nothing on localhost is bound to right now."""
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def run_server(port, duration, seed, results):
+    """Server process body: serves for duration seconds, then sends back server_stats."""
+    game.set_event_log_level("warning")
+    random.seed(seed)
+    results.put(server.serve(port, duration))
+
+
+# --- Bots ---
+def join_bot(address):
+    """Returns a non-blocking socket that has joined the server at address."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    deadline = time.perf_counter() + STARTUP_SECONDS
+    while time.perf_counter() < deadline:
+        sock.sendto(net.TYPE.pack(net.MSG_JOIN), address)
+        if select.select([sock], [], [], NET_JOIN_RETRY)[0]:
+            try:
+                data = sock.recv(65536)
+            except ConnectionError:
+                time.sleep(NET_JOIN_RETRY)  # Server process not listening yet
+                continue
+            if data[0] == net.MSG_WELCOME:
+                sock.setblocking(False)
+                return sock
+            raise RuntimeError(f"server refused bot: message type {data[0]}")
+    raise RuntimeError("server did not answer")
+
+
+def run_bots(address, count, seconds, seed):
+    """Plays count bots for seconds; returns per-bot totals.
+
+    Each total is {"snapshots", "bytes_in", "bytes_out"}.
+    """
+    rng = random.Random(seed)
+    bots = [
+        {"socket": join_bot(address), "sequence": 0, "shots": 0, "angle": 0.0,
+         "next_decision": 0.0, "buttons": 0, "turn": 0.0, "firing": False,
+         "snapshots": 0, "bytes_in": 0, "bytes_out": 0}
+        for _ in range(count)
+    ]
+    sockets = [bot["socket"] for bot in bots]
+    tick = 1.0 / SIM_TICK_RATE
+    start = time.perf_counter()
+    next_tick_time = start
+    while next_tick_time - start < seconds:
+        now = next_tick_time - start
+        for bot in bots:
+            if now >= bot["next_decision"]:
+                bot["next_decision"] = now + BOT_DECISION_INTERVAL
+                bot["buttons"] = rng.choice(BOT_BUTTONS)
+                bot["turn"] = rng.uniform(-180.0, 180.0)
+                bot["firing"] = rng.random() < 0.5
+            bot["angle"] = (bot["angle"] + bot["turn"] * tick) % 360
+            if bot["firing"]:
+                bot["shots"] += 1
+            data = net.pack_input(bot["sequence"], bot["buttons"], bot["shots"], bot["angle"], 0.0)
+            bot["socket"].sendto(data, address)
+            bot["sequence"] += 1
+            bot["bytes_out"] += len(data)
+
+        next_tick_time += tick
+        while True:
+            remaining = next_tick_time - time.perf_counter()
+            if remaining <= 0:
+                break
+            for sock in select.select(sockets, [], [], remaining)[0]:
+                receive_bot(bots[sockets.index(sock)])
+
+    for bot in bots:
+        bot["socket"].sendto(net.TYPE.pack(net.MSG_LEAVE), address)
+        bot["socket"].close()
+    return [{key: bot[key] for key in ("snapshots", "bytes_in", "bytes_out")} for bot in bots]
+
+
+def receive_bot(bot):
+    """Reads and decodes everything waiting for one bot."""
+    while True:
+        try:
+            data = bot["socket"].recv(65536)
+        except (BlockingIOError, ConnectionError):
+            return
+        bot["bytes_in"] += len(data)
+        if data[0] == net.MSG_SNAPSHOT:
+            net.unpack_snapshot(data)
+            bot["snapshots"] += 1
+
+
+# --- Benchmark ---
+def run(players, seconds, seed):
+    """Returns (per-bot totals, server_stats) for one server with players bots."""
+    port = find_free_port()
+    results = multiprocessing.Queue()
+    process = multiprocessing.Process(
+        target=run_server, args=(port, STARTUP_SECONDS + seconds + 1.0, seed, results)
+    )
+    process.start()
+    try:
+        totals = run_bots(("127.0.0.1", port), players, seconds, seed)
+        stats = results.get(timeout=STARTUP_SECONDS + seconds + 10.0)
+    finally:
+        process.join(timeout=5.0)
+        if process.is_alive():
+            process.terminate()
+    return totals, stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--players", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--seconds", type=float, default=5.0, help="play time per player count")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    print(
+        f"{'players':>8}{'snapshot B':>12}{'snaps/s':>9}{'down KB/s':>11}{'up KB/s':>9}"
+        f"{'server KB/s':>13}{'tick ms':>9}{'max ms':>8}"
+    )
+    for players in args.players:
+        totals, stats = run(players, args.seconds, args.seed)
+        snapshots = sum(t["snapshots"] for t in totals)
+        bytes_in = sum(t["bytes_in"] for t in totals)
+        bytes_out = sum(t["bytes_out"] for t in totals)
+        print(
+            f"{players:>8}{bytes_in / max(1, snapshots):>12.0f}"
+            f"{snapshots / players / args.seconds:>9.1f}"
+            f"{bytes_in / players / args.seconds / 1024:>11.2f}"
+            f"{bytes_out / players / args.seconds / 1024:>9.2f}"
+            f"{stats['bytes_sent'] / args.seconds / 1024:>13.1f}"
+            f"{stats['tick_seconds'] / max(1, stats['ticks']) * 1000:>9.2f}"
+            f"{stats['max_tick_seconds'] * 1000:>8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Import-time budget check for the modules headless tools depend on.
+
+Imports each module in a fresh interpreter, best of a few runs. Exits
+non-zero if any import exceeds its budget or loads PyOpenGL, which only
+render.py may do.
+
+Example:
+    python check_import_time.py
+"""
+
+import subprocess
+import sys
+
+# Module -> budget in milliseconds, measured from first import to return
+IMPORT_BUDGETS_MS = {
+    "game_data": 10.0,
+    "project": 50.0,
+    "batch_sim": 100.0,
+    "server": 100.0,
+}
+RUNS = 3
+
+MEASURE_SCRIPT = """
+import sys, time
+start = time.perf_counter()
+import {module}
+print((time.perf_counter() - start) * 1000.0, "OpenGL" in sys.modules)
+"""
+
+
+def measure_import(module):
+    """Returns (milliseconds, loaded_opengl) for importing module in a new process."""
+    output = subprocess.run(
+        [sys.executable, "-c", MEASURE_SCRIPT.format(module=module)],
+        capture_output=True, text=True, check=True,
+    ).stdout.split()
+    return float(output[0]), output[1] == "True"
+
+
+def main():
+    failed = False
+    for module, budget in IMPORT_BUDGETS_MS.items():
+        results = [measure_import(module) for _ in range(RUNS)]
+        elapsed = min(ms for ms, _ in results)
+        loaded_opengl = any(opengl for _, opengl in results)
+        ok = elapsed <= budget and not loaded_opengl
+        failed |= not ok
+        note = " (imports PyOpenGL)" if loaded_opengl else ""
+        print(f"{'ok' if ok else 'FAIL':<5}{module:<12}{elapsed:8.1f} ms / {budget:.0f} ms{note}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
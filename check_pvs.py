@@ -0,0 +1,53 @@
+"""Conservativeness check for the occlusion culling visibility sets.
+
+Casts random sight lines between random points of open cells, much
+denser than the sample points the sets are built from. Exits non-zero
+if any clear line joins two cells that are missing from each other's
+potentially visible set, which would make visible walls pop out.
+
+Example:
+    python check_pvs.py --lines 200000
+"""
+
+import argparse
+import random
+import sys
+
+from game_data import LEVEL_LAYOUTS
+from project import build_potentially_visible_sets, is_sight_line_clear
+
+
+def find_missing_pairs(layout, lines, rng):
+    """Returns the (from, to) cell pairs joined by a clear random line but not in the sets."""
+    pvs = build_potentially_visible_sets(layout)
+    cells = list(pvs)
+    missing = set()
+    for _ in range(lines):
+        a = rng.choice(cells)
+        b = rng.choice(cells)
+        x0, y0 = a[0] + rng.random(), a[1] + rng.random()
+        x1, y1 = b[0] + rng.random(), b[1] + rng.random()
+        if b not in pvs[a] and is_sight_line_clear(layout, x0, y0, x1, y1):
+            missing.add((a, b))
+    return missing
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--lines", type=int, default=200000, help="Random sight lines per level")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    failed = False
+    for index, layout in enumerate(LEVEL_LAYOUTS):
+        missing = find_missing_pairs(layout, args.lines, rng)
+        failed |= bool(missing)
+        print(f"{'ok' if not missing else 'FAIL':<5}level {index + 1:<4}{len(missing)} missing pairs")
+        for a, b in sorted(missing)[:5]:
+            print(f"       {a} sees {b}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,290 @@
+"""Networked GLUT client for co-op Space Station Siege.
+
+Joins a server.py session over UDP and draws it with render.py. There is
+no local simulation: a network thread takes the place of the simulation
+thread. It sends the held keys, aim and trigger pulls every tick, and
+turns each SNAPSHOT into the same state dict capture_state() builds.
+Those go through the simulation thread's double buffer, so display()
+draws them unchanged, interpolating between the last two snapshots.
+
+Aim stays local: mouse look turns the camera at once, and the server
+takes the angle from the next INPUT.
+
+Example:
+    python client.py --host 192.168.1.20
+"""
+
+import argparse
+import atexit
+import select
+import socket
+import struct
+import sys
+import threading
+import time
+
+import net_protocol as net
+import project as game
+from game_data import *
+
+# Connection state
+connection = {
+    "socket": None,
+    "server": None,  # (host, port)
+    "player_id": None,
+    "sequence": 0,  # Next INPUT sequence number
+    "shots": 0,  # Trigger pulls so far, wrapping at 256
+    "last_snapshot": None,  # Sequence number of the newest snapshot applied
+    "previous": {},  # (kind, id) -> entity from the newest snapshot, for interpolation
+    "flash_until": {},  # player id -> sim_time their muzzle flash ends
+    "tick": 0,  # Server tick of the newest snapshot applied
+}
+
+
+# --- Connection ---
+def join(host, port):
+    """Asks the server for a player slot; returns the player id or exits."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    server = (socket.gethostbyname(host), port)
+    deadline = time.perf_counter() + NET_CLIENT_TIMEOUT
+    while time.perf_counter() < deadline:
+        sock.sendto(net.TYPE.pack(net.MSG_JOIN), server)
+        if not select.select([sock], [], [], NET_JOIN_RETRY)[0]:
+            continue
+        try:
+            data, address = sock.recvfrom(65536)
+        except ConnectionError:
+            time.sleep(NET_JOIN_RETRY)  # Nothing listening yet
+            continue
+        if data[:1] == net.TYPE.pack(net.MSG_FULL):
+            sys.exit(f"Server {host}:{port} is full.")
+        if len(data) == net.WELCOME.size and data[0] == net.MSG_WELCOME:
+            connection.update(socket=sock, server=server, player_id=data[1])
+            sock.setblocking(False)
+            return data[1]
+    sys.exit(f"No answer from {host}:{port}.")
+
+
+def leave():
+    """Tells the server this player is gone."""
+    if connection["socket"] is not None:
+        connection["socket"].sendto(net.TYPE.pack(net.MSG_LEAVE), connection["server"])
+
+
+def send_input():
+    """Sends this tick's held keys, aim and trigger pull count."""
+    player = game.player
+    connection["socket"].sendto(
+        net.pack_input(
+            connection["sequence"], net.keys_to_buttons(game.keys_pressed),
+            connection["shots"], player["angle"], player["pitch"],
+        ),
+        connection["server"],
+    )
+    connection["sequence"] += 1
+
+
+def drain_client_input():
+    """Runs queued window input against the local view state.
+
+    Mouse clicks are taken here: a left click counts a trigger pull for
+    the server, a right click switches camera. Everything else (keys,
+    arrows, mouse look) uses the normal handlers.
+    """
+    while game.input_queue:
+        handler, args = game.input_queue.popleft()
+        if handler is game.mouse_click:
+            button, state = args[:2]
+            if state != game.GLUT_DOWN:
+                continue
+            if button == game.GLUT_LEFT_BUTTON:
+                connection["shots"] = (connection["shots"] + 1) % 256
+            elif button == game.GLUT_RIGHT_BUTTON:
+                game.camera_mode = "first" if game.camera_mode == "third" else "third"
+        else:
+            handler(*args)
+
+
+def receive_snapshots():
+    """Reads every waiting datagram; returns the newest snapshot, or None."""
+    newest = None
+    while True:
+        try:
+            data, address = connection["socket"].recvfrom(65536)
+        except BlockingIOError:
+            return newest
+        except ConnectionError:
+            continue  # Server not up (yet); keep sending input
+        if not data or data[0] != net.MSG_SNAPSHOT:
+            continue
+        try:
+            snapshot = net.unpack_snapshot(data)
+        except struct.error:
+            continue
+        last = connection["last_snapshot"]
+        # Skip stale or reordered snapshots (sequence numbers wrap at 2**32)
+        if last is not None and (snapshot["sequence"] - last) % 2**32 >= 2**31:
+            continue
+        connection["last_snapshot"] = snapshot["sequence"]
+        newest = snapshot
+
+
+# --- Snapshots ---
+def link_previous(kind, entities, previous, latest):
+    """Gives entities seen in the last snapshot its position as their prev_* state."""
+    for entity in entities:
+        key = (kind, entity["id"])
+        old = previous.get(key)
+        if old is not None:
+            entity["prev_x"] = old["x"]
+            entity["prev_y"] = old["y"]
+            entity["prev_z"] = old["z"]
+            if "angle" in entity:
+                entity["prev_angle"] = old["angle"]
+        latest[key] = entity
+
+
+def snapshot_to_state(snapshot):
+    """Returns the display() state for a snapshot, or None before this player appears in one."""
+    sim_time = snapshot["tick"] / SIM_TICK_RATE
+    if snapshot["tick"] < connection["tick"]:
+        connection["flash_until"].clear()  # The server restarted its clock for a new session
+    connection["tick"] = snapshot["tick"]
+    previous = connection["previous"]
+    latest = {}
+    for kind in ("players", "enemies", "bullets", "enemy_bullets"):
+        link_previous(kind, snapshot[kind], previous, latest)
+    connection["previous"] = latest
+
+    own = None
+    remote_players = []
+    for player in snapshot["players"]:
+        if player["flags"] & net.PLAYER_FIRED:
+            connection["flash_until"][player["id"]] = sim_time + MUZZLE_FLASH_DURATION
+        player["flash_until"] = connection["flash_until"].get(player["id"], 0.0)
+        if player["id"] == connection["player_id"]:
+            own = player
+        elif not player["flags"] & net.PLAYER_DOWN:
+            remote_players.append(player)
+    if own is None:
+        return None
+
+    for powerup in snapshot["powerups"]:
+        powerup["z"] = 15
+        powerup["rotation"] = sim_time * 60 % 360
+    return {
+        "player": own,
+        "remote_players": remote_players,
+        "enemies": snapshot["enemies"],
+        "bullets": snapshot["bullets"],
+        "enemy_bullets": snapshot["enemy_bullets"],
+        "systems": snapshot["systems"],
+        "powerups": snapshot["powerups"],
+        "level": snapshot["level"],
+        "score": snapshot["score"],
+        "points_available": 0,
+        "systems_remaining": sum(not s["repaired"] for s in snapshot["systems"]),
+        "repairing": bool(own["flags"] & net.PLAYER_REPAIRING),
+        "repair_timer": own["repair_timer"],
+        "game_over": bool(snapshot["flags"] & net.SNAPSHOT_GAME_OVER),
+        "level_complete": bool(snapshot["flags"] & net.SNAPSHOT_LEVEL_COMPLETE),
+        "upgrading": False,
+        "show_muzzle_flash_until": own["flash_until"],
+        "ai_stats": {"decided": 0, "over_budget": 0, "max_staleness": 0},  # Server side
+        "sim_time": sim_time,
+        "alpha": 0.0,
+        "tick_time": time.perf_counter(),
+        "snapshot_rate": SIM_TICK_RATE / NET_SNAPSHOT_INTERVAL,
+    }
+
+
+def with_local_view(state):
+    """Returns state with this player's aim and camera taken from local input.
+
+    They change between snapshots, so this is republished every tick.
+    """
+    player = dict(state["player"], angle=game.player["angle"], pitch=game.player["pitch"])
+    player.pop("prev_angle", None)  # Aim is never interpolated
+    return dict(
+        state,
+        player=player,
+        camera_mode=game.camera_mode,
+        camera_orbit_angle_offset=game.camera_orbit_angle_offset,
+        camera_current_distance=game.camera_current_distance,
+        camera_current_height=game.camera_current_height,
+    )
+
+
+# --- Network Thread ---
+def network_worker():
+    """Network thread body: a fixed tick of input out, snapshots in.
+
+    The local view is republished every tick and every snapshot as it lands.
+    """
+    tick = 1.0 / SIM_TICK_RATE
+    next_tick_time = time.perf_counter()
+    sock = connection["socket"]
+    state = None
+    while game.sim_thread["running"]:
+        drain_client_input()
+        game.update_camera_controls(tick)
+        send_input()
+        if state is not None:
+            game.publish_snapshot(with_local_view(state))
+
+        next_tick_time += tick
+        current_time = time.perf_counter()
+        if next_tick_time < current_time - MAX_FRAME_DT:
+            next_tick_time = current_time  # Fell far behind; don't try to catch up
+        # Wait for the next tick, publishing snapshots as they land
+        while True:
+            snapshot = receive_snapshots()
+            if snapshot is not None:
+                state = snapshot_to_state(snapshot) or state
+                if state is not None:
+                    game.publish_snapshot(with_local_view(state))
+            remaining = next_tick_time - time.perf_counter()
+            if remaining <= 0:
+                break
+            select.select([sock], [], [], remaining)
+
+
+def wait_for_first_state():
+    """Blocks until a snapshot with this player in it has been published."""
+    deadline = time.perf_counter() + NET_CLIENT_TIMEOUT
+    while game.sim_thread["sequence"] == 0:
+        if time.perf_counter() > deadline:
+            sys.exit("Joined, but no snapshots arrived.")
+        time.sleep(0.01)
+
+
+def start_network_thread():
+    """Runs network_worker where the simulation thread would be."""
+    game.sim_thread["running"] = True
+    game.sim_thread["thread"] = threading.Thread(target=network_worker, name="network", daemon=True)
+    game.sim_thread["thread"].start()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=NET_PORT)
+    args = parser.parse_args(argv)
+
+    player_id = join(args.host, args.port)
+    atexit.register(leave)
+    game.player = game.new_player()  # Only the aim is used; the server owns the rest
+    start_network_thread()
+    wait_for_first_state()
+
+    import render
+
+    render.open_window(game.queue_input)  # Input goes to the network thread
+    print(f"--- Space Station Siege co-op: player {player_id + 1} on {args.host}:{args.port} ---")
+    print(" W/S: Move | A/D: Strafe | Mouse: Aim | Left Click: Shoot | Right Click: Camera")
+    print(" R (Hold): Repair System | Arrow Keys: Orbit/Zoom | F3: Render Stats")
+    render.glutMainLoop()
+
+
+if __name__ == "__main__":
+    main()
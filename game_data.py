@@ -0,0 +1,283 @@
+"""Constants and data tables for Space Station Siege.
+
+Pure data, so tools can read level layouts, enemy stats and tuning values
+without loading the game or PyOpenGL.
+"""
+
+import math
+import os
+
+# --- Constants ---
+# PyOpenGL per-call glGetError checks, error logging and copy errors. They
+# are slow with this many immediate-mode calls, so they are off unless
+# SIEGE_GL_DEBUG=1 is set.
+GL_DEBUG = os.environ.get("SIEGE_GL_DEBUG", "0") not in ("", "0")
+# JSON file of extra or overridden enemy types, loaded when project is
+# imported (see project.load_enemy_types)
+ENEMY_TYPES_FILE = os.environ.get("SIEGE_ENEMY_TYPES", "")
+# Window
+WINDOW_WIDTH = 1024
+WINDOW_HEIGHT = 768
+# Frame pacing
+TARGET_FPS = 120.0  # Render frame cap; 0 renders as fast as possible
+SIM_TICK_RATE = 30.0  # Fixed simulation ticks per second; display() interpolates between them
+MAX_FRAME_DT = 0.25  # Longest real-time gap fed to the simulation in one go
+MAX_SIM_STEPS_PER_FRAME = 5  # Drop time rather than spiral when falling behind
+SLEEP_SPIN_MARGIN = 0.002  # Busy-wait the last part of a sleep for precision
+VSYNC_SWAP_FRACTION = 0.5  # Swaps blocking longer than this share of a frame mean vsync is on
+THREADED_SIMULATION = False  # Run the update pipeline on its own thread
+# Event logging
+EVENT_LOG_LEVEL = "info"  # "debug", "info", "warning" or "off"
+EVENT_LOG_FLUSH_INTERVAL = 0.5  # Seconds between background flushes to stdout
+EVENT_LOG_LEVELS = {"debug": 10, "info": 20, "warning": 30, "off": 100}
+# World and Grid
+CELL_SIZE = 100  # Size of each grid cell
+# Player
+PLAYER_SPEED = 220.0
+PLAYER_TURN_SPEED = 90.0  # Degrees per second (if using keys for turning)
+MOUSE_SENSITIVITY = 0.15
+PLAYER_RADIUS = 25.0
+# Shooting
+BULLET_SPEED = 700.0  # Slightly faster bullets
+BULLET_DAMAGE = 15
+BULLET_SIZE = 6  # Increased bullet size slightly
+MUZZLE_FLASH_DURATION = 0.08  # Seconds the flash is visible
+PITCH_MIN = -80.0
+PITCH_MAX = 80.0
+# Enemies
+ENEMY_BULLET_SPEED = 300.0
+ENEMY_COLLISION_DAMAGE_INTERVAL = 0.5
+# AI level of detail: enemies within AI_FULL_RATE_DISTANCE (or their
+# shoot_range) decide every tick. Farther ones use the first band whose
+# distance covers them: (max distance, simulation ticks between decisions).
+# Setting AI_FULL_RATE_DISTANCE to inf turns it off. Movement still
+# integrates every tick.
+AI_FULL_RATE_DISTANCE = 700.0
+AI_LOD_BANDS = ((1400.0, 3), (float("inf"), 8))
+AI_BUDGET_US = 2000.0  # Wall-clock time per tick for AI decisions; 0 = unlimited
+# Chasers push apart when closer than their summed radii times this...
+ENEMY_SEPARATION_SPACING = 1.2
+ENEMY_SEPARATION_SPEED = 150.0  # ...at up to this many units per second (faster than any chaser)
+ENEMY_SEPARATION_GRID_MIN = 32  # Chasers needed before the NumPy grid version pays off
+# Systems & Powerups
+REPAIR_TIME = 5.0
+POWERUP_PICKUP_RADIUS = 30.0
+SYSTEM_REPAIR_RADIUS = 50.0
+# Networked co-op (server.py, client.py)
+NET_PORT = 47800  # UDP port the server listens on
+NET_MAX_PLAYERS = 16
+NET_SNAPSHOT_INTERVAL = 2  # Simulation ticks between snapshots (15 per second)
+NET_POSITION_SCALE = 8  # Snapshot positions are int16 in 1/8 world units (levels under 4096)
+NET_CLIENT_TIMEOUT = 5.0  # Seconds without a message before a player is dropped
+NET_JOIN_RETRY = 0.5  # Seconds between unanswered join requests
+NET_MENU_DELAY = 3.0  # Seconds level complete and game over screens show before play resumes
+NET_STATS_INTERVAL = 10.0  # Seconds between server load reports in the event log
+
+# Camera settings
+CAMERA_DEFAULT_DISTANCE_THIRD = 350  # Default zoom
+CAMERA_DEFAULT_HEIGHT_THIRD = 180  # Default height
+CAMERA_MIN_DISTANCE_THIRD = 150
+CAMERA_MAX_DISTANCE_THIRD = 600
+CAMERA_MIN_HEIGHT_THIRD = 50
+CAMERA_MAX_HEIGHT_THIRD = 400
+CAMERA_ZOOM_SPEED = 50.0  # Units per key press
+CAMERA_ORBIT_SPEED = 5.0  # Degrees per key press
+CAMERA_HEIGHT_ADJUST_SPEED = 20.0  # Units per key press
+CAMERA_HEIGHT_FIRST = 35  # Eye height for first person (relative to player base z=0)
+FAR_CLIP = 3500.0  # Increased far clip for larger levels
+
+# Level chunk streaming
+LEVEL_CHUNK_SIZE = 8  # Cells per chunk side
+# Max baked chunk meshes kept before LRU eviction: every chunk touching the
+# square of side 2 * FAR_CLIP around the eye fits, so in-range chunks never evict
+LEVEL_CHUNK_CACHE_SIZE = math.ceil(2 * FAR_CLIP / (CELL_SIZE * LEVEL_CHUNK_SIZE) + 1) ** 2
+
+# View culling bounding volumes
+WALL_HEIGHT = CELL_SIZE * 0.9
+ENEMY_BOUND_RADIUS_SCALE = 2.1  # Bounding sphere radius as a multiple of enemy size
+SYSTEM_BOUND_RADIUS = 35.0  # Covers the 40 unit system cube
+POWERUP_BOUND_RADIUS = 18.0
+PLAYER_BOUND_RADIUS = 65.0  # Around mid-body height; reaches the gun tip
+
+# Model dimensions (the player gun also sets where bullets spawn)
+PLAYER_BODY_HEIGHT = 60
+PLAYER_HEAD_RADIUS = 15
+PLAYER_GUN_LENGTH = 50
+PLAYER_GUN_RADIUS = 6
+PLAYER_GUN_FORWARD = 10
+PLAYER_GUN_RIGHT = 15
+PLAYER_GUN_UP = PLAYER_BODY_HEIGHT * 0.55
+SYSTEM_SIZE = 40
+
+# Level of detail: mesh slices per tier (near, mid, far)
+ENEMY_LOD_SLICES = (16, 10, 6)
+BULLET_LOD_SLICES = (8, 6, 4)
+BULLET_LOD_DISTANCES = (300.0, 900.0)
+
+# HUD text
+TEXT_CACHE_SIZE = 128  # Max rendered strings kept before LRU eviction
+REPAIR_BAR_WIDTH = 200
+# Occlusion culling: sample points (fractions of a cell) used for cell-to-cell sight lines.
+# Corners sit almost on the cell edge so grazing lines through narrow gaps are tried.
+PVS_SAMPLE_INSET = 0.001
+PVS_SAMPLE_POINTS = [
+    (x, y)
+    for y in (PVS_SAMPLE_INSET, 0.5, 1 - PVS_SAMPLE_INSET)
+    for x in (PVS_SAMPLE_INSET, 0.5, 1 - PVS_SAMPLE_INSET)
+]
+
+# Enemy types and their properties - Reduced speeds, adjusted radii.
+# "behavior" picks the update kernel (see project.ENEMY_BEHAVIORS) and
+# "model" one of ENEMY_MODELS; "color" and "altitude" are optional.
+ENEMY_TYPES = {
+    "scout": {
+        "health": 20,
+        "speed": 110.0,
+        "damage": 5,
+        "points": 10,
+        "size": 15.0,
+        "radius": 18.0,
+        "shoot_range": 0,
+        "fire_rate": 0,
+        "lod_distances": (400.0, 1000.0),  # Switch to coarser meshes beyond these
+        "behavior": "chase",
+        "model": "scout",
+    },  # Slower
+    "tank": {
+        "health": 50,
+        "speed": 60.0,
+        "damage": 10,
+        "points": 20,
+        "size": 30.0,
+        "radius": 30.0,
+        "shoot_range": 0,
+        "fire_rate": 0,
+        "lod_distances": (600.0, 1500.0),
+        "behavior": "chase",
+        "model": "tank",
+    },  # Slower
+    "sniper": {
+        "health": 30,
+        "speed": 0.0,
+        "damage": 15,
+        "points": 30,
+        "size": 25.0,
+        "radius": 22.0,
+        "shoot_range": 600.0,
+        "fire_rate": 1.5,
+        "lod_distances": (500.0, 1200.0),
+        "behavior": "turret",
+        "model": "sniper",
+    },
+    
+    # ... (existing enemies)
+    "drone": {"health": 15, 
+              "speed": 80.0, 
+              "damage": 10, 
+              "points": 15, 
+              "size": 20.0, 
+              "radius": 20.0, 
+              "shoot_range": 0, 
+              "fire_rate": 0, 
+              "altitude": 100.0,
+              "lod_distances": (400.0, 1000.0),
+              "behavior": "chase",
+              "model": "drone"},
+}
+
+# Enemy meshes render.py can draw
+ENEMY_MODELS = ("scout", "tank", "sniper", "drone")
+
+# Enemies spawned per level: max(0, base + per_level * level)
+SPAWN_COUNTS = {
+    "scout": (2, 1),  # Reduced scout count
+    "tank": (-1, 1),  # Reduced tank count
+    "sniper": (-2, 1),  # Sniper starts later
+    "drone": (0, 2),
+}
+
+
+# Colors - Changed System color
+COLORS = {
+    "player_body": (0.2, 0.5, 1.0),
+    "player_head": (1.0, 0.8, 0.6),
+    "gun": (0.4, 0.4, 0.4),
+    "bullet": (1.0, 1.0, 0.0),
+    "muzzle_flash": (1.0, 0.8, 0.2),
+    "enemy_scout": (0.0, 0.0, 0.0),
+    "enemy_tank": (0.0, 0.0, 0.0),
+    "enemy_sniper": (0.0, 0.0, 0.0),
+    "enemy_drone": (1.0, 0.0, 0.0),
+    "enemy_bullet": (0.9, 0.1, 0.1),
+    "health_pack": (0.0, 1.0, 0.0),
+    "ammo_pack": (0.0, 0.0, 1.0),
+    "system": (0.8, 0.0, 0.8),  # Changed to Purple
+    "system_repaired": (0.0, 1.0, 0.0),
+    "wall": (1.0, 0.75, 0.8),
+    "floor1": (0.7, 0.7, 0.7),
+    "floor2": (0.4, 0.4, 0.4),
+    "text": (1.0, 1.0, 1.0),
+    "upgrade_text": (0.9, 0.9, 0.3),
+    "repair_bar_bg": (0.4, 0.4, 0.4),
+    "repair_bar_fg": (1.0, 0.0, 0.0),
+    "crosshair": (1.0, 1.0, 1.0, 0.8),  # White, slightly transparent
+}
+
+# Level layouts - Expanded to 15x15
+# (0=empty, 1=wall, 2=system)
+LEVEL_LAYOUTS = [
+    # Level 1: Larger simple area with 2 systems
+    [
+        [1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1],
+        [1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1],
+        [1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1],
+        [1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1],
+        [1, 0, 0, 2, 0, 0, 1, 1, 1, 0, 0, 0, 0, 0, 1],
+        [1, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 1],
+        [1, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 1],
+        [1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1],
+        [1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1],
+        [1, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 2, 0, 0, 1],
+        [1, 0, 0, 0, 0, 0, 1, 1, 1, 0, 0, 0, 0, 0, 1],
+        [1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1],
+        [1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1],
+        [1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1],
+        [1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1],
+    ],
+    # Level 2: Larger complex layout with 3 systems
+    [
+        [1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1],
+        [1, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 1],
+        [1, 0, 1, 1, 1, 0, 0, 1, 0, 0, 2, 0, 1, 0, 1],
+        [1, 0, 1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1, 0, 1],
+        [1, 0, 1, 0, 1, 1, 0, 1, 1, 1, 1, 0, 1, 0, 1],
+        [1, 0, 0, 0, 1, 0, 0, 0, 0, 0, 1, 0, 0, 0, 1],
+        [1, 0, 1, 0, 1, 0, 1, 1, 1, 0, 1, 1, 1, 0, 1],
+        [1, 0, 1, 0, 1, 0, 0, 2, 0, 0, 0, 0, 0, 0, 1],
+        [1, 0, 1, 0, 1, 1, 1, 1, 1, 0, 1, 1, 1, 0, 1],
+        [1, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 1],
+        [1, 1, 1, 1, 1, 0, 1, 0, 1, 1, 1, 1, 0, 1, 1],
+        [1, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 1],
+        [1, 0, 2, 0, 1, 0, 1, 1, 1, 1, 1, 0, 1, 0, 1],
+        [1, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 1, 0, 1],
+        [1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1],
+    ],
+    # Level 3: Larger complex maze with 3 systems
+    [
+        [1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1],
+        [1, 0, 0, 0, 1, 0, 0, 0, 1, 0, 0, 0, 0, 0, 1],
+        [1, 0, 1, 0, 1, 1, 1, 0, 1, 0, 1, 1, 1, 0, 1],
+        [1, 0, 1, 0, 0, 0, 1, 0, 1, 0, 1, 0, 0, 0, 1],
+        [1, 0, 1, 1, 1, 0, 1, 0, 1, 0, 1, 0, 1, 1, 1],
+        [1, 0, 0, 0, 1, 0, 0, 0, 1, 0, 0, 0, 1, 0, 1],
+        [1, 1, 1, 0, 1, 1, 1, 0, 1, 1, 1, 0, 1, 0, 1],
+        [1, 2, 0, 0, 0, 0, 1, 0, 0, 0, 1, 0, 0, 0, 1],
+        [1, 1, 1, 1, 1, 0, 1, 1, 1, 0, 1, 1, 1, 0, 1],
+        [1, 0, 0, 0, 1, 0, 0, 0, 0, 0, 1, 0, 0, 0, 1],
+        [1, 0, 1, 0, 1, 1, 1, 1, 1, 0, 1, 0, 1, 1, 1],
+        [1, 0, 1, 0, 0, 0, 0, 0, 1, 0, 1, 0, 0, 2, 1],
+        [1, 0, 1, 1, 1, 1, 1, 0, 1, 1, 1, 1, 1, 0, 1],
+        [1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1],
+        [1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1],
+    ],
+]
@@ -0,0 +1,202 @@
+"""Binary UDP messages between server.py and its clients.
+
+Every datagram starts with a one-byte message type. Clients send JOIN,
+then an INPUT every tick, and LEAVE when they quit. The server answers
+JOIN with WELCOME (or FULL) and broadcasts a SNAPSHOT of the whole world
+every NET_SNAPSHOT_INTERVAL ticks. Snapshots are complete rather than
+deltas, so a lost datagram only costs one interpolation step.
+
+Positions are int16 fixed point (NET_POSITION_SCALE steps per world
+unit), angles a uint16 fraction of a turn and pitch int16 centidegrees.
+Entities carry a uint16 id so clients can pair them up across snapshots.
+"""
+
+import struct
+
+from game_data import NET_POSITION_SCALE
+
+MSG_JOIN = 1
+MSG_WELCOME = 2
+MSG_FULL = 3
+MSG_INPUT = 4
+MSG_LEAVE = 5
+MSG_SNAPSHOT = 6
+
+# INPUT buttons and the keys they stand for in project.keys_pressed
+BUTTON_KEYS = ((1, b"w"), (2, b"s"), (4, b"a"), (8, b"d"), (16, b"r"))
+
+# SNAPSHOT flags
+SNAPSHOT_GAME_OVER = 1
+SNAPSHOT_LEVEL_COMPLETE = 2
+# Player record flags
+PLAYER_REPAIRING = 1
+PLAYER_DOWN = 2  # Out of health until the next level
+PLAYER_FIRED = 4  # Shot since the previous snapshot
+
+POWERUP_TYPES = ("health", "ammo")
+
+TYPE = struct.Struct("<B")
+WELCOME = struct.Struct("<BB")  # type, player id
+# type, sequence, buttons, shots requested (mod 256), angle, pitch
+INPUT = struct.Struct("<BIBBHh")
+# type, sequence, tick, level, flags, score, then record counts: players,
+# enemies, bullets, enemy bullets, systems, powerups
+SNAPSHOT_HEADER = struct.Struct("<BIIBBIBHHHBB")
+# id, flags, x, y, angle, pitch, health, max health, ammo, max ammo,
+# shield, max shield, repair progress (tenths of a second)
+PLAYER_RECORD = struct.Struct("<BBhhHhHHHHHHB")
+ENEMY_RECORD = struct.Struct("<HBhhhH")  # id, type id, x, y, z, angle
+BULLET_RECORD = struct.Struct("<Hhhh")  # id, x, y, z
+SYSTEM_RECORD = struct.Struct("<hhB")  # x, y, repaired
+POWERUP_RECORD = struct.Struct("<Bhh")  # type index, x, y
+
+ANGLE_STEPS = 65536 / 360.0
+
+
+# --- Quantization ---
+def to_fixed(value):
+    """World units -> int16 fixed point, clamped to range."""
+    return max(-32768, min(32767, round(value * NET_POSITION_SCALE)))
+
+
+def to_angle(degrees):
+    """Degrees -> uint16 fraction of a turn."""
+    return round(degrees % 360 * ANGLE_STEPS) & 0xFFFF
+
+
+def to_count(value):
+    """Non-negative stat -> uint16."""
+    return max(0, min(65535, int(value)))
+
+
+# --- Client Messages ---
+def pack_input(sequence, buttons, shots, angle, pitch):
+    """Packs one tick of client input; shots counts trigger pulls, wrapping at 256."""
+    return INPUT.pack(
+        MSG_INPUT, sequence & 0xFFFFFFFF, buttons, shots & 0xFF, to_angle(angle), round(pitch * 100)
+    )
+
+
+def unpack_input(data):
+    """Returns (sequence, buttons, shots, angle, pitch)."""
+    _, sequence, buttons, shots, angle, pitch = INPUT.unpack(data)
+    return sequence, buttons, shots, angle / ANGLE_STEPS, pitch / 100.0
+
+
+def keys_to_buttons(keys):
+    """Packs the movement and repair keys held in a keys_pressed set into INPUT buttons."""
+    buttons = 0
+    for bit, key in BUTTON_KEYS:
+        if key in keys:
+            buttons |= bit
+    return buttons
+
+
+def buttons_to_keys(buttons):
+    """The keys_pressed set an INPUT buttons value stands for."""
+    return {key for bit, key in BUTTON_KEYS if buttons & bit}
+
+
+# --- Snapshots ---
+def pack_player(player_id, flags, player, repair_timer):
+    """Packs one player dict; flags are PLAYER_* bits."""
+    return PLAYER_RECORD.pack(
+        player_id, flags, to_fixed(player["x"]), to_fixed(player["y"]),
+        to_angle(player["angle"]), round(player["pitch"] * 100),
+        to_count(player["health"]), to_count(player["max_health"]),
+        to_count(player["ammo"]), to_count(player["max_ammo"]),
+        to_count(player["shield"]), to_count(player["max_shield"]),
+        min(255, int(repair_timer * 10)),
+    )
+
+
+def pack_snapshot(sequence, tick, level, flags, score, player_records,
+                  enemies, bullets, enemy_bullets, systems, powerups):
+    """Packs a whole-world snapshot.
+
+    player_records come from pack_player. Enemies and bullets are game
+    dicts with a "net_id"; systems and powerups plain game dicts.
+    """
+    parts = [
+        SNAPSHOT_HEADER.pack(
+            MSG_SNAPSHOT, sequence & 0xFFFFFFFF, tick & 0xFFFFFFFF, level, flags,
+            max(0, min(0xFFFFFFFF, int(score))),
+            len(player_records), len(enemies), len(bullets), len(enemy_bullets),
+            len(systems), len(powerups),
+        )
+    ]
+    parts += player_records
+    pack_enemy = ENEMY_RECORD.pack
+    parts += [
+        pack_enemy(
+            e["net_id"], e["type_id"], to_fixed(e["x"]), to_fixed(e["y"]), to_fixed(e["z"]),
+            to_angle(e["angle"]),
+        )
+        for e in enemies
+    ]
+    pack_bullet = BULLET_RECORD.pack
+    for group in (bullets, enemy_bullets):
+        parts += [
+            pack_bullet(b["net_id"], to_fixed(b["x"]), to_fixed(b["y"]), to_fixed(b["z"]))
+            for b in group
+        ]
+    parts += [SYSTEM_RECORD.pack(to_fixed(s["x"]), to_fixed(s["y"]), s["repaired"]) for s in systems]
+    parts += [
+        POWERUP_RECORD.pack(POWERUP_TYPES.index(p["type"]), to_fixed(p["x"]), to_fixed(p["y"]))
+        for p in powerups
+    ]
+    return b"".join(parts)
+
+
+def unpack_records(record, data, offset, count):
+    """Returns (tuples of count records, offset after them)."""
+    end = offset + record.size * count
+    return list(record.iter_unpack(data[offset:end])), end
+
+
+def unpack_snapshot(data):
+    """Decodes a SNAPSHOT into game-style dicts (world units and degrees).
+
+    Raises struct.error if the datagram is truncated.
+    """
+    (_, sequence, tick, level, flags, score, player_count, enemy_count, bullet_count,
+     enemy_bullet_count, system_count, powerup_count) = SNAPSHOT_HEADER.unpack_from(data)
+    scale = 1.0 / NET_POSITION_SCALE
+    offset = SNAPSHOT_HEADER.size
+
+    rows, offset = unpack_records(PLAYER_RECORD, data, offset, player_count)
+    players = [
+        {
+            "id": pid, "flags": pflags, "x": x * scale, "y": y * scale, "z": 0,
+            "angle": angle / ANGLE_STEPS, "pitch": pitch / 100.0,
+            "health": health, "max_health": max_health, "ammo": ammo, "max_ammo": max_ammo,
+            "shield": shield, "max_shield": max_shield, "repair_timer": repair / 10.0,
+        }
+        for (pid, pflags, x, y, angle, pitch, health, max_health, ammo, max_ammo,
+             shield, max_shield, repair) in rows
+    ]
+    rows, offset = unpack_records(ENEMY_RECORD, data, offset, enemy_count)
+    enemies = [
+        {"id": eid, "type_id": type_id, "x": x * scale, "y": y * scale, "z": z * scale,
+         "angle": angle / ANGLE_STEPS}
+        for eid, type_id, x, y, z, angle in rows
+    ]
+    bullet_groups = []
+    for count in (bullet_count, enemy_bullet_count):
+        rows, offset = unpack_records(BULLET_RECORD, data, offset, count)
+        bullet_groups.append(
+            [{"id": bid, "x": x * scale, "y": y * scale, "z": z * scale} for bid, x, y, z in rows]
+        )
+    rows, offset = unpack_records(SYSTEM_RECORD, data, offset, system_count)
+    systems = [{"x": x * scale, "y": y * scale, "z": 0, "repaired": bool(repaired)} for x, y, repaired in rows]
+    rows, offset = unpack_records(POWERUP_RECORD, data, offset, powerup_count)
+    powerups = [
+        {"type": POWERUP_TYPES[kind], "x": x * scale, "y": y * scale} for kind, x, y in rows
+    ]
+    if offset != len(data):
+        raise struct.error(f"snapshot is {len(data)} bytes, records need {offset}")
+    return {
+        "sequence": sequence, "tick": tick, "level": level, "flags": flags, "score": score,
+        "players": players, "enemies": enemies, "bullets": bullet_groups[0],
+        "enemy_bullets": bullet_groups[1], "systems": systems, "powerups": powerups,
+    }
@@ -0,0 +1,342 @@
+"""Headless offscreen rendering of the real display() for CI and benchmarks.
+
+Creates an EGL pbuffer context on Mesa's surfaceless platform, which uses a
+software rasterizer and needs neither a GPU nor a display server. It then
+drives the game's own display() frame by frame. freeglut cannot run
+without a window, so its shape calls are replaced with equivalent GL/GLU
+geometry. Bitmap text is skipped because freeglut owns the font data.
+
+Frames are read back asynchronously through a ring of pixel buffer objects.
+glReadPixels for frame N only queues a transfer. The frame queued a few
+swaps earlier is then mapped and copied once into a pooled NumPy buffer. A
+writer thread compresses each buffer to PNG and returns it to the pool, so
+capture neither stalls the pipeline nor allocates per frame.
+
+Example:
+    python offscreen.py --frames 300 --agent scripted --output frames/
+    python offscreen.py --frames 600 --no-capture   # GL cost alone
+    python offscreen.py --frames 300 --compare-gl-modes
+    SIEGE_GL_DEBUG=1 python offscreen.py --frames 30 --resize-at 10
+"""
+
+import os
+
+# Must be chosen before PyOpenGL is first imported
+os.environ.setdefault("PYOPENGL_PLATFORM", "egl")
+os.environ.setdefault("EGL_PLATFORM", "surfaceless")
+
+import argparse
+import ctypes
+import queue
+import random
+import struct
+import subprocess
+import sys
+import threading
+import time
+import zlib
+
+import numpy as np
+
+import project as game
+import render  # Sets PyOpenGL's debug flags, so it goes before any other OpenGL import
+
+from OpenGL.raw.EGL import _errors as egl_errors
+
+# PyOpenGL 3.1 leaves the EGL error checker undefined when ERROR_CHECKING is off
+if not hasattr(egl_errors, "_error_checker"):
+    egl_errors._error_checker = None
+from OpenGL import EGL
+from OpenGL.GL import *
+from OpenGL.GLU import *
+from OpenGL.raw.GL.VERSION.GL_1_0 import glReadPixels as raw_glReadPixels
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+# Cube faces as (normal, corners), wound counter-clockwise seen from outside
+CUBE_FACES = (
+    ((1, 0, 0), ((1, -1, -1), (1, 1, -1), (1, 1, 1), (1, -1, 1))),
+    ((-1, 0, 0), ((-1, -1, -1), (-1, -1, 1), (-1, 1, 1), (-1, 1, -1))),
+    ((0, 1, 0), ((-1, 1, -1), (-1, 1, 1), (1, 1, 1), (1, 1, -1))),
+    ((0, -1, 0), ((-1, -1, -1), (1, -1, -1), (1, -1, 1), (-1, -1, 1))),
+    ((0, 0, 1), ((-1, -1, 1), (1, -1, 1), (1, 1, 1), (-1, 1, 1))),
+    ((0, 0, -1), ((-1, -1, -1), (-1, 1, -1), (1, 1, -1), (1, -1, -1))),
+)
+
+sphere_quadric = None  # Created on first use, once a context exists
+
+
+# --- Context ---
+def create_egl_context(width, height):
+    """Creates and makes current an EGL pbuffer context of the given size."""
+    display = EGL.eglGetDisplay(EGL.EGL_DEFAULT_DISPLAY)
+    if not EGL.eglInitialize(display, None, None):
+        raise RuntimeError("eglInitialize failed")
+    config_attribs = (EGL.EGLint * 13)(
+        EGL.EGL_SURFACE_TYPE, EGL.EGL_PBUFFER_BIT,
+        EGL.EGL_RED_SIZE, 8, EGL.EGL_GREEN_SIZE, 8, EGL.EGL_BLUE_SIZE, 8,
+        EGL.EGL_DEPTH_SIZE, 24,
+        EGL.EGL_RENDERABLE_TYPE, EGL.EGL_OPENGL_BIT,
+        EGL.EGL_NONE,
+    )
+    config = EGL.EGLConfig()
+    num_configs = EGL.EGLint()
+    EGL.eglChooseConfig(display, config_attribs, ctypes.pointer(config), 1, ctypes.pointer(num_configs))
+    if num_configs.value < 1:
+        raise RuntimeError("no EGL config with an RGB8/depth24 pbuffer")
+    surface = EGL.eglCreatePbufferSurface(
+        display, config, (EGL.EGLint * 5)(EGL.EGL_WIDTH, width, EGL.EGL_HEIGHT, height, EGL.EGL_NONE)
+    )
+    EGL.eglBindAPI(EGL.EGL_OPENGL_API)
+    context = EGL.eglCreateContext(display, config, EGL.EGL_NO_CONTEXT, None)
+    EGL.eglMakeCurrent(display, surface, surface, context)
+    return display, surface, context
+
+
+# --- GLUT replacements ---
+def solid_cube(size):
+    """glutSolidCube without GLUT: a cube of quads with outward normals."""
+    half = size / 2
+    glBegin(GL_QUADS)
+    for normal, corners in CUBE_FACES:
+        glNormal3f(*normal)
+        for x, y, z in corners:
+            glVertex3f(x * half, y * half, z * half)
+    glEnd()
+
+
+def solid_sphere(radius, slices, stacks):
+    """glutSolidSphere without GLUT, via a GLU quadric."""
+    global sphere_quadric
+    if sphere_quadric is None:
+        sphere_quadric = gluNewQuadric()
+        gluQuadricNormals(sphere_quadric, GLU_SMOOTH)
+    gluSphere(sphere_quadric, radius, slices, stacks)
+
+
+def install_headless_glut(swap_buffers):
+    """Points the renderer's GLUT calls at windowless stand-ins.
+
+    swap_buffers runs wherever display() would have swapped, which is where
+    frames are captured.
+    """
+    def ignore(*args):
+        pass
+
+    render.glutSolidCube = solid_cube
+    render.glutSolidSphere = solid_sphere
+    render.glutBitmapCharacter = ignore
+    render.glutSwapBuffers = swap_buffers
+    for name in ("glutPostRedisplay", "glutIdleFunc", "glutSetCursor", "glutWarpPointer"):
+        setattr(render, name, ignore)
+
+
+# --- Capture ---
+def write_png(path, image, level):
+    """Writes a bottom-up (GL order) RGB image as a PNG file."""
+    height, width = image.shape[:2]
+    rows = np.empty((height, width * 3 + 1), np.uint8)
+    rows[:, 0] = 0  # Filter type "None" for every scanline
+    rows[:, 1:] = image[::-1].reshape(height, -1)
+
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    with open(path, "wb") as f:
+        f.write(PNG_SIGNATURE)
+        f.write(chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)))
+        f.write(chunk(b"IDAT", zlib.compress(rows, level)))
+        f.write(chunk(b"IEND", b""))
+
+
+class FrameCapture:
+    """Asynchronous framebuffer readback into pooled buffers, streamed to PNG files."""
+
+    def __init__(self, width, height, output_dir=None, pbo_count=3, pool_size=4, compress_level=1):
+        self.width = width
+        self.height = height
+        self.frame_bytes = width * height * 3
+        self.output_dir = output_dir
+        self.compress_level = compress_level
+        self.frames_captured = 0
+        self.frames_written = 0
+
+        self.pbos = glGenBuffers(pbo_count)
+        if pbo_count == 1:
+            self.pbos = [self.pbos]
+        for pbo in self.pbos:
+            glBindBuffer(GL_PIXEL_PACK_BUFFER, pbo)
+            glBufferData(GL_PIXEL_PACK_BUFFER, self.frame_bytes, None, GL_STREAM_READ)
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, 0)
+        self.pending = []  # Frame indices queued in PBOs, oldest first
+        self.next_pbo = 0
+
+        # Buffers circulate pool -> capture -> writer -> pool
+        self.pool = queue.Queue()
+        for _ in range(pool_size):
+            self.pool.put(np.empty((height, width, 3), np.uint8))
+        self.written = queue.Queue()
+        self.writer = threading.Thread(target=self.writer_loop, daemon=True)
+        self.writer.start()
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+
+    def capture(self):
+        """Queues a readback of the current frame and collects the oldest finished one."""
+        if len(self.pending) == len(self.pbos):
+            self.collect()
+        glPixelStorei(GL_PACK_ALIGNMENT, 1)
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, self.pbos[self.next_pbo])
+        # With a pack buffer bound the pointer is an offset, so this returns immediately
+        raw_glReadPixels(0, 0, self.width, self.height, GL_RGB, GL_UNSIGNED_BYTE, None)
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, 0)
+        self.pending.append(self.frames_captured)
+        self.next_pbo = (self.next_pbo + 1) % len(self.pbos)
+        self.frames_captured += 1
+
+    def collect(self):
+        """Copies the oldest pending PBO into a pool buffer and hands it to the writer."""
+        frame_index = self.pending.pop(0)
+        pbo = self.pbos[(self.next_pbo - len(self.pending) - 1) % len(self.pbos)]
+        buffer = self.pool.get()  # Blocks if the writer is behind
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, pbo)
+        pointer = glMapBufferRange(GL_PIXEL_PACK_BUFFER, 0, self.frame_bytes, GL_MAP_READ_BIT)
+        ctypes.memmove(buffer.ctypes.data, pointer, self.frame_bytes)
+        glUnmapBuffer(GL_PIXEL_PACK_BUFFER)
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, 0)
+        self.written.put((frame_index, buffer))
+
+    def writer_loop(self):
+        """Compresses captured frames to disk and recycles their buffers."""
+        while True:
+            item = self.written.get()
+            if item is None:
+                return
+            frame_index, buffer = item
+            if self.output_dir:
+                path = os.path.join(self.output_dir, f"frame_{frame_index:05d}.png")
+                write_png(path, buffer, self.compress_level)
+            self.frames_written += 1
+            self.pool.put(buffer)
+
+    def close(self):
+        """Drains pending readbacks, waits for the writer and frees the PBOs."""
+        while self.pending:
+            self.collect()
+        self.written.put(None)
+        self.writer.join()
+        glDeleteBuffers(len(self.pbos), self.pbos)
+
+
+# --- Driver ---
+def run(frames, width, height, agent_name=None, output_dir=None, capture=True, seed=0, compress_level=1,
+        resize_at=None):
+    """Renders frames of a game session offscreen; returns timing statistics.
+
+    With resize_at, frame resize_at is drawn at half size and the next one at
+    full size again, so the window-sized GL resources get reallocated.
+    """
+    import batch_sim  # Reuses its agents and menu handling
+
+    create_egl_context(width, height)
+    frame_capture = FrameCapture(width, height, output_dir, compress_level=compress_level) if capture else None
+    install_headless_glut(frame_capture.capture if frame_capture else glFinish)
+    render.init_gl_state()
+    render.reshape(width, height)
+
+    random.seed(seed)
+    rng = random.Random(seed)
+    memory = {}
+    agent = batch_sim.AGENTS.get(agent_name)
+    game.reset_game()
+    tick = 1.0 / game.SIM_TICK_RATE
+
+    start = time.perf_counter()
+    for frame in range(frames):
+        if frame == resize_at:
+            render.reshape(width // 2, height // 2)
+        elif frame - 1 == resize_at:
+            render.reshape(width, height)
+        if game.level_complete or game.upgrading:
+            batch_sim.handle_menus(rng)
+        elif not game.game_over:
+            game.keys_pressed.clear()
+            if agent:
+                agent(rng, memory)
+            game.step_simulation(tick)
+        render.display()
+    glFinish()
+    render_time = time.perf_counter() - start
+    if frame_capture:
+        frame_capture.close()
+    total_time = time.perf_counter() - start
+    return {
+        "frames": frames,
+        "render_fps": frames / render_time,
+        "total_fps": frames / total_time,
+        "frames_written": frame_capture.frames_written if frame_capture else 0,
+    }
+
+
+def compare_gl_modes(frames, width, height, agent_name):
+    """Benchmarks display() with PyOpenGL's debug flags off and on.
+
+    The flags only take effect at import time, so each mode runs in its own
+    process with SIEGE_GL_DEBUG set accordingly.
+    """
+    frame_times = {}
+    for mode, debug in (("release", "0"), ("debug", "1")):
+        command = [
+            sys.executable, __file__, "--frames", str(frames), "--no-capture",
+            "--width", str(width), "--height", str(height),
+        ]
+        if agent_name:
+            command += ["--agent", agent_name]
+        output = subprocess.run(
+            command, env=dict(os.environ, SIEGE_GL_DEBUG=debug),
+            capture_output=True, text=True, check=True,
+        ).stdout
+        fps = float(output.split(" fps rendering")[0].rsplit(" ", 1)[1])
+        frame_times[mode] = 1000.0 / fps
+        print(f"{mode:<8}{frame_times[mode]:8.2f} ms/frame")
+    print(f"debug flags cost {frame_times['debug'] / frame_times['release']:.2f}x frame time")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--width", type=int, default=game.WINDOW_WIDTH)
+    parser.add_argument("--height", type=int, default=game.WINDOW_HEIGHT)
+    parser.add_argument("--agent", choices=("scripted", "random"), help="who plays (default: nobody)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="directory for the PNG frame sequence")
+    parser.add_argument("--compress-level", type=int, default=1, help="zlib level, 0-9")
+    parser.add_argument("--no-capture", action="store_true", help="render only, for GL cost")
+    parser.add_argument(
+        "--compare-gl-modes", action="store_true",
+        help="benchmark rendering with PyOpenGL error checking off and on",
+    )
+    parser.add_argument(
+        "--resize-at", type=int, metavar="FRAME",
+        help="draw this frame at half size and the next at full size (run with SIEGE_GL_DEBUG=1)",
+    )
+    args = parser.parse_args(argv)
+
+    if args.compare_gl_modes:
+        compare_gl_modes(args.frames, args.width, args.height, args.agent)
+        return
+
+    stats = run(
+        args.frames, args.width, args.height, args.agent, args.output,
+        capture=not args.no_capture, seed=args.seed, compress_level=args.compress_level,
+        resize_at=args.resize_at,
+    )
+    print(
+        f"{stats['frames']} frames: {stats['render_fps']:.1f} fps rendering, "
+        f"{stats['total_fps']:.1f} fps including capture drain, "
+        f"{stats['frames_written']} written"
+    )
+
+
+if __name__ == "__main__":
+    main()
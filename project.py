@@ -1,176 +1,24 @@
+import atexit
+import itertools
+import json
 import math
 import random
+import sys
+import threading
 import time  # Import time for consistent dt calculation
+from collections import deque
 
-from OpenGL.GL import *
-from OpenGL.GLU import *
-from OpenGL.GLUT import *
-
-# --- Constants ---
-# World and Grid
-CELL_SIZE = 100  # Size of each grid cell
-# Player
-PLAYER_SPEED = 220.0
-PLAYER_TURN_SPEED = 90.0  # Degrees per second (if using keys for turning)
-MOUSE_SENSITIVITY = 0.15
-PLAYER_RADIUS = 25.0
-# Shooting
-BULLET_SPEED = 700.0  # Slightly faster bullets
-BULLET_DAMAGE = 15
-BULLET_SIZE = 6  # Increased bullet size slightly
-MUZZLE_FLASH_DURATION = 0.08  # Seconds the flash is visible
-PITCH_MIN = -80.0
-PITCH_MAX = 80.0
-# Enemies
-ENEMY_BULLET_SPEED = 300.0
-ENEMY_COLLISION_DAMAGE_INTERVAL = 0.5
-# Systems & Powerups
-REPAIR_TIME = 5.0
-POWERUP_PICKUP_RADIUS = 30.0
-SYSTEM_REPAIR_RADIUS = 50.0
-
-# Camera settings
-CAMERA_DEFAULT_DISTANCE_THIRD = 350  # Default zoom
-CAMERA_DEFAULT_HEIGHT_THIRD = 180  # Default height
-CAMERA_MIN_DISTANCE_THIRD = 150
-CAMERA_MAX_DISTANCE_THIRD = 600
-CAMERA_MIN_HEIGHT_THIRD = 50
-CAMERA_MAX_HEIGHT_THIRD = 400
-CAMERA_ZOOM_SPEED = 50.0  # Units per key press
-CAMERA_ORBIT_SPEED = 5.0  # Degrees per key press
-CAMERA_HEIGHT_ADJUST_SPEED = 20.0  # Units per key press
-CAMERA_HEIGHT_FIRST = 35  # Eye height for first person (relative to player base z=0)
-
-# Enemy types and their properties - Reduced speeds, adjusted radii
-ENEMY_TYPES = {
-    "scout": {
-        "health": 20,
-        "speed": 110.0,
-        "damage": 5,
-        "points": 10,
-        "size": 15.0,
-        "radius": 18.0,
-        "shoot_range": 0,
-        "fire_rate": 0,
-    },  # Slower
-    "tank": {
-        "health": 50,
-        "speed": 60.0,
-        "damage": 10,
-        "points": 20,
-        "size": 30.0,
-        "radius": 30.0,
-        "shoot_range": 0,
-        "fire_rate": 0,
-    },  # Slower
-    "sniper": {
-        "health": 30,
-        "speed": 0.0,
-        "damage": 15,
-        "points": 30,
-        "size": 25.0,
-        "radius": 22.0,
-        "shoot_range": 600.0,
-        "fire_rate": 1.5,
-    },
-    
-    # ... (existing enemies)
-    "drone": {"health": 15, 
-              "speed": 80.0, 
-              "damage": 10, 
-              "points": 15, 
-              "size": 20.0, 
-              "radius": 20.0, 
-              "shoot_range": 0, 
-              "fire_rate": 0, 
-              "altitude": 100.0},
-}
-
-
-# Colors - Changed System color
-COLORS = {
-    "player_body": (0.2, 0.5, 1.0),
-    "player_head": (1.0, 0.8, 0.6),
-    "gun": (0.4, 0.4, 0.4),
-    "bullet": (1.0, 1.0, 0.0),
-    "muzzle_flash": (1.0, 0.8, 0.2),
-    "enemy_scout": (0.0, 0.0, 0.0),
-    "enemy_tank": (0.0, 0.0, 0.0),
-    "enemy_sniper": (0.0, 0.0, 0.0),
-    "enemy_bullet": (0.9, 0.1, 0.1),
-    "health_pack": (0.0, 1.0, 0.0),
-    "ammo_pack": (0.0, 0.0, 1.0),
-    "system": (0.8, 0.0, 0.8),  # Changed to Purple
-    "system_repaired": (0.0, 1.0, 0.0),
-    "wall": (1.0, 0.75, 0.8),
-    "floor1": (0.7, 0.7, 0.7),
-    "floor2": (0.4, 0.4, 0.4),
-    "text": (1.0, 1.0, 1.0),
-    "upgrade_text": (0.9, 0.9, 0.3),
-    "repair_bar_bg": (0.4, 0.4, 0.4),
-    "repair_bar_fg": (1.0, 0.0, 0.0),
-    "crosshair": (1.0, 1.0, 1.0, 0.8),  # White, slightly transparent
-}
-
-# Level layouts - Expanded to 15x15
-# (0=empty, 1=wall, 2=system)
-LEVEL_LAYOUTS = [
-    # Level 1: Larger simple area with 2 systems
-    [
-        [1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1],
-        [1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1],
-        [1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1],
-        [1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1],
-        [1, 0, 0, 2, 0, 0, 1, 1, 1, 0, 0, 0, 0, 0, 1],
-        [1, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 1],
-        [1, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 1],
-        [1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1],
-        [1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1],
-        [1, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 2, 0, 0, 1],
-        [1, 0, 0, 0, 0, 0, 1, 1, 1, 0, 0, 0, 0, 0, 1],
-        [1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1],
-        [1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1],
-        [1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1],
-        [1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1],
-    ],
-    # Level 2: Larger complex layout with 3 systems
-    [
-        [1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1],
-        [1, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 1],
-        [1, 0, 1, 1, 1, 0, 0, 1, 0, 0, 2, 0, 1, 0, 1],
-        [1, 0, 1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1, 0, 1],
-        [1, 0, 1, 0, 1, 1, 0, 1, 1, 1, 1, 0, 1, 0, 1],
-        [1, 0, 0, 0, 1, 0, 0, 0, 0, 0, 1, 0, 0, 0, 1],
-        [1, 0, 1, 0, 1, 0, 1, 1, 1, 0, 1, 1, 1, 0, 1],
-        [1, 0, 1, 0, 1, 0, 0, 2, 0, 0, 0, 0, 0, 0, 1],
-        [1, 0, 1, 0, 1, 1, 1, 1, 1, 0, 1, 1, 1, 0, 1],
-        [1, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 1],
-        [1, 1, 1, 1, 1, 0, 1, 0, 1, 1, 1, 1, 0, 1, 1],
-        [1, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 1],
-        [1, 0, 2, 0, 1, 0, 1, 1, 1, 1, 1, 0, 1, 0, 1],
-        [1, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 1, 0, 1],
-        [1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1],
-    ],
-    # Level 3: Larger complex maze with 3 systems
-    [
-        [1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1],
-        [1, 0, 0, 0, 1, 0, 0, 0, 1, 0, 0, 0, 0, 0, 1],
-        [1, 0, 1, 0, 1, 1, 1, 0, 1, 0, 1, 1, 1, 0, 1],
-        [1, 0, 1, 0, 0, 0, 1, 0, 1, 0, 1, 0, 0, 0, 1],
-        [1, 0, 1, 1, 1, 0, 1, 0, 1, 0, 1, 0, 1, 1, 1],
-        [1, 0, 0, 0, 1, 0, 0, 0, 1, 0, 0, 0, 1, 0, 1],
-        [1, 1, 1, 0, 1, 1, 1, 0, 1, 1, 1, 0, 1, 0, 1],
-        [1, 2, 0, 0, 0, 0, 1, 0, 0, 0, 1, 0, 0, 0, 1],
-        [1, 1, 1, 1, 1, 0, 1, 1, 1, 0, 1, 1, 1, 0, 1],
-        [1, 0, 0, 0, 1, 0, 0, 0, 0, 0, 1, 0, 0, 0, 1],
-        [1, 0, 1, 0, 1, 1, 1, 1, 1, 0, 1, 0, 1, 1, 1],
-        [1, 0, 1, 0, 0, 0, 0, 0, 1, 0, 1, 0, 0, 2, 1],
-        [1, 0, 1, 1, 1, 1, 1, 0, 1, 1, 1, 1, 1, 0, 1],
-        [1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1],
-        [1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1],
-    ],
-]
+from game_data import *
 
+# GLUT input codes, mirrored so input handling works without importing PyOpenGL
+GLUT_LEFT_BUTTON = 0
+GLUT_RIGHT_BUTTON = 2
+GLUT_DOWN = 0
+GLUT_KEY_F3 = 3
+GLUT_KEY_LEFT = 100
+GLUT_KEY_UP = 101
+GLUT_KEY_RIGHT = 102
+GLUT_KEY_DOWN = 103
 
 # --- Global Game State ---
 player = {}
@@ -182,6 +30,7 @@ enemy_bullets = []
 
 level = 1
 score = 0
+systems_remaining = 0  # Unrepaired systems on this level
 system_being_repaired = None  # Add with other global variables
 upgrading = False
 repairing = False
@@ -189,7 +38,21 @@ repair_timer = 0.0
 game_over = False
 level_complete = False
 points_available = 0
-last_player_enemy_collision_time = {}  # Track last collision time per enemy index
+last_player_enemy_collision_time = {}  # Track last collision time per enemy uid
+enemy_uids = itertools.count()  # Stable enemy keys; list indices shift as enemies die
+# Per-layout visibility data for occlusion culling (see compile_level)
+compiled_levels = {}
+precompile_levels = False  # Set once a window opens; builds it at level load
+
+# Compiled enemy archetypes (see compile_enemy_archetypes): enemies carry a
+# "type_id" indexing enemy_archetypes, so hot loops never look types up by name
+enemy_archetypes = []  # type id -> dict of properties and update kernel
+enemy_type_ids = {}  # type name -> type id
+ai_lod_bands_sq = []  # AI_LOD_BANDS with squared distances
+# Last tick's AI work: decisions made, due decisions left for later by the
+# budget, and the age in ticks of the oldest cached decision
+ai_stats = {"decided": 0, "over_budget": 0, "max_staleness": 0}
+ai_schedule = {"cursor": 0}  # Enemy index the next tick's decisions start from
 
 # Camera state
 camera_mode = "third"  # "first" or "third"
@@ -202,11 +65,97 @@ camera_current_height = CAMERA_DEFAULT_HEIGHT_THIRD
 keys_pressed = set()  # Store currently pressed keys
 special_keys_pressed = set()  # Store currently pressed special keys (arrows)
 
+show_render_stats = False  # Toggled with F3
+
 # Timing
+sim_time = 0.0  # Game clock: seconds simulated so far (drives all gameplay timers)
+sim_ticks = 0  # Simulation steps run so far
 last_frame_time = 0.0
+sim_accumulator = 0.0  # Real time not yet consumed by simulation ticks
+
+# Threaded simulation: the worker publishes snapshots into two slots and
+# flips "front" once the back slot is complete; display() only reads the front
+sim_thread = {
+    "thread": None,
+    "running": False,
+    "buffers": [None, None],
+    "front": 0,
+    "sequence": 0,  # Bumped on every published snapshot
+}
+input_queue = deque()  # (handler, args) pairs; deque appends/pops are atomic
 show_muzzle_flash_until = 0.0  # Time when muzzle flash should disappear
 
 
+# Event log: records are queued by the game and written out by a background thread
+event_log = {
+    "threshold": EVENT_LOG_LEVELS[EVENT_LOG_LEVEL],
+    "records": deque(),  # (timestamp, severity, event, message template, fields)
+    "thread": None,
+    "start_lock": threading.Lock(),  # Only one caller may start the thread
+    "stop": threading.Event(),  # Set on exit so the thread hands over the final flush
+    "stream": sys.stdout,
+}
+
+
+# --- Event Logging ---
+def log_event(severity, event, message, **fields):
+    """Queues a structured log record; formatting and I/O happen off the game thread.
+
+    Records below the configured level are dropped before anything is built,
+    and with EVENT_LOG_LEVEL "off" no flush thread is ever started.
+    """
+    if EVENT_LOG_LEVELS[severity] < event_log["threshold"]:
+        return
+    event_log["records"].append((time.time(), severity, event, message, fields))
+    if event_log["thread"] is None:
+        start_event_log()
+
+
+def set_event_log_level(level):
+    """Changes the minimum level of records that get logged."""
+    event_log["threshold"] = EVENT_LOG_LEVELS[level]
+
+
+def flush_event_log():
+    """Formats and writes every queued record in a single write.
+
+    Only one thread drains the queue at a time: the flush thread while it
+    runs, then the main thread once stop_event_log() has joined it.
+    """
+    records = event_log["records"]
+    lines = []
+    while records:
+        timestamp, severity, event, message, fields = records.popleft()
+        lines.append(f"{severity.upper()} {event}: {message.format(**fields)}\n")
+    if lines:
+        event_log["stream"].write("".join(lines))
+        event_log["stream"].flush()
+
+
+def event_log_worker():
+    """Background thread body: flushes the log every EVENT_LOG_FLUSH_INTERVAL until stopped."""
+    while not event_log["stop"].wait(EVENT_LOG_FLUSH_INTERVAL):
+        flush_event_log()
+
+
+def start_event_log():
+    """Starts the background flush thread once, and stops it on exit."""
+    with event_log["start_lock"]:
+        if event_log["thread"] is not None:
+            return  # Lost the race to the game's other thread
+        thread = threading.Thread(target=event_log_worker, name="event-log", daemon=True)
+        thread.start()
+        event_log["thread"] = thread
+        atexit.register(stop_event_log)
+
+
+def stop_event_log():
+    """Stops the flush thread, then writes whatever it left in the queue."""
+    event_log["stop"].set()
+    event_log["thread"].join()
+    flush_event_log()
+
+
 # --- Utility Functions ---
 def get_level_bounds():
     """Returns the boundaries of the current level."""
@@ -233,6 +182,35 @@ def is_wall(x, y):
     return True
 
 
+def store_previous_state():
+    """Remembers positions before a simulation tick for render interpolation."""
+    for entity in [player, *enemies, *bullets, *enemy_bullets]:
+        entity["prev_x"] = entity["x"]
+        entity["prev_y"] = entity["y"]
+        entity["prev_z"] = entity["z"]
+        if "angle" in entity:
+            entity["prev_angle"] = entity["angle"]
+
+
+def interpolate_entity(entity, alpha, with_angle=True):
+    """Returns a copy of entity placed alpha of the way from its previous tick.
+
+    Entities spawned since the last tick have no previous state and are
+    returned unchanged.
+    """
+    if "prev_x" not in entity:
+        return entity
+    blended = dict(entity)
+    blended["x"] = entity["prev_x"] + (entity["x"] - entity["prev_x"]) * alpha
+    blended["y"] = entity["prev_y"] + (entity["y"] - entity["prev_y"]) * alpha
+    blended["z"] = entity["prev_z"] + (entity["z"] - entity["prev_z"]) * alpha
+    if with_angle and "prev_angle" in entity:
+        # Turn the short way round
+        delta = (entity["angle"] - entity["prev_angle"] + 180) % 360 - 180
+        blended["angle"] = entity["prev_angle"] + delta * alpha
+    return blended
+
+
 def distance(x1, y1, x2, y2):
     """Calculates Euclidean distance between two points."""
     return math.sqrt((x1 - x2) ** 2 + (y1 - y2) ** 2)
@@ -240,20 +218,178 @@ def distance_3d(x1, y1, z1, x2, y2, z2):
     return math.sqrt((x1 - x2) ** 2 + (y1 - y2) ** 2 + (z1 - z2) ** 2)
 
 
+def get_direction_vectors(entity):
+    """Returns an entity's (forward, right, aim) unit vectors, cached on the entity.
+
+    forward and right are (x, y) along the ground, right being 90 degrees
+    anticlockwise of forward (the D strafe direction); aim is the (x, y, z)
+    direction including "pitch". They are recomputed only when "angle" or
+    "pitch" no longer match the values they were built from.
+    """
+    cached = entity.get("direction_vectors")
+    if (
+        cached is None
+        or cached[0] != entity["angle"]
+        or cached[1] != entity.get("pitch", 0.0)
+    ):
+        angle = entity["angle"]
+        pitch = entity.get("pitch", 0.0)
+        yaw_rad = math.radians(angle)
+        pitch_rad = math.radians(pitch)
+        forward = (math.cos(yaw_rad), math.sin(yaw_rad))
+        right = (math.cos(yaw_rad + math.pi / 2), math.sin(yaw_rad + math.pi / 2))
+        aim = (
+            forward[0] * math.cos(pitch_rad),
+            forward[1] * math.cos(pitch_rad),
+            math.sin(pitch_rad),
+        )
+        # (angle, pitch, vectors), so a cache hit returns without building anything
+        cached = (angle, pitch, (forward, right, aim))
+        entity["direction_vectors"] = cached
+    return cached[2]
+
+
+def face_direction(entity, dx, dy, dist):
+    """Turns an entity to face along (dx, dy), of length dist > 0; returns its forward vector.
+
+    Fills the direction vector cache from (dx, dy) itself, so nothing has
+    to convert the new angle back through radians, cos and sin.
+    """
+    angle = math.degrees(math.atan2(dy, dx))
+    forward = (dx / dist, dy / dist)
+    entity["angle"] = angle
+    entity["direction_vectors"] = (
+        angle,
+        entity.get("pitch", 0.0),
+        (forward, (-forward[1], forward[0]), (forward[0], forward[1], 0.0)),
+    )
+    return forward
+
+
+# --- Level Compilation ---
+def is_sight_line_clear(layout, x0, y0, x1, y1):
+    """Walks the grid cells crossed by a segment (in cell units) looking for walls."""
+    cell_x, cell_y = int(x0), int(y0)
+    end_x, end_y = int(x1), int(y1)
+    dx = x1 - x0
+    dy = y1 - y0
+    step_x = 1 if dx > 0 else -1
+    step_y = 1 if dy > 0 else -1
+    # Distance along the segment (in t) between vertical / horizontal grid lines
+    t_delta_x = abs(1 / dx) if dx else math.inf
+    t_delta_y = abs(1 / dy) if dy else math.inf
+    t_max_x = ((cell_x + 1 - x0) if dx > 0 else (x0 - cell_x)) * t_delta_x if dx else math.inf
+    t_max_y = ((cell_y + 1 - y0) if dy > 0 else (y0 - cell_y)) * t_delta_y if dy else math.inf
+
+    while (cell_x, cell_y) != (end_x, end_y):
+        if t_max_x < t_max_y:
+            cell_x += step_x
+            t_max_x += t_delta_x
+        else:
+            cell_y += step_y
+            t_max_y += t_delta_y
+        if layout[cell_y][cell_x] == 1:
+            return False
+    return True
+
+
+def build_potentially_visible_sets(layout):
+    """Computes, for every open cell, the set of open cells visible from it.
+
+    Two cells see each other if any sight line between their sample points
+    misses every wall. Visibility is symmetric, so each pair is tested once.
+    Sampled lines can miss a sight line through a sliver of a cell, so each
+    set is then grown by the open neighbours of its cells to stay
+    conservative (check_pvs.py compares the result against dense sampling).
+    """
+    rows = len(layout)
+    cols = len(layout[0])
+    open_cells = [
+        (x, y) for y in range(rows) for x in range(cols) if layout[y][x] != 1
+    ]
+    pvs = {cell: {cell} for cell in open_cells}
+
+    for i, (ax, ay) in enumerate(open_cells):
+        for bx, by in open_cells[i + 1:]:
+            if any(
+                is_sight_line_clear(layout, ax + sx, ay + sy, bx + tx, by + ty)
+                for sx, sy in PVS_SAMPLE_POINTS
+                for tx, ty in PVS_SAMPLE_POINTS
+            ):
+                pvs[(ax, ay)].add((bx, by))
+                pvs[(bx, by)].add((ax, ay))
+
+    grown = {cell: set() for cell in open_cells}
+    for cell, visible in pvs.items():
+        for x, y in visible:
+            for ny in range(max(0, y - 1), min(rows, y + 2)):
+                for nx in range(max(0, x - 1), min(cols, x + 2)):
+                    if layout[ny][nx] != 1:
+                        grown[cell].add((nx, ny))
+                        grown[(nx, ny)].add(cell)  # Keep the sets symmetric
+
+    return {cell: frozenset(visible) for cell, visible in grown.items()}
+
+
+def get_visible_chunks(layout, visible_cells):
+    """Returns the level chunks holding any visible cell or the walls around it."""
+    rows = len(layout)
+    cols = len(layout[0])
+    chunks = set()
+    for x, y in visible_cells:
+        # Wall faces bordering a visible cell may live in a neighbouring chunk
+        for ny in range(max(0, y - 1), min(rows, y + 2)):
+            for nx in range(max(0, x - 1), min(cols, x + 2)):
+                chunks.add((nx // LEVEL_CHUNK_SIZE, ny // LEVEL_CHUNK_SIZE))
+    return frozenset(chunks)
+
+
+def compile_level(layout_index):
+    """Returns the precomputed data for a layout, building it on first use.
+
+    With a window open, reset_level calls this as each level loads, so
+    display() finds it ready; headless tools never pay for it.
+
+    The result holds the per-cell potentially visible set ("pvs") and the
+    chunks each cell can see ("pvs_chunks").
+    """
+    compiled = compiled_levels.get(layout_index)
+    if compiled is None:
+        layout = LEVEL_LAYOUTS[layout_index]
+        pvs = build_potentially_visible_sets(layout)
+        compiled = {
+            "pvs": pvs,
+            "pvs_chunks": {
+                cell: get_visible_chunks(layout, visible)
+                for cell, visible in pvs.items()
+            },
+        }
+        compiled_levels[layout_index] = compiled
+    return compiled
+
+
 # --- Initialization ---
 def reset_level():
     """Resets the state for the current or next level."""
     global player, enemies, systems, powerups, bullets, enemy_bullets
     global repair_timer, repairing, level_complete, last_player_enemy_collision_time
+    global systems_remaining
     global camera_orbit_angle_offset, camera_current_distance, camera_current_height  # Reset camera offsets
 
     if level > len(LEVEL_LAYOUTS):
-        print(
-            f"Attempting to load level {level}, max is {len(LEVEL_LAYOUTS)}. Resetting game."
+        log_event(
+            "warning",
+            "level_out_of_range",
+            "Attempting to load level {level}, max is {max_level}. Resetting game.",
+            level=level,
+            max_level=len(LEVEL_LAYOUTS),
         )
         reset_game()
         return
 
+    if precompile_levels:
+        compile_level(level - 1)
+
     current_layout = LEVEL_LAYOUTS[level - 1]
     rows = len(current_layout)
     cols = len(current_layout[0])
@@ -301,13 +437,12 @@ def reset_level():
                         "repaired": False,
                     }
                 )
+    systems_remaining = len(systems)
 
     # Spawn initial enemies - Reduced counts
     spawn_count = {
-        "scout": 2 + level * 1,  # Reduced scout count
-        "tank": max(0, level - 1) * 1,  # Reduced tank count
-        "sniper": max(0, level - 2) * 1,  # Sniper starts later
-        "drone": level * 2,
+        enemy_type: max(0, base + per_level * level)
+        for enemy_type, (base, per_level) in SPAWN_COUNTS.items()
     }
 
     for enemy_type, count in spawn_count.items():
@@ -315,13 +450,13 @@ def reset_level():
             for _ in range(count):
                 spawn_enemy(enemy_type)
 
+    # Nothing to interpolate from on a fresh level
+    store_previous_state()
 
-def reset_game():
-    """Resets the entire game state to start from level 1."""
-    global player, level, score, upgrading, game_over, points_available, last_frame_time, level_complete
-    global camera_orbit_angle_offset, camera_current_distance, camera_current_height  # Reset camera
 
-    player = {
+def new_player():
+    """Returns a fresh level 1 player; reset_level puts it at the start."""
+    return {
         "x": 0,
         "y": 0,
         "z": 0,
@@ -334,16 +469,32 @@ def reset_game():
         "fire_rate": 0.5,
         "shield": 0,
         "max_shield": 0,
-        "last_shot_time": 0.0,
+        "last_shot_time": -math.inf,  # Free to fire straight away
     }
 
+
+def reset_game():
+    """Resets the entire game state to start from level 1."""
+    global player, level, score, upgrading, game_over, points_available, last_frame_time, level_complete
+    global camera_orbit_angle_offset, camera_current_distance, camera_current_height  # Reset camera
+    global sim_time, sim_ticks, show_muzzle_flash_until, last_print_time
+
+    player = new_player()
+
+    # Restart the game clock so a session plays the same whatever ran before it
+    sim_time = 0.0
+    sim_ticks = 0
+    show_muzzle_flash_until = 0.0
+    last_print_time = 0
+    ai_schedule["cursor"] = 0
+
     level = 1
     score = 0
     upgrading = False
     game_over = False
     level_complete = False
     points_available = 0
-    last_frame_time = time.time()
+    last_frame_time = time.perf_counter()
 
     # Reset camera view offsets
     camera_orbit_angle_offset = 0.0
@@ -377,19 +528,30 @@ def spawn_enemy(enemy_type):
                 distance(player["x"], player["y"], spawn_x, spawn_y)
                 >= min_dist_from_player
             ):
-                enemies.append({
-                      "type": enemy_type,
-                       "x": spawn_x,
-                       "y": spawn_y,
-                       "z": ENEMY_TYPES[enemy_type].get("altitude", 0),
-                       "health": ENEMY_TYPES[enemy_type]["health"],
-                       "angle": random.uniform(0, 360),
-                       "last_shot_time": 0.0,
-})
-                
+                archetype = enemy_archetypes[enemy_type_ids[enemy_type]]
+                enemies.append(
+                    {
+                        "type": enemy_type,
+                        "type_id": archetype["id"],
+                        "uid": next(enemy_uids),
+                        "x": spawn_x,
+                        "y": spawn_y,
+                        "z": archetype["altitude"],
+                        "health": archetype["health"],
+                        "angle": random.uniform(0, 360),
+                        "last_shot_time": -math.inf,
+                        # Cached AI decision: direction to move in (None = stay) and when it was made
+                        "heading": None,
+                        "decision_tick": sim_ticks,
+                    }
+                )
                 return
-    print(
-        f"Warning: Could not find valid spawn location for {enemy_type} after {attempts} attempts."
+    log_event(
+        "warning",
+        "spawn_failed",
+        "Could not find valid spawn location for {enemy_type} after {attempts} attempts.",
+        enemy_type=enemy_type,
+        attempts=attempts,
     )
 
 
@@ -399,458 +561,7 @@ def spawn_powerup(x, y):
     powerups.append({"type": powerup_type, "x": x, "y": y, "z": 15, "rotation": 0.0})
 
 
-# --- Drawing Functions ---
-def draw_player():
-    """Draws the player model and muzzle flash."""
-    global show_muzzle_flash_until
-    current_time = time.time()
-
-    glPushMatrix()
-    glTranslatef(player["x"], player["y"], player["z"])
-    glRotatef(player["angle"], 0, 0, 1)
-
-    body_height = 60
-    head_radius = 15
-    gun_length = 50
-    gun_radius = 6
-    gun_pos_forward = 10
-    gun_pos_right = 15
-    gun_pos_up = body_height * 0.55
-
-    # Body
-    glColor3f(*COLORS["player_body"])
-    glPushMatrix()
-    glTranslatef(0, 0, body_height / 2)
-    glScalef(30, 30, body_height)
-    glutSolidCube(1)
-    glPopMatrix()
-
-    # Head
-    glColor3f(*COLORS["player_head"])
-    glPushMatrix()
-    glTranslatef(0, 0, body_height + head_radius * 0.8)
-    glutSolidSphere(head_radius, 20, 20)
-    glPopMatrix()
-
-    # Gun
-    glPushMatrix()
-    glTranslatef(gun_pos_forward, gun_pos_right, gun_pos_up)
-    glColor3f(*COLORS["gun"])
-    glRotatef(90, 0, 1, 0)
-    gluCylinder(gluNewQuadric(), gun_radius, gun_radius, gun_length, 10, 10)
-    # Gun tip cube
-    glTranslatef(0, 0, gun_length)
-    glScalef(gun_radius * 1.5, gun_radius * 1.5, gun_radius * 1.5)
-    glutSolidCube(1)
-    glPopMatrix()  # Gun transform
-
-    # Muzzle Flash (if active)
-    if current_time < show_muzzle_flash_until:
-        glPushMatrix()
-        # Position flash at the gun tip
-        flash_x = gun_pos_forward + gun_length * math.cos(
-            math.radians(0)
-        )  # Gun points along local X before rotation
-        flash_y = gun_pos_right
-        flash_z = gun_pos_up
-        # Apply gun rotation to flash position relative to player center
-        # This part is tricky without matrix math, approximate:
-        # Flash should be at the end of the gun barrel in world space
-        # Calculate world offset based on player angle
-        angle_rad = math.radians(player["angle"])
-        gun_world_offset_x = (
-            math.cos(angle_rad) * (gun_pos_forward + gun_length)
-            - math.sin(angle_rad) * gun_pos_right
-        )
-        gun_world_offset_y = (
-            math.sin(angle_rad) * (gun_pos_forward + gun_length)
-            + math.cos(angle_rad) * gun_pos_right
-        )
-
-        # We draw relative to player, so just use the local gun tip position
-        glTranslatef(
-            gun_pos_forward + gun_length, gun_pos_right, gun_pos_up
-        )  # Position at tip
-        glColor3f(*COLORS["muzzle_flash"])
-        glutSolidSphere(gun_radius * 1.8, 8, 8)  # Slightly larger than barrel
-        glPopMatrix()
-
-    # Shield
-    if player.get("shield", 0) > 0:
-        glEnable(GL_BLEND)
-        glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
-        alpha = 0.2 + 0.3 * (player["shield"] / player.get("max_shield", 1))
-        glColor4f(0.3, 0.6, 1.0, alpha)
-        glPushMatrix()
-        glTranslatef(0, 0, body_height / 2 + 5)
-        glutSolidSphere(PLAYER_RADIUS + 15, 20, 20)
-        glPopMatrix()
-        glDisable(GL_BLEND)
-        glColor4f(1.0, 1.0, 1.0, 1.0)
-
-    glPopMatrix()  # Player base transform
-
-
-def draw_enemy(enemy):
-    """Draws a single enemy based on its type."""
-    enemy_type = enemy["type"]
-    props = ENEMY_TYPES[enemy_type]
-    size = props["size"]
-
-    glPushMatrix()
-    glTranslatef(enemy["x"], enemy["y"], enemy["z"])
-    glRotatef(enemy["angle"], 0, 0, 1)
-
-    if enemy_type == "scout":
-        glColor3f(*COLORS["enemy_scout"])
-        glPushMatrix()
-        glTranslatef(0, 0, size * 0.7)
-        glutSolidSphere(size, 16, 16)
-        glPopMatrix()
-    elif enemy_type == "tank":
-        glColor3f(*COLORS["enemy_tank"])
-        glPushMatrix()
-        glTranslatef(0, 0, size / 2)
-        glScalef(size, size, size)
-        glutSolidCube(1)
-        glPopMatrix()
-    elif enemy_type == "drone":
-        glPushMatrix()
-        # Slight hover animation
-        hover_offset = math.sin(time.time() * 4) * 2  # Small up-down motion
-        glTranslatef(0, 0, hover_offset)
-        # Central body (cylinder)
-        glColor3f(1.0, 0.0, 0.0)  # Red for drone body
-        glPushMatrix()
-        glRotatef(90, 1, 0, 0)
-        gluCylinder(gluNewQuadric(), size * 0.4, size * 0.4, size * 0.3, 16, 16)
-        glPopMatrix()
-        # Rotor arms (4 arms at 90-degree intervals)
-        glColor3f(0.7, 0.0, 0.0)  # Darker red for arms
-        for angle in [0, 90, 180, 270]:
-            glPushMatrix()
-            glRotatef(angle, 0, 0, 1)
-            glTranslatef(size * 0.6, 0, size * 0.15)
-            glScalef(size * 0.4, size * 0.1, size * 0.1)
-            glutSolidCube(1)
-            glPopMatrix()
-        # Rotors (discs at end of arms)
-        glColor3f(0.5, 0.5, 0.5)  # Gray for rotors
-        for angle in [0, 90, 180, 270]:
-            glPushMatrix()
-            glRotatef(angle, 0, 0, 1)
-            glTranslatef(size * 0.6, 0, size * 0.25)
-            gluDisk(gluNewQuadric(), 0, size * 0.3, 16, 1)
-            glPopMatrix()
-        glPopMatrix()
-    elif enemy_type == "sniper":
-        glColor3f(*COLORS["enemy_sniper"])
-        cylinder_height = size * 1.8
-        cylinder_radius = size * 0.5
-        eye_radius = size * 0.4
-        glPushMatrix()
-        glTranslatef(0, 0, 0)
-        glRotatef(-90, 1, 0, 0)
-        gluCylinder(
-            gluNewQuadric(), cylinder_radius, cylinder_radius, cylinder_height, 10, 10
-        )
-        glPopMatrix()
-        glPushMatrix()
-        glTranslatef(0, 0, cylinder_height + eye_radius * 0.5)
-        glutSolidSphere(eye_radius, 10, 10)
-        glPopMatrix()
-
-    glPopMatrix()
-
-
-def draw_bullet(bullet, is_enemy=False):
-    """Draws a bullet."""
-    glPushMatrix()
-    glTranslatef(bullet["x"], bullet["y"], bullet["z"])
-    if is_enemy:
-        glColor3f(*COLORS["enemy_bullet"])
-        glutSolidSphere(BULLET_SIZE * 0.8, 8, 8)  # Enemy bullets slightly smaller
-    else:
-        glColor3f(*COLORS["bullet"])
-        glutSolidSphere(BULLET_SIZE, 8, 8)  # Use constant size
-    glPopMatrix()
-
-
-def draw_system(system):
-    """Draws a repairable system."""
-    system_size = 40
-    glPushMatrix()
-    glTranslatef(system["x"], system["y"], system["z"])
-    if system["repaired"]:
-        glColor3f(*COLORS["system_repaired"])
-    else:
-        glColor3f(*COLORS["system"])  # Use updated color
-    glPushMatrix()
-    glTranslatef(0, 0, system_size / 2)
-    glScalef(system_size, system_size, system_size)
-    glutSolidCube(1)
-    glPopMatrix()
-    glPopMatrix()
-
-
-def draw_powerup(powerup):
-    """Draws a powerup."""
-    glPushMatrix()
-    glTranslatef(powerup["x"], powerup["y"], powerup["z"])
-    glRotatef(powerup["rotation"], 0, 0, 1)
-
-    if powerup["type"] == "health":
-        glColor3f(*COLORS["health_pack"])
-        glutSolidCube(20)
-    elif powerup["type"] == "ammo":
-        glColor3f(*COLORS["ammo_pack"])
-        glutSolidSphere(12, 10, 10)
-
-    glPopMatrix()
-
-
-def draw_level():
-    """Draws the walls and floor of the current level."""
-    if level > len(LEVEL_LAYOUTS):
-        return
-
-    layout = LEVEL_LAYOUTS[level - 1]
-    rows = len(layout)
-    cols = len(layout[0])
-    wall_height = CELL_SIZE * 0.9
-
-    for y in range(rows):
-        for x in range(cols):
-            cell = layout[y][x]
-            x_pos = x * CELL_SIZE
-            y_pos = y * CELL_SIZE
-
-            if cell == 1:
-                glColor3f(*COLORS["wall"])
-                glPushMatrix()
-                glTranslatef(
-                    x_pos + CELL_SIZE / 2, y_pos + CELL_SIZE / 2, wall_height / 2
-                )
-                glScalef(CELL_SIZE, CELL_SIZE, wall_height)
-                glutSolidCube(1)
-                glPopMatrix()
-            else:
-                if ((x + y) // 1) % 2 == 0:  # Ensure integer division for index
-                    glColor3f(*COLORS["floor1"])
-                else:
-                    glColor3f(*COLORS["floor2"])
-
-                glBegin(GL_QUADS)
-                glVertex3f(x_pos, y_pos, 0)
-                glVertex3f(x_pos + CELL_SIZE, y_pos, 0)
-                glVertex3f(x_pos + CELL_SIZE, y_pos + CELL_SIZE, 0)
-                glVertex3f(x_pos, y_pos + CELL_SIZE, 0)
-                glEnd()
-
-
-def draw_text(x, y, text, font=GLUT_BITMAP_HELVETICA_18, color=COLORS["text"]):
-    """Draws text on the screen using GLUT bitmap fonts."""
-    glColor3f(*color)
-    glRasterPos2f(x, y)
-    for char in text:
-        glutBitmapCharacter(font, ord(char))
-
-
-def draw_crosshair():
-    """Draws a simple 2D crosshair in the center of the screen."""
-    win_w = glutGet(GLUT_WINDOW_WIDTH)
-    win_h = glutGet(GLUT_WINDOW_HEIGHT)
-    center_x = win_w / 2
-    center_y = win_h / 2
-    size = 10  # Size of the crosshair lines
-
-    glColor4f(*COLORS["crosshair"])  # Use color with alpha
-    glLineWidth(2.0)  # Make lines thicker
-
-    glBegin(GL_LINES)
-    # Horizontal line
-    glVertex2f(center_x - size, center_y)
-    glVertex2f(center_x + size, center_y)
-    # Vertical line
-    glVertex2f(center_x, center_y - size)
-    glVertex2f(center_x, center_y + size)
-    glEnd()
-
-
-def draw_ui():
-    """Draws the 2D UI elements."""
-    glMatrixMode(GL_PROJECTION)
-    glPushMatrix()
-    glLoadIdentity()
-    win_w = glutGet(GLUT_WINDOW_WIDTH)
-    win_h = glutGet(GLUT_WINDOW_HEIGHT)
-    gluOrtho2D(0, win_w, 0, win_h)
-
-    glMatrixMode(GL_MODELVIEW)
-    glPushMatrix()
-    glLoadIdentity()
-
-    glDisable(GL_DEPTH_TEST)
-    # Enable blending for crosshair transparency
-    glEnable(GL_BLEND)
-    glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
-
-    # --- Draw Standard UI ---
-    draw_text(10, win_h - 30, f"Level: {level}")
-    draw_text(
-        10, win_h - 60, f"Health: {player['health']}/{player.get('max_health', 100)}"
-    )
-    draw_text(10, win_h - 90, f"Ammo: {player['ammo']}/{player.get('max_ammo', 20)}")
-    draw_text(10, win_h - 120, f"Score: {score}")
-    if player.get("shield", 0) > 0:
-        draw_text(
-            10, win_h - 150, f"Shield: {player['shield']}/{player.get('max_shield', 0)}"
-        )
-
-    systems_remaining = sum(1 for s in systems if not s["repaired"])
-    objective_text = f"Systems Left: {systems_remaining}"
-    draw_text(win_w - 160, win_h - 30, objective_text)
-
-    # --- Draw Repair Bar ---
-    if repairing:
-        bar_width = 200
-        bar_height = 20
-        bar_x = (win_w - bar_width) / 2
-        bar_y = 50
-        progress = min(1.0, repair_timer / REPAIR_TIME)
-
-        glColor3f(*COLORS["repair_bar_bg"])
-        glBegin(GL_QUADS)
-        glVertex2f(bar_x, bar_y)
-        glVertex2f(bar_x + bar_width, bar_y)
-        glVertex2f(bar_x + bar_width, bar_y + bar_height)
-        glVertex2f(bar_x, bar_y + bar_height)
-        glEnd()
-        glColor3f(*COLORS["repair_bar_fg"])
-        glBegin(GL_QUADS)
-        glVertex2f(bar_x, bar_y)
-        glVertex2f(bar_x + bar_width * progress, bar_y)
-        glVertex2f(bar_x + bar_width * progress, bar_y + bar_height)
-        glVertex2f(bar_x, bar_y + bar_height)
-        glEnd()
-        draw_text(
-            bar_x + bar_width / 2 - 40,
-            bar_y + bar_height / 2 - 5,
-            "REPAIRING...",
-            GLUT_BITMAP_HELVETICA_12,
-        )
-
-    # --- Draw Crosshair (only in first person) ---
-    if camera_mode == "first":
-        draw_crosshair()
-
-    # --- Restore OpenGL state ---
-    glDisable(GL_BLEND)
-    glEnable(GL_DEPTH_TEST)
-    glPopMatrix()  # Modelview
-    glMatrixMode(GL_PROJECTION)
-    glPopMatrix()  # Projection
-    glMatrixMode(GL_MODELVIEW)
-
-
-def draw_game_over_screen():
-    """Draws the game over message."""
-    win_w = glutGet(GLUT_WINDOW_WIDTH)
-    win_h = glutGet(GLUT_WINDOW_HEIGHT)
-    center_x = win_w / 2
-    center_y = win_h / 2
-    draw_text(
-        center_x - 80,
-        center_y + 50,
-        "GAME OVER",
-        GLUT_BITMAP_TIMES_ROMAN_24,
-        (1.0, 0.0, 0.0),
-    )
-    draw_text(center_x - 100, center_y, f"You reached level {level}")
-    draw_text(center_x - 90, center_y - 30, f"Final Score: {score}")
-    draw_text(center_x - 100, center_y - 80, "Press 'R' to restart")
-
-
-def draw_level_complete_screen():
-    """Draws the level complete message."""
-    win_w = glutGet(GLUT_WINDOW_WIDTH)
-    win_h = glutGet(GLUT_WINDOW_HEIGHT)
-    center_x = win_w / 2
-    center_y = win_h / 2
-    draw_text(
-        center_x - 120,
-        center_y + 50,
-        "LEVEL COMPLETE!",
-        GLUT_BITMAP_TIMES_ROMAN_24,
-        (0.0, 1.0, 0.0),
-    )
-    draw_text(center_x - 100, center_y, "All systems repaired")
-    draw_text(center_x - 140, center_y - 50, "Press SPACE for Upgrade Menu")
-
-
-def draw_upgrade_menu():
-    """Draws the upgrade selection menu."""
-    win_w = glutGet(GLUT_WINDOW_WIDTH)
-    win_h = glutGet(GLUT_WINDOW_HEIGHT)
-    center_x = win_w / 2
-    y_pos = win_h * 0.8
-    draw_text(
-        center_x - 100,
-        y_pos,
-        "UPGRADE MENU",
-        GLUT_BITMAP_TIMES_ROMAN_24,
-        color=COLORS["upgrade_text"],
-    )
-    y_pos -= 50
-    draw_text(
-        center_x - 150,
-        y_pos,
-        f"Points Available: {points_available}",
-        color=COLORS["upgrade_text"],
-    )
-    y_pos -= 50
-    draw_text(
-        center_x - 150,
-        y_pos,
-        "1. Faster Fire Rate (50 pts)",
-        color=COLORS["upgrade_text"],
-    )
-    y_pos -= 40
-    draw_text(
-        center_x - 150,
-        y_pos,
-        "2. Increase Max Ammo (+10) (30 pts)",
-        color=COLORS["upgrade_text"],
-    )
-    y_pos -= 40
-    draw_text(
-        center_x - 150,
-        y_pos,
-        "3. Increase Max Health (+25) (40 pts)",
-        color=COLORS["upgrade_text"],
-    )
-    y_pos -= 40
-    draw_text(
-        center_x - 150,
-        y_pos,
-        "4. Add/Improve Shield (+50 Max) (80 pts)",
-        color=COLORS["upgrade_text"],
-    )
-    y_pos -= 60
-    draw_text(
-        center_x - 150,
-        y_pos,
-        "Press 1, 2, 3, or 4 to upgrade",
-        color=COLORS["upgrade_text"],
-    )
-    draw_text(
-        center_x - 150,
-        y_pos - 30,
-        "Press SPACE to skip and continue",
-        color=COLORS["upgrade_text"],
-    )
-
-
+# --- Update Functions ---
 import math
 import time
 
@@ -860,6 +571,7 @@ last_print_time = 0  # To limit repair progress prints
 def update_player(dt):
     """Updates player state: movement and repair actions with debug output."""
     global repairing, repair_timer, system_being_repaired, last_print_time
+    global systems_remaining
 
     # --- Movement (only if not currently repairing) ---
     if not repairing:
@@ -875,11 +587,7 @@ def update_player(dt):
             move_strafe += 1
 
         if move_forward != 0 or move_strafe != 0:
-            angle_rad = math.radians(player["angle"])
-            forward_dx = math.cos(angle_rad)
-            forward_dy = math.sin(angle_rad)
-            strafe_dx = math.cos(angle_rad + math.pi / 2)
-            strafe_dy = math.sin(angle_rad + math.pi / 2)
+            (forward_dx, forward_dy), (strafe_dx, strafe_dy), _ = get_direction_vectors(player)
             final_dx_intent = move_forward * forward_dx + move_strafe * strafe_dx
             final_dy_intent = move_forward * forward_dy + move_strafe * strafe_dy
             magnitude = math.sqrt(final_dx_intent**2 + final_dy_intent**2)
@@ -902,7 +610,7 @@ def update_player(dt):
                     elif not is_wall(player["x"], potential_y):
                         player["y"] = potential_y
 
-    # --- Repair Action Logic with Debug Prints ---
+    # --- Repair Action Logic with Progress Logging ---
     if repairing:
         # Continue or interrupt an ongoing repair
         if (
@@ -914,17 +622,27 @@ def update_player(dt):
             ) < SYSTEM_REPAIR_RADIUS
         ):
             repair_timer += dt
-            # Print repair progress every second
-            current_time = time.time()
+            # Log repair progress every second
+            current_time = sim_time
             if current_time - last_print_time >= 1.0:
-                print(f"Repairing... {repair_timer:.1f}/{REPAIR_TIME} seconds")
+                log_event(
+                    "debug",
+                    "repair_progress",
+                    "Repairing... {timer:.1f}/{total} seconds",
+                    timer=repair_timer,
+                    total=REPAIR_TIME,
+                )
                 last_print_time = current_time
             # Once done, mark repaired and reset state
             if repair_timer >= REPAIR_TIME:
                 system_being_repaired["repaired"] = True
-                print(
-                    f"Repair complete on system at "
-                    f"({system_being_repaired['x']:.0f}, {system_being_repaired['y']:.0f})!"
+                systems_remaining -= 1
+                log_event(
+                    "info",
+                    "repair_complete",
+                    "Repair complete on system at ({x:.0f}, {y:.0f})!",
+                    x=system_being_repaired["x"],
+                    y=system_being_repaired["y"],
                 )
                 repairing = False
                 repair_timer = 0.0
@@ -932,7 +650,7 @@ def update_player(dt):
                 check_level_complete()
         else:
             # Interrupted (ran out of range or released 'r')
-            print("Repair interrupted!")
+            log_event("info", "repair_interrupted", "Repair interrupted!")
             repairing = False
             repair_timer = 0.0
             system_being_repaired = None
@@ -954,85 +672,337 @@ def update_player(dt):
             repairing = True
             repair_timer = 0.0
             system_being_repaired = target_system
-            print(
-                f"Starting repair on system at "
-                f"({target_system['x']:.0f}, {target_system['y']:.0f})"
+            log_event(
+                "info",
+                "repair_started",
+                "Starting repair on system at ({x:.0f}, {y:.0f})",
+                x=target_system["x"],
+                y=target_system["y"],
             )
-            last_print_time = time.time()  # Reset for progress tracking
+            last_print_time = sim_time  # Reset for progress tracking
 
 
 def update_enemies(dt):
-    """Updates enemy state: movement, AI, shooting."""
+    """Updates enemy state: contact damage, AI decisions, then movement and firing.
+
+    Contact damage, movement and firing run for every enemy every tick.
+    Decisions (where to head, which way to face) are the expensive part and
+    are cached on the enemy between runs. An enemy's decision comes due
+    every tick near the player and every few ticks in the farther
+    AI_LOD_BANDS. Due decisions are then made round-robin until
+    AI_BUDGET_US of this tick is spent; the rest wait for the next tick.
+    """
     global player, enemies, score, game_over, last_player_enemy_collision_time, points_available
 
-    current_time = time.time()
+    current_time = sim_time
+    player_x = player["x"]
+    player_y = player["y"]
+    count = len(enemies)
+    due = [False] * count
 
-    for i in range(len(enemies) - 1, -1, -1):
+    for i in range(count - 1, -1, -1):
         enemy = enemies[i]
-        enemy_type = enemy["type"]
-        props = ENEMY_TYPES[enemy_type]
-        speed = props["speed"]  # Uses updated slower speeds
-        radius = props["radius"]
-
-        dx = player["x"] - enemy["x"]
-        dy = player["y"] - enemy["y"]
-        dist_to_player_sq = dx**2 + dy**2
-        dist_to_player = math.sqrt(dist_to_player_sq)
-
-        # AI Behavior
-        if enemy_type == "sniper":
-            if dist_to_player > 0:
-                enemy["angle"] = math.degrees(math.atan2(dy, dx))
-            shoot_range_sq = props["shoot_range"] ** 2
-            fire_rate = props["fire_rate"]
-            if (
-                dist_to_player_sq <= shoot_range_sq
-                and current_time - enemy["last_shot_time"] >= fire_rate
-            ):
-                angle_rad = math.radians(enemy["angle"])
-                bullet_dx = math.cos(angle_rad) * ENEMY_BULLET_SPEED
-                bullet_dy = math.sin(angle_rad) * ENEMY_BULLET_SPEED
-                eye_height = props["size"] * 1.8
-                enemy_bullets.append(
-                    {
-                        "x": enemy["x"],
-                        "y": enemy["y"],
-                        "z": eye_height,
-                        "dx": bullet_dx,
-                        "dy": bullet_dy,
-                        "damage": props["damage"],
-                    }
-                )
-                enemy["last_shot_time"] = current_time
-        else:  # Scout and Tank
-            if dist_to_player_sq > (radius * 1.5) ** 2 and dist_to_player > 0:
-                enemy["angle"] = math.degrees(math.atan2(dy, dx))
-                move_dist = speed * dt
-                move_dx = (dx / dist_to_player) * move_dist
-                move_dy = (dy / dist_to_player) * move_dist
-                potential_x = enemy["x"] + move_dx
-                potential_y = enemy["y"] + move_dy
-                if not is_wall(potential_x, potential_y):
-                    enemy["x"] = potential_x
-                    enemy["y"] = potential_y
+        archetype = enemy_archetypes[enemy["type_id"]]
+        dist_to_player_sq = (player_x - enemy["x"]) ** 2 + (player_y - enemy["y"]) ** 2
 
-        # Collision with Player
-        collision_dist = PLAYER_RADIUS + radius
-        if dist_to_player < collision_dist:
-            last_collision = last_player_enemy_collision_time.get(i, 0)
+        # Collision with Player, from positions before this tick's movement
+        if dist_to_player_sq < archetype["collision_dist_sq"]:
+            last_collision = last_player_enemy_collision_time.get(enemy["uid"], -math.inf)
             if current_time - last_collision > ENEMY_COLLISION_DAMAGE_INTERVAL:
-                damage = props["damage"]
+                damage = archetype["damage"]
                 if player.get("shield", 0) > 0:
                     shield_damage = min(player["shield"], damage)
                     player["shield"] -= shield_damage
                     damage -= shield_damage
                 if damage > 0:
                     player["health"] -= damage
-                last_player_enemy_collision_time[i] = current_time
+                last_player_enemy_collision_time[enemy["uid"]] = current_time
                 if player["health"] <= 0:
                     player["health"] = 0
                     game_over = True
 
+        # AI level of detail: ticks between decisions at this distance
+        interval = 1
+        if dist_to_player_sq > archetype["full_rate_dist_sq"]:
+            for band_dist_sq, band_interval in ai_lod_bands_sq:
+                interval = band_interval
+                if dist_to_player_sq <= band_dist_sq:
+                    break
+        due[i] = sim_ticks - enemy["decision_tick"] >= interval
+
+    # Decisions, round-robin from where the last tick's budget ran out
+    decided = 0
+    deferred = 0
+    if count:
+        deadline = time.perf_counter() + AI_BUDGET_US / 1e6 if AI_BUDGET_US > 0 else math.inf
+        start = ai_schedule["cursor"] % count
+        for k in range(count):
+            i = (start + k) % count
+            if not due[i]:
+                continue
+            if decided and time.perf_counter() >= deadline:
+                # Out of time: carry on from this enemy next tick
+                ai_schedule["cursor"] = i
+                deferred = sum(due) - decided
+                break
+            enemy = enemies[i]
+            archetype = enemy_archetypes[enemy["type_id"]]
+            archetype["think"](enemy, archetype)
+            enemy["decision_tick"] = sim_ticks
+            decided += 1
+
+    # Movement and firing from the cached decisions, one batch per archetype
+    groups = [[] for _ in enemy_archetypes]
+    max_staleness = 0
+    for enemy in enemies:
+        groups[enemy["type_id"]].append(enemy)
+        max_staleness = max(max_staleness, sim_ticks - enemy["decision_tick"])
+    for archetype, group in zip(enemy_archetypes, groups):
+        if group:
+            archetype["act"](group, archetype, dt)
+
+    # Keep chasers from piling up on the same spot
+    separate_enemies(
+        [enemy for archetype, group in zip(enemy_archetypes, groups) if archetype["separates"]
+         for enemy in group],
+        dt,
+    )
+
+    ai_stats["decided"] = decided
+    ai_stats["over_budget"] = deferred
+    ai_stats["max_staleness"] = max_staleness
+
+
+def think_chaser(enemy, archetype):
+    """Decides a chasing enemy's heading: straight at the player, or stop at arm's length."""
+    dx = player["x"] - enemy["x"]
+    dy = player["y"] - enemy["y"]
+    dist_to_player_sq = dx**2 + dy**2
+    if dist_to_player_sq > archetype["stop_dist_sq"] and dist_to_player_sq > 0:
+        enemy["heading"] = face_direction(enemy, dx, dy, math.sqrt(dist_to_player_sq))
+    else:
+        enemy["heading"] = None
+
+
+def move_chasers(group, archetype, dt):
+    """Moves a batch of chasing enemies of one type along their cached headings."""
+    move_dist = archetype["speed"] * dt
+    # is_wall, with the level lookups hoisted out of the loop
+    layout = LEVEL_LAYOUTS[min(level - 1, len(LEVEL_LAYOUTS) - 1)]
+    _, max_x, _, max_y = get_level_bounds()
+    for enemy in group:
+        heading = enemy["heading"]
+        if heading is not None:
+            potential_x = enemy["x"] + heading[0] * move_dist
+            potential_y = enemy["y"] + heading[1] * move_dist
+            if (
+                0 <= potential_x < max_x
+                and 0 <= potential_y < max_y
+                and layout[int(potential_y / CELL_SIZE)][int(potential_x / CELL_SIZE)] != 1
+            ):
+                enemy["x"] = potential_x
+                enemy["y"] = potential_y
+
+
+def think_turret(enemy, archetype):
+    """Turns a stationary enemy to face the player."""
+    dx = player["x"] - enemy["x"]
+    dy = player["y"] - enemy["y"]
+    dist_to_player_sq = dx**2 + dy**2
+    if dist_to_player_sq > 0:
+        face_direction(enemy, dx, dy, math.sqrt(dist_to_player_sq))
+
+
+def fire_turrets(group, archetype, dt):
+    """Fires a batch of stationary enemies of one type along their facing when in range.
+
+    The range and fire_rate checks run every tick, so the firing cadence
+    does not depend on how recently the turret last turned.
+    """
+    current_time = sim_time
+    player_x = player["x"]
+    player_y = player["y"]
+    shoot_range_sq = archetype["shoot_range_sq"]
+    fire_rate = archetype["fire_rate"]
+    muzzle_z = archetype["muzzle_z"]
+    damage = archetype["damage"]
+    for enemy in group:
+        if (
+            (player_x - enemy["x"]) ** 2 + (player_y - enemy["y"]) ** 2 <= shoot_range_sq
+            and current_time - enemy["last_shot_time"] >= fire_rate
+        ):
+            forward_x, forward_y = get_direction_vectors(enemy)[0]
+            enemy_bullets.append(
+                {
+                    "x": enemy["x"],
+                    "y": enemy["y"],
+                    "z": muzzle_z,
+                    "dx": forward_x * ENEMY_BULLET_SPEED,
+                    "dy": forward_y * ENEMY_BULLET_SPEED,
+                    "damage": damage,
+                }
+            )
+            enemy["last_shot_time"] = current_time
+
+
+# Enemies stacked on one spot are pushed apart along directions this far apart
+GOLDEN_ANGLE = math.pi * (3 - math.sqrt(5))  # Radians
+
+
+def separate_enemies(group, dt):
+    """Pushes overlapping enemies apart, boids-style.
+
+    Each enemy is pushed away from every neighbour closer than their summed
+    radii times ENEMY_SEPARATION_SPACING, more strongly the deeper the
+    overlap, at up to ENEMY_SEPARATION_SPEED. Distances are 3D, so drones
+    overhead don't push ground units. A push into a wall is dropped, as in
+    move_chasers. Groups of ENEMY_SEPARATION_GRID_MIN or more use the
+    vectorized grid version; smaller ones are cheaper to check pair by pair.
+    """
+    if len(group) >= ENEMY_SEPARATION_GRID_MIN:
+        separate_enemies_on_grid(group, dt)
+    elif len(group) >= 2:
+        separate_enemies_directly(group, dt)
+
+
+def separate_enemies_directly(group, dt):
+    """separate_enemies for small groups, checking every pair in plain Python."""
+    n = len(group)
+    radius = [enemy_archetypes[enemy["type_id"]]["radius"] for enemy in group]
+    push_x = [0.0] * n
+    push_y = [0.0] * n
+    for a in range(n):
+        enemy_a = group[a]
+        x = enemy_a["x"]
+        y = enemy_a["y"]
+        z = enemy_a["z"]
+        for b in range(a + 1, n):
+            enemy_b = group[b]
+            dx = x - enemy_b["x"]
+            dy = y - enemy_b["y"]
+            dz = z - enemy_b["z"]
+            dist_sq = dx**2 + dy**2 + dz**2
+            spacing = (radius[a] + radius[b]) * ENEMY_SEPARATION_SPACING
+            if dist_sq < spacing**2:
+                dist = math.sqrt(dist_sq)
+                overlap = 1.0 - dist / spacing
+                if dist == 0:
+                    dx = math.cos(a * GOLDEN_ANGLE)
+                    dy = math.sin(a * GOLDEN_ANGLE)
+                    dist = 1.0
+                force_x = dx / dist * overlap
+                force_y = dy / dist * overlap
+                push_x[a] += force_x
+                push_y[a] += force_y
+                push_x[b] -= force_x
+                push_y[b] -= force_y
+
+    step = ENEMY_SEPARATION_SPEED * dt
+    for enemy, enemy_push_x, enemy_push_y in zip(group, push_x, push_y):
+        if enemy_push_x or enemy_push_y:
+            # Never faster than ENEMY_SEPARATION_SPEED, however crowded
+            scale = step / max(1.0, math.hypot(enemy_push_x, enemy_push_y))
+            new_x = enemy["x"] + enemy_push_x * scale
+            new_y = enemy["y"] + enemy_push_y * scale
+            if not is_wall(new_x, new_y):
+                enemy["x"] = new_x
+                enemy["y"] = new_y
+
+
+def get_neighbour_pairs(np, cells):
+    """Returns index arrays (i, j) of every pair of points in the same or adjacent grid cells.
+
+    cells is an (n, 2) integer array of grid coordinates. Points are sorted
+    by cell once, with a table of where each cell's run starts. Each point
+    then reads off the runs of its own cell and the four neighbours "ahead"
+    of it, so every pair comes out once and the work grows with the number
+    of pairs found rather than with n squared.
+    """
+    n = len(cells)
+    cells = cells - cells.min(axis=0) + 1  # Leave a free border for the -1 offsets
+    width = int(cells[:, 0].max()) + 2
+    keys = cells[:, 1] * width + cells[:, 0]
+    order = np.argsort(keys, kind="stable")
+    cell_start = np.searchsorted(keys[order], np.arange(int(keys.max()) + width + 3))
+    pairs_i = []
+    pairs_j = []
+    for offset_x, offset_y in ((0, 0), (1, 0), (-1, 1), (0, 1), (1, 1)):
+        target = keys + offset_y * width + offset_x
+        start = cell_start[target]
+        counts = cell_start[target + 1] - start
+        total = int(counts.sum())
+        if total == 0:
+            continue
+        # Expand each point's [start, start + count) run into pair indices
+        run_offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+        i = np.repeat(np.arange(n), counts)
+        j = order[np.repeat(start, counts) + run_offsets]
+        if offset_x == offset_y == 0:
+            # Within a cell, keep each pair once and drop points paired with themselves
+            keep = i < j
+            i = i[keep]
+            j = j[keep]
+        pairs_i.append(i)
+        pairs_j.append(j)
+    return np.concatenate(pairs_i), np.concatenate(pairs_j)
+
+
+def separate_enemies_on_grid(group, dt):
+    """separate_enemies for large groups, in one vectorized pass.
+
+    Neighbours come from a uniform grid with cells one spacing wide (see
+    get_neighbour_pairs), so the cost grows with the number of close pairs
+    rather than with the square of the group size.
+    """
+    import numpy as np  # Deferred so importing project stays cheap for tools
+
+    n = len(group)
+    pos = np.array([(enemy["x"], enemy["y"], enemy["z"]) for enemy in group])
+    radius = np.array([enemy_archetypes[enemy["type_id"]]["radius"] for enemy in group])
+    cell_size = 2 * radius.max() * ENEMY_SEPARATION_SPACING
+    # Each pair comes out once; its push is applied to both ends
+    i, j = get_neighbour_pairs(np, np.floor(pos[:, :2] / cell_size).astype(np.int64))
+
+    delta = pos[i] - pos[j]
+    dist_sq = (delta**2).sum(axis=1)
+    spacing = (radius[i] + radius[j]) * ENEMY_SEPARATION_SPACING
+    close = dist_sq < spacing**2
+    if not close.any():
+        return
+    i = i[close]
+    j = j[close]
+    delta = delta[close]
+    dist = np.sqrt(dist_sq[close])
+    overlap = 1.0 - dist / spacing[close]
+    # Enemies on exactly the same spot (e.g. spawned in one cell) have no
+    # direction between them; spread them round a circle by index instead
+    stacked = dist == 0
+    angle = i[stacked] * GOLDEN_ANGLE
+    delta[stacked, 0] = np.cos(angle)
+    delta[stacked, 1] = np.sin(angle)
+    dist[stacked] = 1.0
+    force_x = delta[:, 0] / dist * overlap
+    force_y = delta[:, 1] / dist * overlap
+    push_x = np.bincount(i, force_x, n) - np.bincount(j, force_x, n)
+    push_y = np.bincount(i, force_y, n) - np.bincount(j, force_y, n)
+    # Never faster than ENEMY_SEPARATION_SPEED, however crowded
+    scale = ENEMY_SEPARATION_SPEED * dt / np.maximum(1.0, np.hypot(push_x, push_y))
+    new_x = pos[:, 0] + push_x * scale
+    new_y = pos[:, 1] + push_y * scale
+
+    # is_wall, vectorized
+    layout = np.array(LEVEL_LAYOUTS[min(level - 1, len(LEVEL_LAYOUTS) - 1)])
+    _, max_x, _, max_y = get_level_bounds()
+    inside = (new_x >= 0) & (new_x < max_x) & (new_y >= 0) & (new_y < max_y)
+    cell_x = np.where(inside, new_x / CELL_SIZE, 0).astype(np.int64)
+    cell_y = np.where(inside, new_y / CELL_SIZE, 0).astype(np.int64)
+    moves = inside & (layout[cell_y, cell_x] != 1) & ((push_x != 0) | (push_y != 0))
+    new_x = new_x.tolist()
+    new_y = new_y.tolist()
+    for k in np.flatnonzero(moves).tolist():
+        group[k]["x"] = new_x[k]
+        group[k]["y"] = new_y[k]
+
 
 def update_bullets(dt):
     """Updates bullet positions and handles collisions."""
@@ -1054,8 +1024,7 @@ def update_bullets(dt):
         hit_enemy = False
         for j in range(len(enemies) - 1, -1, -1):
             enemy = enemies[j]
-            props = ENEMY_TYPES[enemy["type"]]
-            radius = props["radius"]
+            props = enemy_archetypes[enemy["type_id"]]
             if distance_3d(bullet["x"], bullet["y"], bullet["z"], enemy["x"], enemy["y"], enemy["z"]) < props["radius"]:
                 enemy["health"] -= BULLET_DAMAGE
                 bullets.pop(i)
@@ -1065,8 +1034,7 @@ def update_bullets(dt):
                     points_available += props["points"]
                     spawn_powerup(enemy["x"], enemy["y"])
                     enemies.pop(j)
-                    if j in last_player_enemy_collision_time:
-                        del last_player_enemy_collision_time[j]
+                    last_player_enemy_collision_time.pop(enemy["uid"], None)
                 break
         if hit_enemy:
             continue
@@ -1138,7 +1106,106 @@ def check_level_complete():
         level_bonus = level * 50
         points_available += level_bonus
         score += level_bonus
-        print(f"Level {level} cleared! +{level_bonus} bonus points.")
+        log_event(
+            "info",
+            "level_cleared",
+            "Level {level} cleared! +{bonus} bonus points.",
+            level=level,
+            bonus=level_bonus,
+        )
+
+
+def step_simulation(dt):
+    """Advances the game clock and runs the whole update pipeline by dt seconds."""
+    global sim_time, sim_ticks
+    store_previous_state()
+    sim_time += dt
+    sim_ticks += 1
+    update_camera_controls(dt)  # Update camera based on arrow keys
+    update_player(dt)
+    update_enemies(dt)
+    update_bullets(dt)
+    update_powerups(dt)
+
+
+# --- Enemy Archetypes ---
+# (decide for one enemy, act for a batch every tick) by ENEMY_TYPES "behavior" name
+ENEMY_BEHAVIORS = {
+    "chase": (think_chaser, move_chasers),
+    "turret": (think_turret, fire_turrets),
+}
+ENEMY_TYPE_FIELDS = (
+    "health", "speed", "damage", "points", "size", "radius",
+    "shoot_range", "fire_rate", "lod_distances", "behavior", "model",
+)
+
+
+def compile_enemy_archetypes():
+    """Rebuilds enemy_archetypes and enemy_type_ids from ENEMY_TYPES.
+
+    Type ids follow ENEMY_TYPES order. Call again after changing ENEMY_TYPES
+    or SPAWN_COUNTS so the update kernels see the new values. Raises
+    ValueError for a type with missing fields or an unknown behavior or
+    model, and for spawn counts of unknown types.
+    """
+    archetypes = []
+    for type_id, (name, props) in enumerate(ENEMY_TYPES.items()):
+        missing = [field for field in ENEMY_TYPE_FIELDS if field not in props]
+        if missing:
+            raise ValueError(f"enemy type {name!r} is missing {', '.join(missing)}")
+        if props["behavior"] not in ENEMY_BEHAVIORS:
+            raise ValueError(f"enemy type {name!r} has unknown behavior {props['behavior']!r}")
+        if props["model"] not in ENEMY_MODELS:
+            raise ValueError(f"enemy type {name!r} has unknown model {props['model']!r}")
+        color = props.get("color", COLORS.get("enemy_" + name, COLORS["enemy_" + props["model"]]))
+        archetypes.append(dict(
+            props,
+            id=type_id,
+            name=name,
+            color=tuple(color),
+            altitude=props.get("altitude", 0),
+            lod_distances=tuple(props["lod_distances"]),
+            think=ENEMY_BEHAVIORS[props["behavior"]][0],
+            act=ENEMY_BEHAVIORS[props["behavior"]][1],
+            separates=props["behavior"] == "chase",
+            # Derived values the kernels would otherwise recompute per enemy
+            collision_dist_sq=(PLAYER_RADIUS + props["radius"]) ** 2,
+            stop_dist_sq=(props["radius"] * 1.5) ** 2,
+            shoot_range_sq=props["shoot_range"] ** 2,
+            muzzle_z=props["size"] * 1.8,
+            # AI runs every tick inside this range, whatever the LOD band
+            full_rate_dist_sq=max(AI_FULL_RATE_DISTANCE, props["shoot_range"]) ** 2,
+        ))
+    unknown = [name for name in SPAWN_COUNTS if name not in ENEMY_TYPES]
+    if unknown:
+        raise ValueError(f"spawn counts given for unknown enemy types {', '.join(unknown)}")
+    # Updated in place so other modules' references stay valid
+    enemy_archetypes[:] = archetypes
+    enemy_type_ids.clear()
+    enemy_type_ids.update((archetype["name"], archetype["id"]) for archetype in archetypes)
+    ai_lod_bands_sq[:] = [(band_dist**2, interval) for band_dist, interval in AI_LOD_BANDS]
+
+
+def load_enemy_types(path):
+    """Adds or overrides enemy types from a JSON file and recompiles the archetypes.
+
+    The file holds {"enemy_types": {name: {field: value}}, "spawn_counts":
+    {name: [base, per_level]}}. Fields given for an existing type replace
+    just those fields.
+    """
+    with open(path) as f:
+        data = json.load(f)
+    for name, props in data.get("enemy_types", {}).items():
+        ENEMY_TYPES[name] = dict(ENEMY_TYPES.get(name, {}), **props)
+    for name, counts in data.get("spawn_counts", {}).items():
+        SPAWN_COUNTS[name] = tuple(counts)
+    compile_enemy_archetypes()
+
+
+if ENEMY_TYPES_FILE:
+    load_enemy_types(ENEMY_TYPES_FILE)
+else:
+    compile_enemy_archetypes()
 
 
 # --- Input Handling ---
@@ -1187,8 +1254,10 @@ def keyboard_up(key, x, y):
 
 def special_keys_down(key, x, y):
     """Handles special key presses (like arrows)."""
-    global special_keys_pressed
+    global special_keys_pressed, show_render_stats
     special_keys_pressed.add(key)
+    if key == GLUT_KEY_F3:
+        show_render_stats = not show_render_stats
 
 
 def special_keys_up(key, x, y):
@@ -1231,20 +1300,16 @@ def mouse_click(button, state, x, y):
     """Handles mouse button clicks."""
     global player, bullets, camera_mode, show_muzzle_flash_until
 
-    current_time = time.time()
+    current_time = sim_time
 
     if button == GLUT_LEFT_BUTTON and state == GLUT_DOWN:
       if upgrading or game_over or level_complete or repairing:
         return
       if player["ammo"] > 0 and current_time - player["last_shot_time"] >= player["fire_rate"]:
-        yaw_rad = math.radians(player["angle"])
-        pitch_rad = math.radians(player["pitch"])
-        dir_x = math.cos(yaw_rad) * math.cos(pitch_rad)
-        dir_y = math.sin(yaw_rad) * math.cos(pitch_rad)
-        dir_z = math.sin(pitch_rad)
+        dir_x, dir_y, dir_z = get_direction_vectors(player)[2]
         spawn_x = player["x"]
         spawn_y = player["y"]
-        spawn_z = player["z"] + 60 * 0.55
+        spawn_z = player["z"] + PLAYER_GUN_UP
         vel_dx = dir_x * BULLET_SPEED
         vel_dy = dir_y * BULLET_SPEED
         vel_dz = dir_z * BULLET_SPEED
@@ -1262,23 +1327,12 @@ def mouse_click(button, state, x, y):
         camera_mode = "first" if camera_mode == "third" else "third"
 
 
-def mouse_passive_motion(x, y):
-    if upgrading or game_over or level_complete:
-        glutSetCursor(GLUT_CURSOR_INHERIT)
-        return
-    glutSetCursor(GLUT_CURSOR_NONE)
-    window_width = glutGet(GLUT_WINDOW_WIDTH)
-    window_height = glutGet(GLUT_WINDOW_HEIGHT)
-    center_x = window_width / 2
-    center_y = window_height / 2
-    delta_x = x - center_x
-    delta_y = y - center_y
-    if abs(delta_x) > 1 or abs(delta_y) > 1:
-        player["angle"] -= delta_x * MOUSE_SENSITIVITY
-        player["angle"] %= 360
-        player["pitch"] -= delta_y * MOUSE_SENSITIVITY
-        player["pitch"] = max(PITCH_MIN, min(PITCH_MAX, player["pitch"]))
-        glutWarpPointer(int(center_x), int(center_y))
+def apply_mouse_look(delta_x, delta_y):
+    """Turns and pitches the player by a mouse movement in pixels."""
+    player["angle"] -= delta_x * MOUSE_SENSITIVITY
+    player["angle"] %= 360
+    player["pitch"] -= delta_y * MOUSE_SENSITIVITY
+    player["pitch"] = max(PITCH_MIN, min(PITCH_MAX, player["pitch"]))
 
 
 # --- Upgrade Logic ---
@@ -1333,150 +1387,134 @@ def handle_upgrade_selection(choice):
         else:
             reset_level()
     else:
-        print(f"Not enough points! Need {cost}, have {points_available}.")
-
-
-
-# --- Main Display and Idle Functions ---
-def display():
-    """The main GLUT display function."""
-    win_w = glutGet(GLUT_WINDOW_WIDTH)
-    win_h = glutGet(GLUT_WINDOW_HEIGHT)
-    glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
-
-    if game_over or level_complete or upgrading:
-        glMatrixMode(GL_PROJECTION)
-        glLoadIdentity()
-        gluOrtho2D(0, win_w, 0, win_h)
-        glMatrixMode(GL_MODELVIEW)
-        glLoadIdentity()
-        glDisable(GL_DEPTH_TEST)
-        if game_over:
-            draw_game_over_screen()
-        elif level_complete:
-            draw_level_complete_screen()
-        elif upgrading:
-            draw_upgrade_menu()
-        glEnable(GL_DEPTH_TEST)
+        log_event(
+            "info",
+            "upgrade_unaffordable",
+            "Not enough points! Need {cost}, have {available}.",
+            cost=cost,
+            available=points_available,
+        )
+
+
+# --- Threaded Simulation ---
+def capture_state(copy_entities=False):
+    """Gathers everything display() reads into one dict.
+
+    With copy_entities, the player and entity dicts are copied so the result
+    is a snapshot the simulation can keep mutating the live state under.
+    """
+    if copy_entities:
+        copy_list = lambda items: [dict(item) for item in items]
+        state_player = dict(player)
     else:
-        # 3D Projection
-        glMatrixMode(GL_PROJECTION)
-        glLoadIdentity()
-        aspect_ratio = win_w / win_h if win_h > 0 else 1
-        fov = 60 if camera_mode == "first" else 45
-        near_clip = 0.5 if camera_mode == "first" else 1.0
-        far_clip = 3500.0  # Increased far clip for larger levels
-        gluPerspective(fov, aspect_ratio, near_clip, far_clip)
-
-        # Camera View
-        glMatrixMode(GL_MODELVIEW)
-        glLoadIdentity()
-        player_center_z = player["z"] + 30
-
-        if camera_mode == "third":
-            # Calculate the base camera angle (player's facing angle) + orbit offset
-            total_orbit_angle = player["angle"] + camera_orbit_angle_offset
-            cam_angle_rad = math.radians(total_orbit_angle)
-            # Calculate camera position based on player pos, angle, distance, height
-            cam_x = player["x"] - camera_current_distance * math.cos(cam_angle_rad)
-            cam_y = player["y"] - camera_current_distance * math.sin(cam_angle_rad)
-            cam_z = player_center_z + camera_current_height
-            target_x = player["x"]
-            target_y = player["y"]
-            target_z = player_center_z
-            gluLookAt(cam_x, cam_y, cam_z, target_x, target_y, target_z, 0, 0, 1)
-        elif camera_mode == "first":
-          eye_x = player["x"]
-          eye_y = player["y"]
-          eye_z = player["z"] + CAMERA_HEIGHT_FIRST
-          yaw_rad = math.radians(player["angle"])
-          pitch_rad = math.radians(player["pitch"])
-          dir_x = math.cos(yaw_rad) * math.cos(pitch_rad)
-          dir_y = math.sin(yaw_rad) * math.cos(pitch_rad)
-          dir_z = math.sin(pitch_rad)
-          look_dist = 100
-          center_x = eye_x + look_dist * dir_x
-          center_y = eye_y + look_dist * dir_y
-          center_z = eye_z + look_dist * dir_z
-          gluLookAt(eye_x, eye_y, eye_z, center_x, center_y, center_z, 0, 0, 1)
-
-        # Draw Scene
-        glEnable(GL_DEPTH_TEST)
-        draw_level()
-        draw_player()
-        for enemy in enemies:
-            draw_enemy(enemy)
-        for bullet in bullets:
-            draw_bullet(bullet, is_enemy=False)
-        for bullet in enemy_bullets:
-            draw_bullet(bullet, is_enemy=True)
-        for system in systems:
-            draw_system(system)
-        for powerup in powerups:
-            draw_powerup(powerup)
-        draw_ui()  # Draw UI overlay
-
-    glutSwapBuffers()
-
-
-def idle():
-    """The GLUT idle function, called when no events are pending."""
-    global last_frame_time
-    current_time = time.time()
-    dt = current_time - last_frame_time
-    dt = min(dt, 0.05)  # Clamp dt
-    last_frame_time = current_time
-
-    if not game_over and not level_complete and not upgrading:
-        update_camera_controls(dt)  # Update camera based on arrow keys
-        update_player(dt)
-        update_enemies(dt)
-        update_bullets(dt)
-        update_powerups(dt)
-
-    glutPostRedisplay()
+        copy_list = lambda items: items
+        state_player = player
+    return {
+        "player": state_player,
+        "remote_players": [],  # Other players in a networked session (see client.py)
+        "enemies": copy_list(enemies),
+        "bullets": copy_list(bullets),
+        "enemy_bullets": copy_list(enemy_bullets),
+        "systems": copy_list(systems),
+        "powerups": copy_list(powerups),
+        "level": level,
+        "score": score,
+        "points_available": points_available,
+        "systems_remaining": systems_remaining,
+        "repairing": repairing,
+        "repair_timer": repair_timer,
+        "game_over": game_over,
+        "level_complete": level_complete,
+        "upgrading": upgrading,
+        "camera_mode": camera_mode,
+        "camera_orbit_angle_offset": camera_orbit_angle_offset,
+        "camera_current_distance": camera_current_distance,
+        "camera_current_height": camera_current_height,
+        "show_muzzle_flash_until": show_muzzle_flash_until,
+        "ai_stats": dict(ai_stats),
+        "sim_time": sim_time,
+        "alpha": min(1.0, sim_accumulator * SIM_TICK_RATE),
+        "tick_time": time.perf_counter(),
+        "snapshot_rate": SIM_TICK_RATE,  # Snapshots per second, for interpolation
+    }
+
+
+def publish_snapshot(state=None):
+    """Writes a snapshot into the back buffer, then flips it to the front.
+
+    state defaults to a copy of the live game; client.py passes states
+    decoded from the server instead.
+    """
+    if state is None:
+        state = capture_state(copy_entities=True)
+    back = 1 - sim_thread["front"]
+    sim_thread["buffers"][back] = state
+    sim_thread["front"] = back
+    sim_thread["sequence"] += 1
+
+
+def queue_input(handler):
+    """Wraps a GLUT input callback so the simulation thread runs it instead."""
+    def enqueue(*args):
+        input_queue.append((handler, args))
+
+    return enqueue
+
+
+def drain_input_queue():
+    """Runs queued input handlers; returns True if there were any."""
+    handled = False
+    while input_queue:
+        handler, args = input_queue.popleft()
+        handler(*args)
+        handled = True
+    return handled
+
+
+def simulation_worker():
+    """Simulation thread body: fixed ticks, input, then a published snapshot."""
+    tick = 1.0 / SIM_TICK_RATE
+    next_tick_time = time.perf_counter()
+    while sim_thread["running"]:
+        had_input = drain_input_queue()
+        if not (game_over or level_complete or upgrading):
+            step_simulation(tick)
+            publish_snapshot()
+        elif had_input:
+            publish_snapshot()  # Menu screens only change on input
+
+        next_tick_time += tick
+        current_time = time.perf_counter()
+        if next_tick_time < current_time - MAX_FRAME_DT:
+            next_tick_time = current_time  # Fell far behind; don't try to catch up
+        time.sleep(max(0.0, next_tick_time - current_time))
+
+
+def start_simulation_thread():
+    """Starts running the update pipeline on a dedicated thread."""
+    publish_snapshot()
+    sim_thread["running"] = True
+    sim_thread["thread"] = threading.Thread(
+        target=simulation_worker, name="simulation", daemon=True
+    )
+    sim_thread["thread"].start()
+
+
+def stop_simulation_thread():
+    """Stops the simulation thread and waits for it to exit."""
+    sim_thread["running"] = False
+    if sim_thread["thread"] is not None:
+        sim_thread["thread"].join()
+        sim_thread["thread"] = None
 
 
 # --- Main Function ---
 def main():
-    glutInit()
-    glutInitDisplayMode(GLUT_DOUBLE | GLUT_RGB | GLUT_DEPTH)
-    glutInitWindowSize(1024, 768)
-    glutInitWindowPosition(100, 100)
-    glutCreateWindow(b"Space Station Siege v3")  # Updated title
-
-    glEnable(GL_DEPTH_TEST)
-    glClearColor(0.1, 0.1, 0.2, 1.0)
-    glEnable(GL_CULL_FACE)
-    glCullFace(GL_BACK)
-    glShadeModel(GL_SMOOTH)
-
-    # Register GLUT callbacks
-    glutDisplayFunc(display)
-    glutKeyboardFunc(keyboard_down)
-    glutKeyboardUpFunc(keyboard_up)
-    glutSpecialFunc(special_keys_down)  # Register special key down handler
-    glutSpecialUpFunc(special_keys_up)  # Register special key up handler
-    glutMouseFunc(mouse_click)
-    glutPassiveMotionFunc(mouse_passive_motion)
-    glutIdleFunc(idle)
-
-    glutSetCursor(GLUT_CURSOR_NONE)
-    reset_game()
-
-    print("--- Space Station Siege v3 ---")
-    print("Controls:")
-    print(" W/S: Move Forward/Backward | A/D: Strafe Left/Right")
-    print(" Mouse: Aim | Left Click: Shoot | Right Click: Toggle Camera")
-    print(" R (Hold): Repair System | Space: Continue/Skip Upgrade")
-    print(
-        " Arrow Keys (Third Person): Orbit (Left/Right), Zoom (Up/Down)"
-    )  # Updated controls
-    print(" 1/2/3/4: Select Upgrade")
-    print("----------------------------")
-
-    glutMainLoop()
+    """Opens the game window. Rendering, and with it PyOpenGL, is only loaded here."""
+    import render
+
+    render.main()
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
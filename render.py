@@ -0,0 +1,1411 @@
+"""Rendering and the GLUT window for Space Station Siege.
+
+Everything that needs PyOpenGL lives here. project.main() imports this
+module only when a window is opened, so tools that only simulate never load
+it. Game state is read from the project module as game.<name>.
+"""
+
+import math
+import time
+from collections import OrderedDict
+
+import numpy as np
+import OpenGL
+
+from game_data import GL_DEBUG
+
+# PyOpenGL reads these when it builds its function wrappers, so they must be
+# set before OpenGL.GL is first imported
+OpenGL.ERROR_CHECKING = GL_DEBUG
+OpenGL.ERROR_LOGGING = GL_DEBUG
+OpenGL.ERROR_ON_COPY = GL_DEBUG  # Raise instead of silently copying arrays
+
+from OpenGL.GL import *
+from OpenGL.GLU import *
+from OpenGL.GLUT import *
+
+import project as game
+from game_data import *
+
+# --- Render State ---
+# Window size, kept up to date by the reshape callback
+viewport = {"width": WINDOW_WIDTH, "height": WINDOW_HEIGHT}
+
+# Level chunk meshes: (level_index, chunk_x, chunk_y) -> display list id, oldest first
+level_chunk_cache = OrderedDict()
+# Pre-tessellated unit meshes: (shape, slices) -> display list id
+lod_mesh_cache = {}
+# Baked rigid models: (name, slices) -> tuple of (colour, display list id)
+model_cache = {}
+# Rendered strings: (font id, text) -> display list id, oldest first
+text_list_cache = OrderedDict()
+# Retained 2D layers: name -> {"texture", "fbo", "width", "height", "key"}
+hud_layers = {}
+
+# Entity draws collected during a frame: (pass, colour, mesh, transform),
+# sorted and submitted by flush_render_queue
+PASS_OPAQUE = 0
+PASS_BLENDED = 1  # Drawn after every opaque item
+render_queue = []
+
+# Per-frame render counters (reset at the start of every 3D frame)
+render_stats = {
+    "entities_drawn": 0,
+    "entities_culled": 0,
+    "chunks_drawn": 0,
+    "chunks_culled": 0,
+    "hud_redraws": 0,
+    "draw_calls": 0,
+    "color_changes": 0,
+    "mesh_changes": 0,
+    "pass_changes": 0,
+}
+
+# Window loop pacing
+frame_pacing = {
+    "next_render_time": 0.0,
+    "swap_time": 0.0,  # Smoothed time spent in glutSwapBuffers
+    "vsync": False,  # Swaps block, so the driver is already pacing frames
+    "menu_idle": False,  # Idle callback removed; only input triggers redraws
+    "drawn_sequence": -1,  # Last simulation snapshot drawn (threaded mode)
+}
+
+
+# --- View Culling ---
+def normalize_3d(x, y, z):
+    """Returns the unit vector of (x, y, z), or the zero vector."""
+    length = math.sqrt(x * x + y * y + z * z)
+    if length == 0:
+        return 0.0, 0.0, 0.0
+    return x / length, y / length, z / length
+
+
+def cross_3d(ax, ay, az, bx, by, bz):
+    """Returns the cross product of two 3D vectors."""
+    return ay * bz - az * by, az * bx - ax * bz, ax * by - ay * bx
+
+
+def build_view_frustum(eye, center, up, fov, aspect, near_clip, far_clip):
+    """Builds the six frustum planes matching gluPerspective + gluLookAt.
+
+    Each plane is (nx, ny, nz, d) with the normal pointing into the frustum,
+    so a point p is inside when nx*px + ny*py + nz*pz + d >= 0.
+    """
+    fx, fy, fz = normalize_3d(
+        center[0] - eye[0], center[1] - eye[1], center[2] - eye[2]
+    )
+    sx, sy, sz = normalize_3d(*cross_3d(fx, fy, fz, *up))
+    ux, uy, uz = cross_3d(sx, sy, sz, fx, fy, fz)
+    tan_v = math.tan(math.radians(fov) / 2)
+    tan_h = tan_v * aspect
+
+    normals = [
+        (sx + fx * tan_h, sy + fy * tan_h, sz + fz * tan_h),  # Left
+        (-sx + fx * tan_h, -sy + fy * tan_h, -sz + fz * tan_h),  # Right
+        (ux + fx * tan_v, uy + fy * tan_v, uz + fz * tan_v),  # Bottom
+        (-ux + fx * tan_v, -uy + fy * tan_v, -uz + fz * tan_v),  # Top
+    ]
+    planes = []
+    for normal in normals:
+        nx, ny, nz = normalize_3d(*normal)
+        planes.append((nx, ny, nz, -(nx * eye[0] + ny * eye[1] + nz * eye[2])))
+
+    # Near and far planes face along and against the view direction
+    eye_dot_f = fx * eye[0] + fy * eye[1] + fz * eye[2]
+    planes.append((fx, fy, fz, -(eye_dot_f + near_clip)))
+    planes.append((-fx, -fy, -fz, eye_dot_f + far_clip))
+    return planes
+
+
+def sphere_in_frustum(frustum, x, y, z, radius):
+    """Returns True if a bounding sphere is at least partly inside the frustum."""
+    for nx, ny, nz, d in frustum:
+        if nx * x + ny * y + nz * z + d < -radius:
+            return False
+    return True
+
+
+def box_in_frustum(frustum, min_x, min_y, min_z, max_x, max_y, max_z):
+    """Returns True if an axis-aligned box is at least partly inside the frustum."""
+    for nx, ny, nz, d in frustum:
+        # Test the box corner furthest along the plane normal
+        px = max_x if nx >= 0 else min_x
+        py = max_y if ny >= 0 else min_y
+        pz = max_z if nz >= 0 else min_z
+        if nx * px + ny * py + nz * pz + d < 0:
+            return False
+    return True
+
+
+# --- Meshes ---
+def get_lod_tier(dist, lod_distances):
+    """Returns the detail tier (0 = finest) for an object at the given distance."""
+    tier = 0
+    for threshold in lod_distances:
+        if dist > threshold:
+            tier += 1
+    return tier
+
+
+def get_lod_mesh(shape, slices):
+    """Returns a unit sized "sphere", "cylinder", "disk" or "cube" mesh with the given slices.
+
+    Meshes are tessellated once into display lists and scaled into place with
+    glScalef when drawn. Without lighting, stacks add no visible detail, so
+    cylinders and disks use a single stack. Cubes ignore slices.
+    """
+    key = (shape, slices)
+    mesh = lod_mesh_cache.get(key)
+    if mesh is None:
+        mesh = glGenLists(1)
+        quadric = gluNewQuadric()
+        glNewList(mesh, GL_COMPILE)
+        if shape == "sphere":
+            glutSolidSphere(1, slices, slices)
+        elif shape == "cylinder":
+            gluCylinder(quadric, 1, 1, 1, slices, 1)
+        elif shape == "disk":
+            gluDisk(quadric, 0, 1, slices, 1)
+        elif shape == "cube":
+            glutSolidCube(1)
+        glEndList()
+        gluDeleteQuadric(quadric)
+        lod_mesh_cache[key] = mesh
+    return mesh
+
+
+# --- Render Queue ---
+def queue_draw(mesh, color, transform, draw_pass=PASS_OPAQUE):
+    """Queues one draw of a mesh display list.
+
+    transform is a tuple of (gl function, *args) matrix operations applied in
+    order, e.g. ((glTranslatef, x, y, z), (glScalef, s, s, s)).
+    """
+    render_queue.append((draw_pass, color, mesh, transform))
+
+
+def queue_mesh(base, shape, slices, color, scale, local=(), draw_pass=PASS_OPAQUE):
+    """Queues a unit mesh placed by base, then local, then scaled to size."""
+    queue_draw(
+        get_lod_mesh(shape, slices),
+        color,
+        base + local + ((glScalef,) + scale,),
+        draw_pass,
+    )
+
+
+def flush_render_queue():
+    """Draws every queued item, sorted to minimise state changes, and empties the queue.
+
+    Items are ordered by pass (opaque before blended), then colour, then mesh,
+    so each colour and blend state is set once per run of items sharing it.
+    The number of changes is recorded in render_stats.
+    """
+    render_queue.sort(key=lambda item: item[:3])
+    current_pass = current_color = current_mesh = None
+    for draw_pass, color, mesh, transform in render_queue:
+        if draw_pass != current_pass:
+            if draw_pass == PASS_BLENDED:
+                glEnable(GL_BLEND)
+                glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+            else:
+                glDisable(GL_BLEND)
+            current_pass = draw_pass
+            render_stats["pass_changes"] += 1
+        if color != current_color:
+            if len(color) == 4:
+                glColor4f(*color)
+            else:
+                glColor3f(*color)
+            current_color = color
+            render_stats["color_changes"] += 1
+        if mesh != current_mesh:
+            current_mesh = mesh
+            render_stats["mesh_changes"] += 1
+        glPushMatrix()
+        for operation in transform:
+            operation[0](*operation[1:])
+        glCallList(mesh)
+        glPopMatrix()
+        render_stats["draw_calls"] += 1
+
+    if current_pass == PASS_BLENDED:
+        glDisable(GL_BLEND)
+    glColor4f(1.0, 1.0, 1.0, 1.0)
+    render_queue.clear()
+
+
+# --- Models ---
+def get_model_parts(name, slices):
+    """Returns the rigid parts of a model as (colour, shape, slices, local transform).
+
+    Local transforms place a unit mesh relative to the model origin and end
+    with its scale. Animated pieces (muzzle flash, shield, drone hover) are
+    not parts; the draw functions add them each frame.
+    """
+    if name == "player":
+        gun = (
+            (glTranslatef, PLAYER_GUN_FORWARD, PLAYER_GUN_RIGHT, PLAYER_GUN_UP),
+            (glRotatef, 90, 0, 1, 0),
+        )
+        return [
+            # Body
+            (COLORS["player_body"], "cube", 1, (
+                (glTranslatef, 0, 0, PLAYER_BODY_HEIGHT / 2),
+                (glScalef, 30, 30, PLAYER_BODY_HEIGHT),
+            )),
+            # Head
+            (COLORS["player_head"], "sphere", 20, (
+                (glTranslatef, 0, 0, PLAYER_BODY_HEIGHT + PLAYER_HEAD_RADIUS * 0.8),
+                (glScalef,) + (PLAYER_HEAD_RADIUS,) * 3,
+            )),
+            # Gun, pointing along local X
+            (COLORS["gun"], "cylinder", 10, gun + (
+                (glScalef, PLAYER_GUN_RADIUS, PLAYER_GUN_RADIUS, PLAYER_GUN_LENGTH),
+            )),
+            # Gun tip cube
+            (COLORS["gun"], "cube", 1, gun + (
+                (glTranslatef, 0, 0, PLAYER_GUN_LENGTH),
+                (glScalef,) + (PLAYER_GUN_RADIUS * 1.5,) * 3,
+            )),
+        ]
+    if name in game.enemy_type_ids:
+        return get_enemy_model_parts(game.enemy_archetypes[game.enemy_type_ids[name]], slices)
+    if name in ("system", "system_repaired"):
+        return [(COLORS[name], "cube", 1, (
+            (glTranslatef, 0, 0, SYSTEM_SIZE / 2), (glScalef,) + (SYSTEM_SIZE,) * 3,
+        ))]
+    if name == "health":
+        return [(COLORS["health_pack"], "cube", 1, ((glScalef, 20, 20, 20),))]
+    if name == "ammo":
+        return [(COLORS["ammo_pack"], "sphere", 10, ((glScalef, 12, 12, 12),))]
+    raise ValueError(f"unknown model {name!r}")
+
+
+def get_enemy_model_parts(archetype, slices):
+    """Returns the parts of an enemy archetype's model, sized and coloured from its data."""
+    model = archetype["model"]
+    size = archetype["size"]
+    color = archetype["color"]
+    if model == "scout":
+        return [(color, "sphere", slices, (
+            (glTranslatef, 0, 0, size * 0.7), (glScalef, size, size, size),
+        ))]
+    if model == "tank":
+        return [(color, "cube", 1, (
+            (glTranslatef, 0, 0, size / 2), (glScalef, size, size, size),
+        ))]
+    if model == "drone":
+        arm_color = tuple(channel * 0.7 for channel in color)
+        # Central body (cylinder)
+        parts = [(color, "cylinder", slices, (
+            (glRotatef, 90, 1, 0, 0), (glScalef, size * 0.4, size * 0.4, size * 0.3),
+        ))]
+        for angle in [0, 90, 180, 270]:
+            # Rotor arm (4 arms at 90-degree intervals)
+            parts.append((arm_color, "cube", 1, (
+                (glRotatef, angle, 0, 0, 1),
+                (glTranslatef, size * 0.6, 0, size * 0.15),
+                (glScalef, size * 0.4, size * 0.1, size * 0.1),
+            )))
+            # Rotor (disc at the end of the arm)
+            parts.append(((0.5, 0.5, 0.5), "disk", slices, (
+                (glRotatef, angle, 0, 0, 1),
+                (glTranslatef, size * 0.6, 0, size * 0.25),
+                (glScalef, size * 0.3, size * 0.3, 1),
+            )))
+        return parts
+    if model == "sniper":
+        cylinder_height = size * 1.8
+        cylinder_radius = size * 0.5
+        eye_radius = size * 0.4
+        return [
+            (color, "cylinder", slices, (
+                (glRotatef, -90, 1, 0, 0),
+                (glScalef, cylinder_radius, cylinder_radius, cylinder_height),
+            )),
+            (color, "sphere", slices, (
+                (glTranslatef, 0, 0, cylinder_height + eye_radius * 0.5),
+                (glScalef,) + (eye_radius,) * 3,
+            )),
+        ]
+    raise ValueError(f"unknown enemy model {model!r}")
+
+
+def get_model(name, slices=1):
+    """Returns a model baked into display lists as a tuple of (colour, list id).
+
+    All parts sharing a colour are compiled into one list, with their local
+    transforms baked in, so a model costs one queued draw per colour instead
+    of one per part. Lists are built on first use for each detail level.
+    """
+    key = (name, slices)
+    model = model_cache.get(key)
+    if model is None:
+        by_color = OrderedDict()
+        for color, shape, part_slices, local in get_model_parts(name, slices):
+            by_color.setdefault(color, []).append((get_lod_mesh(shape, part_slices), local))
+        model = []
+        for color, parts in by_color.items():
+            display_list = glGenLists(1)
+            glNewList(display_list, GL_COMPILE)
+            for mesh, local in parts:
+                glPushMatrix()
+                for operation in local:
+                    operation[0](*operation[1:])
+                glCallList(mesh)
+                glPopMatrix()
+            glEndList()
+            model.append((color, display_list))
+        model = tuple(model)
+        model_cache[key] = model
+    return model
+
+
+def queue_model(name, slices, transform, draw_pass=PASS_OPAQUE):
+    """Queues every colour group of a baked model under one root transform."""
+    for color, display_list in get_model(name, slices):
+        queue_draw(display_list, color, transform, draw_pass)
+
+
+# --- Drawing Functions ---
+def draw_player(render_player=None, flash_until=None, current_time=None):
+    """Queues the player model, muzzle flash and shield.
+
+    render_player, flash_until and current_time optionally override the live
+    player, muzzle flash timer and game clock (e.g. with a snapshot).
+    """
+    if current_time is None:
+        current_time = game.sim_time
+    if render_player is None:
+        render_player = game.player
+    if flash_until is None:
+        flash_until = game.show_muzzle_flash_until
+
+    base = (
+        (glTranslatef, render_player["x"], render_player["y"], render_player["z"]),
+        (glRotatef, render_player["angle"], 0, 0, 1),
+    )
+    queue_model("player", 1, base)
+
+    # Muzzle Flash (if active), at the gun tip
+    if current_time < flash_until:
+        queue_mesh(
+            base, "sphere", 8, COLORS["muzzle_flash"], (PLAYER_GUN_RADIUS * 1.8,) * 3,
+            ((glTranslatef, PLAYER_GUN_FORWARD + PLAYER_GUN_LENGTH, PLAYER_GUN_RIGHT, PLAYER_GUN_UP),),
+        )
+
+    # Shield
+    if render_player.get("shield", 0) > 0:
+        alpha = 0.2 + 0.3 * (
+            render_player["shield"] / render_player.get("max_shield", 1)
+        )
+        queue_mesh(
+            base, "sphere", 20, (0.3, 0.6, 1.0, alpha), (PLAYER_RADIUS + 15,) * 3,
+            ((glTranslatef, 0, 0, PLAYER_BODY_HEIGHT / 2 + 5),), PASS_BLENDED,
+        )
+
+
+def draw_standing_enemy(enemy, archetype, slices):
+    """Queues an enemy model resting at the enemy's position."""
+    queue_model(
+        archetype["name"], slices,
+        (
+            (glTranslatef, enemy["x"], enemy["y"], enemy["z"]),
+            (glRotatef, enemy["angle"], 0, 0, 1),
+        ),
+    )
+
+
+def draw_hovering_enemy(enemy, archetype, slices):
+    """Queues an enemy model bobbing up and down around the enemy's position."""
+    hover_offset = math.sin(time.time() * 4) * 2  # Small up-down motion
+    queue_model(
+        archetype["name"], slices,
+        (
+            (glTranslatef, enemy["x"], enemy["y"], enemy["z"]),
+            (glRotatef, enemy["angle"], 0, 0, 1),
+            (glTranslatef, 0, 0, hover_offset),
+        ),
+    )
+
+
+# Per-frame draw function for each of ENEMY_MODELS
+ENEMY_DRAW_FUNCTIONS = {
+    "scout": draw_standing_enemy,
+    "tank": draw_standing_enemy,
+    "sniper": draw_standing_enemy,
+    "drone": draw_hovering_enemy,
+}
+
+
+def draw_enemy(enemy, lod=0):
+    """Queues a single enemy's model at detail tier lod."""
+    archetype = game.enemy_archetypes[enemy["type_id"]]
+    ENEMY_DRAW_FUNCTIONS[archetype["model"]](
+        enemy, archetype, ENEMY_LOD_SLICES[min(lod, len(ENEMY_LOD_SLICES) - 1)]
+    )
+
+
+def draw_bullet(bullet, is_enemy=False, lod=0):
+    """Queues a bullet."""
+    slices = BULLET_LOD_SLICES[min(lod, len(BULLET_LOD_SLICES) - 1)]
+    if is_enemy:
+        color = COLORS["enemy_bullet"]
+        radius = BULLET_SIZE * 0.8  # Enemy bullets slightly smaller
+    else:
+        color = COLORS["bullet"]
+        radius = BULLET_SIZE  # Use constant size
+    queue_mesh(
+        ((glTranslatef, bullet["x"], bullet["y"], bullet["z"]),),
+        "sphere", slices, color, (radius, radius, radius),
+    )
+
+
+def draw_system(system):
+    """Queues a repairable system."""
+    queue_model(
+        "system_repaired" if system["repaired"] else "system", 1,
+        ((glTranslatef, system["x"], system["y"], system["z"]),),
+    )
+
+
+def draw_powerup(powerup):
+    """Queues a powerup."""
+    queue_model(
+        powerup["type"], 1,
+        (
+            (glTranslatef, powerup["x"], powerup["y"], powerup["z"]),
+            (glRotatef, powerup["rotation"], 0, 0, 1),
+        ),
+    )
+
+
+def get_chunk_bounds(layout, chunk_x, chunk_y):
+    """Returns the cell ranges (x0, x1, y0, y1) covered by a level chunk."""
+    x0 = chunk_x * LEVEL_CHUNK_SIZE
+    y0 = chunk_y * LEVEL_CHUNK_SIZE
+    x1 = min(x0 + LEVEL_CHUNK_SIZE, len(layout[0]))
+    y1 = min(y0 + LEVEL_CHUNK_SIZE, len(layout))
+    return x0, x1, y0, y1
+
+
+def draw_level_cells(layout, x0, x1, y0, y1):
+    """Issues the wall and floor geometry for a rectangle of cells.
+
+    Cells are grouped by colour so each floor shade is one GL_QUADS batch
+    and the walls share a single colour change.
+    """
+    wall_height = WALL_HEIGHT
+    walls = []
+    floors = ([], [])  # Checkerboard: floor1 cells, floor2 cells
+    for y in range(y0, y1):
+        for x in range(x0, x1):
+            if layout[y][x] == 1:
+                walls.append((x * CELL_SIZE, y * CELL_SIZE))
+            else:
+                floors[(x + y) % 2].append((x * CELL_SIZE, y * CELL_SIZE))
+
+    for color, cells in ((COLORS["floor1"], floors[0]), (COLORS["floor2"], floors[1])):
+        if not cells:
+            continue
+        glColor3f(*color)
+        glBegin(GL_QUADS)
+        for x_pos, y_pos in cells:
+            glVertex3f(x_pos, y_pos, 0)
+            glVertex3f(x_pos + CELL_SIZE, y_pos, 0)
+            glVertex3f(x_pos + CELL_SIZE, y_pos + CELL_SIZE, 0)
+            glVertex3f(x_pos, y_pos + CELL_SIZE, 0)
+        glEnd()
+
+    glColor3f(*COLORS["wall"])
+    for x_pos, y_pos in walls:
+        glPushMatrix()
+        glTranslatef(x_pos + CELL_SIZE / 2, y_pos + CELL_SIZE / 2, wall_height / 2)
+        glScalef(CELL_SIZE, CELL_SIZE, wall_height)
+        glutSolidCube(1)
+        glPopMatrix()
+
+
+def get_level_chunk(layout_index, chunk_x, chunk_y):
+    """Returns the baked display list for a chunk, building it on first use."""
+    key = (layout_index, chunk_x, chunk_y)
+    chunk_list = level_chunk_cache.get(key)
+    if chunk_list is not None:
+        level_chunk_cache.move_to_end(key)  # Mark as most recently used
+        return chunk_list
+
+    layout = LEVEL_LAYOUTS[layout_index]
+    chunk_list = glGenLists(1)
+    glNewList(chunk_list, GL_COMPILE)
+    draw_level_cells(layout, *get_chunk_bounds(layout, chunk_x, chunk_y))
+    glEndList()
+    level_chunk_cache[key] = chunk_list
+
+    # Evict the least recently drawn chunks once over budget
+    while len(level_chunk_cache) > LEVEL_CHUNK_CACHE_SIZE:
+        _, old_list = level_chunk_cache.popitem(last=False)
+        glDeleteLists(old_list, 1)
+    return chunk_list
+
+
+def clear_level_chunks():
+    """Frees every baked chunk mesh (e.g. when the GL context goes away)."""
+    for chunk_list in level_chunk_cache.values():
+        glDeleteLists(chunk_list, 1)
+    level_chunk_cache.clear()
+
+
+def draw_level(
+    view_x=None,
+    view_y=None,
+    view_radius=FAR_CLIP,
+    frustum=None,
+    visible_chunks=None,
+    level_number=None,
+):
+    """Draws the walls and floor of the current level.
+
+    The level is split into LEVEL_CHUNK_SIZE x LEVEL_CHUNK_SIZE chunks, each
+    baked into its own display list. Only chunks whose footprint lies within
+    view_radius of (view_x, view_y) are drawn, so the cost follows the view
+    distance rather than the map size. If a frustum is given, chunks whose
+    bounding box falls outside it are skipped as well, and if visible_chunks
+    is given, chunks missing from that occlusion set are skipped too.
+    """
+    if level_number is None:
+        level_number = game.level
+    if level_number > len(LEVEL_LAYOUTS):
+        return
+
+    layout_index = level_number - 1
+    layout = LEVEL_LAYOUTS[layout_index]
+    rows = len(layout)
+    cols = len(layout[0])
+    chunk_world_size = LEVEL_CHUNK_SIZE * CELL_SIZE
+    if view_x is None or view_y is None:
+        view_x = game.player["x"]
+        view_y = game.player["y"]
+
+    # Only visit chunks overlapping the square around the view radius
+    min_cx = max(0, int((view_x - view_radius) // chunk_world_size))
+    max_cx = min((cols - 1) // LEVEL_CHUNK_SIZE, int((view_x + view_radius) // chunk_world_size))
+    min_cy = max(0, int((view_y - view_radius) // chunk_world_size))
+    max_cy = min((rows - 1) // LEVEL_CHUNK_SIZE, int((view_y + view_radius) // chunk_world_size))
+    view_radius_sq = view_radius * view_radius
+
+    for chunk_y in range(min_cy, max_cy + 1):
+        for chunk_x in range(min_cx, max_cx + 1):
+            # Distance from the view point to the closest point of the chunk
+            x0, x1, y0, y1 = get_chunk_bounds(layout, chunk_x, chunk_y)
+            nearest_x = max(x0 * CELL_SIZE, min(view_x, x1 * CELL_SIZE))
+            nearest_y = max(y0 * CELL_SIZE, min(view_y, y1 * CELL_SIZE))
+            if (nearest_x - view_x) ** 2 + (nearest_y - view_y) ** 2 > view_radius_sq:
+                render_stats["chunks_culled"] += 1
+                continue
+            if visible_chunks is not None and (chunk_x, chunk_y) not in visible_chunks:
+                render_stats["chunks_culled"] += 1
+                continue
+            if frustum is not None and not box_in_frustum(
+                frustum,
+                x0 * CELL_SIZE, y0 * CELL_SIZE, 0,
+                x1 * CELL_SIZE, y1 * CELL_SIZE, WALL_HEIGHT,
+            ):
+                render_stats["chunks_culled"] += 1
+                continue
+            render_stats["chunks_drawn"] += 1
+            glCallList(get_level_chunk(layout_index, chunk_x, chunk_y))
+
+
+def get_text_list(text, font):
+    """Returns a display list drawing text in font, recording it on first use.
+
+    A string is only re-recorded when its content changes (a new key); stale
+    strings such as old health values age out of the LRU cache.
+    """
+    key = (id(font), text)  # GLUT font handles are unhashable singletons
+    text_list = text_list_cache.get(key)
+    if text_list is not None:
+        text_list_cache.move_to_end(key)
+        return text_list
+
+    text_list = glGenLists(1)
+    glNewList(text_list, GL_COMPILE)
+    for char in text:
+        glutBitmapCharacter(font, ord(char))
+    glEndList()
+    text_list_cache[key] = text_list
+
+    while len(text_list_cache) > TEXT_CACHE_SIZE:
+        _, old_list = text_list_cache.popitem(last=False)
+        glDeleteLists(old_list, 1)
+    return text_list
+
+
+def draw_text(x, y, text, font=GLUT_BITMAP_HELVETICA_18, color=COLORS["text"]):
+    """Draws text on the screen using cached GLUT bitmap font display lists."""
+    glColor3f(*color)
+    glRasterPos2f(x, y)
+    glCallList(get_text_list(text, font))
+
+
+def draw_crosshair():
+    """Draws a simple 2D crosshair in the center of the screen."""
+    win_w = viewport["width"]
+    win_h = viewport["height"]
+    center_x = win_w / 2
+    center_y = win_h / 2
+    size = 10  # Size of the crosshair lines
+
+    glColor4f(*COLORS["crosshair"])  # Use color with alpha
+    glLineWidth(2.0)  # Make lines thicker
+
+    glBegin(GL_LINES)
+    # Horizontal line
+    glVertex2f(center_x - size, center_y)
+    glVertex2f(center_x + size, center_y)
+    # Vertical line
+    glVertex2f(center_x, center_y - size)
+    glVertex2f(center_x, center_y + size)
+    glEnd()
+
+
+def get_hud_layer(name, win_w, win_h):
+    """Returns the offscreen layer called name, (re)allocating it at the window size."""
+    layer = hud_layers.get(name)
+    if layer is not None and (layer["width"], layer["height"]) == (win_w, win_h):
+        return layer
+    if layer is not None:
+        # Native arrays, since ERROR_ON_COPY rejects lists in debug mode
+        glDeleteFramebuffers(1, np.array([layer["fbo"]], dtype=np.uint32))
+        glDeleteTextures(np.array([layer["texture"]], dtype=np.uint32))
+
+    texture = glGenTextures(1)
+    glBindTexture(GL_TEXTURE_2D, texture)
+    glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_NEAREST)
+    glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_NEAREST)
+    glTexImage2D(
+        GL_TEXTURE_2D, 0, GL_RGBA8, win_w, win_h, 0, GL_RGBA, GL_UNSIGNED_BYTE, None
+    )
+    glBindTexture(GL_TEXTURE_2D, 0)
+
+    fbo = glGenFramebuffers(1)
+    glBindFramebuffer(GL_FRAMEBUFFER, fbo)
+    glFramebufferTexture2D(
+        GL_FRAMEBUFFER, GL_COLOR_ATTACHMENT0, GL_TEXTURE_2D, texture, 0
+    )
+    glBindFramebuffer(GL_FRAMEBUFFER, 0)
+
+    layer = {"texture": texture, "fbo": fbo, "width": win_w, "height": win_h, "key": None}
+    hud_layers[name] = layer
+    return layer
+
+
+def draw_hud_layer(name, key, draw_contents, win_w, win_h):
+    """Blits a cached 2D layer, redrawing it with draw_contents only when key changes.
+
+    Expects the caller to have set up a window sized orthographic projection.
+    """
+    layer = get_hud_layer(name, win_w, win_h)
+    if layer["key"] != key:
+        glPushAttrib(GL_COLOR_BUFFER_BIT | GL_ENABLE_BIT | GL_VIEWPORT_BIT)
+        glBindFramebuffer(GL_FRAMEBUFFER, layer["fbo"])
+        glViewport(0, 0, win_w, win_h)
+        glClearColor(0.0, 0.0, 0.0, 0.0)
+        glClear(GL_COLOR_BUFFER_BIT)
+        # Write colours and alpha straight into the layer; blending happens on blit
+        glDisable(GL_BLEND)
+        glDisable(GL_DEPTH_TEST)
+        draw_contents(win_w, win_h)
+        glBindFramebuffer(GL_FRAMEBUFFER, 0)
+        glPopAttrib()
+        layer["key"] = key
+        render_stats["hud_redraws"] += 1
+
+    glPushAttrib(GL_ENABLE_BIT | GL_COLOR_BUFFER_BIT)
+    glDisable(GL_DEPTH_TEST)
+    glEnable(GL_BLEND)
+    glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+    glEnable(GL_TEXTURE_2D)
+    glBindTexture(GL_TEXTURE_2D, layer["texture"])
+    glColor4f(1.0, 1.0, 1.0, 1.0)
+    glBegin(GL_QUADS)
+    glTexCoord2f(0, 0)
+    glVertex2f(0, 0)
+    glTexCoord2f(1, 0)
+    glVertex2f(win_w, 0)
+    glTexCoord2f(1, 1)
+    glVertex2f(win_w, win_h)
+    glTexCoord2f(0, 1)
+    glVertex2f(0, win_h)
+    glEnd()
+    glBindTexture(GL_TEXTURE_2D, 0)
+    glPopAttrib()
+
+
+def draw_hud(state, win_w, win_h):
+    """Draws the in-game HUD: stats, objectives, repair bar and crosshair."""
+    hud_player = state["player"]
+
+    # --- Draw Standard UI ---
+    draw_text(10, win_h - 30, f"Level: {state['level']}")
+    draw_text(
+        10,
+        win_h - 60,
+        f"Health: {hud_player['health']}/{hud_player.get('max_health', 100)}",
+    )
+    draw_text(
+        10, win_h - 90, f"Ammo: {hud_player['ammo']}/{hud_player.get('max_ammo', 20)}"
+    )
+    draw_text(10, win_h - 120, f"Score: {state['score']}")
+    if hud_player.get("shield", 0) > 0:
+        draw_text(
+            10,
+            win_h - 150,
+            f"Shield: {hud_player['shield']}/{hud_player.get('max_shield', 0)}",
+        )
+
+    objective_text = f"Systems Left: {state['systems_remaining']}"
+    draw_text(win_w - 160, win_h - 30, objective_text)
+
+    # --- Draw Repair Bar ---
+    if state["repairing"]:
+        bar_width = REPAIR_BAR_WIDTH
+        bar_height = 20
+        bar_x = (win_w - bar_width) / 2
+        bar_y = 50
+        progress = min(1.0, state["repair_timer"] / REPAIR_TIME)
+
+        glColor3f(*COLORS["repair_bar_bg"])
+        glBegin(GL_QUADS)
+        glVertex2f(bar_x, bar_y)
+        glVertex2f(bar_x + bar_width, bar_y)
+        glVertex2f(bar_x + bar_width, bar_y + bar_height)
+        glVertex2f(bar_x, bar_y + bar_height)
+        glEnd()
+        glColor3f(*COLORS["repair_bar_fg"])
+        glBegin(GL_QUADS)
+        glVertex2f(bar_x, bar_y)
+        glVertex2f(bar_x + bar_width * progress, bar_y)
+        glVertex2f(bar_x + bar_width * progress, bar_y + bar_height)
+        glVertex2f(bar_x, bar_y + bar_height)
+        glEnd()
+        draw_text(
+            bar_x + bar_width / 2 - 40,
+            bar_y + bar_height / 2 - 5,
+            "REPAIRING...",
+            GLUT_BITMAP_HELVETICA_12,
+        )
+
+    # --- Draw Crosshair (only in first person) ---
+    if state["camera_mode"] == "first":
+        draw_crosshair()
+
+
+def get_hud_key(state):
+    """Returns every value the HUD shows; the HUD layer is redrawn when it changes."""
+    hud_player = state["player"]
+    repair_progress = 0
+    if state["repairing"]:
+        # Quantised to whole pixels of the repair bar
+        repair_progress = int(
+            min(1.0, state["repair_timer"] / REPAIR_TIME) * REPAIR_BAR_WIDTH
+        )
+    return (
+        state["level"],
+        hud_player["health"],
+        hud_player.get("max_health", 100),
+        hud_player["ammo"],
+        hud_player.get("max_ammo", 20),
+        state["score"],
+        hud_player.get("shield", 0),
+        hud_player.get("max_shield", 0),
+        state["systems_remaining"],
+        state["repairing"],
+        repair_progress,
+        state["camera_mode"],
+    )
+
+
+def draw_ui(state):
+    """Draws the 2D UI elements."""
+    glMatrixMode(GL_PROJECTION)
+    glPushMatrix()
+    glLoadIdentity()
+    win_w = viewport["width"]
+    win_h = viewport["height"]
+    gluOrtho2D(0, win_w, 0, win_h)
+
+    glMatrixMode(GL_MODELVIEW)
+    glPushMatrix()
+    glLoadIdentity()
+
+    glDisable(GL_DEPTH_TEST)
+
+    # --- Draw Retained HUD ---
+    draw_hud_layer(
+        "hud", get_hud_key(state), lambda w, h: draw_hud(state, w, h), win_w, win_h
+    )
+
+    # --- Draw Render Stats (F3) ---
+    # Changes every frame, so drawn directly rather than through the HUD layer
+    if game.show_render_stats:
+        draw_text(
+            win_w - 260,
+            win_h - 60,
+            f"Entities: {render_stats['entities_drawn']} drawn, "
+            f"{render_stats['entities_culled']} culled",
+            GLUT_BITMAP_HELVETICA_12,
+        )
+        draw_text(
+            win_w - 260,
+            win_h - 80,
+            f"Chunks: {render_stats['chunks_drawn']} drawn, "
+            f"{render_stats['chunks_culled']} culled",
+            GLUT_BITMAP_HELVETICA_12,
+        )
+        draw_text(
+            win_w - 260,
+            win_h - 100,
+            f"HUD redraws: {render_stats['hud_redraws']}",
+            GLUT_BITMAP_HELVETICA_12,
+        )
+        draw_text(
+            win_w - 260,
+            win_h - 120,
+            f"Draws: {render_stats['draw_calls']}, state changes: "
+            f"{render_stats['color_changes']} colour, "
+            f"{render_stats['mesh_changes']} mesh, "
+            f"{render_stats['pass_changes']} pass",
+            GLUT_BITMAP_HELVETICA_12,
+        )
+        draw_text(
+            win_w - 260,
+            win_h - 140,
+            f"AI: {state['ai_stats']['decided']} decided, "
+            f"{state['ai_stats']['over_budget']} over budget, "
+            f"oldest {state['ai_stats']['max_staleness']} ticks",
+            GLUT_BITMAP_HELVETICA_12,
+        )
+
+    # --- Restore OpenGL state ---
+    glEnable(GL_DEPTH_TEST)
+    glPopMatrix()  # Modelview
+    glMatrixMode(GL_PROJECTION)
+    glPopMatrix()  # Projection
+    glMatrixMode(GL_MODELVIEW)
+
+
+def draw_game_over_screen(state):
+    """Draws the game over message."""
+    win_w = viewport["width"]
+    win_h = viewport["height"]
+    center_x = win_w / 2
+    center_y = win_h / 2
+    draw_text(
+        center_x - 80,
+        center_y + 50,
+        "GAME OVER",
+        GLUT_BITMAP_TIMES_ROMAN_24,
+        (1.0, 0.0, 0.0),
+    )
+    draw_text(center_x - 100, center_y, f"You reached level {state['level']}")
+    draw_text(center_x - 90, center_y - 30, f"Final Score: {state['score']}")
+    draw_text(center_x - 100, center_y - 80, "Press 'R' to restart")
+
+
+def draw_level_complete_screen():
+    """Draws the level complete message."""
+    win_w = viewport["width"]
+    win_h = viewport["height"]
+    center_x = win_w / 2
+    center_y = win_h / 2
+    draw_text(
+        center_x - 120,
+        center_y + 50,
+        "LEVEL COMPLETE!",
+        GLUT_BITMAP_TIMES_ROMAN_24,
+        (0.0, 1.0, 0.0),
+    )
+    draw_text(center_x - 100, center_y, "All systems repaired")
+    draw_text(center_x - 140, center_y - 50, "Press SPACE for Upgrade Menu")
+
+
+def draw_upgrade_menu(state):
+    """Draws the upgrade selection menu."""
+    win_w = viewport["width"]
+    win_h = viewport["height"]
+    center_x = win_w / 2
+    y_pos = win_h * 0.8
+    draw_text(
+        center_x - 100,
+        y_pos,
+        "UPGRADE MENU",
+        GLUT_BITMAP_TIMES_ROMAN_24,
+        color=COLORS["upgrade_text"],
+    )
+    y_pos -= 50
+    draw_text(
+        center_x - 150,
+        y_pos,
+        f"Points Available: {state['points_available']}",
+        color=COLORS["upgrade_text"],
+    )
+    y_pos -= 50
+    draw_text(
+        center_x - 150,
+        y_pos,
+        "1. Faster Fire Rate (50 pts)",
+        color=COLORS["upgrade_text"],
+    )
+    y_pos -= 40
+    draw_text(
+        center_x - 150,
+        y_pos,
+        "2. Increase Max Ammo (+10) (30 pts)",
+        color=COLORS["upgrade_text"],
+    )
+    y_pos -= 40
+    draw_text(
+        center_x - 150,
+        y_pos,
+        "3. Increase Max Health (+25) (40 pts)",
+        color=COLORS["upgrade_text"],
+    )
+    y_pos -= 40
+    draw_text(
+        center_x - 150,
+        y_pos,
+        "4. Add/Improve Shield (+50 Max) (80 pts)",
+        color=COLORS["upgrade_text"],
+    )
+    y_pos -= 60
+    draw_text(
+        center_x - 150,
+        y_pos,
+        "Press 1, 2, 3, or 4 to upgrade",
+        color=COLORS["upgrade_text"],
+    )
+    draw_text(
+        center_x - 150,
+        y_pos - 30,
+        "Press SPACE to skip and continue",
+        color=COLORS["upgrade_text"],
+    )
+
+
+# --- Window Input ---
+def keyboard_down(key, x, y):
+    """GLUT keyboard callback: game input, then wakes the loop from menu idle."""
+    game.keyboard_down(key, x, y)
+    # Menu screens only redraw on input; resume the game loop when they close
+    if frame_pacing["menu_idle"]:
+        if game.game_over or game.level_complete or game.upgrading:
+            glutPostRedisplay()
+        else:
+            set_menu_idle(False)
+
+
+def is_menu_open():
+    """True while a menu screen is up; when threaded, as of the latest snapshot.
+
+    The co-op client only learns about menus from server snapshots, so its
+    own game_over and level_complete globals are never set.
+    """
+    if game.sim_thread["running"]:
+        snapshot = game.sim_thread["buffers"][game.sim_thread["front"]]
+        return snapshot["game_over"] or snapshot["level_complete"] or snapshot["upgrading"]
+    return game.game_over or game.level_complete or game.upgrading
+
+
+def mouse_passive_motion(x, y):
+    if is_menu_open():
+        glutSetCursor(GLUT_CURSOR_INHERIT)
+        return
+    glutSetCursor(GLUT_CURSOR_NONE)
+    window_width = viewport["width"]
+    window_height = viewport["height"]
+    center_x = window_width / 2
+    center_y = window_height / 2
+    delta_x = x - center_x
+    delta_y = y - center_y
+    if abs(delta_x) > 1 or abs(delta_y) > 1:
+        if game.sim_thread["running"]:
+            game.input_queue.append((game.apply_mouse_look, (delta_x, delta_y)))
+        else:
+            game.apply_mouse_look(delta_x, delta_y)
+        glutWarpPointer(int(center_x), int(center_y))
+
+
+# --- Main Display and Idle Functions ---
+def get_render_state():
+    """Returns the state display() should draw: the latest snapshot when threaded."""
+    if not game.sim_thread["running"]:
+        return game.capture_state()
+    frame_pacing["drawn_sequence"] = game.sim_thread["sequence"]
+    snapshot = game.sim_thread["buffers"][game.sim_thread["front"]]
+    # Interpolate by how far real time has moved past the snapshot's tick
+    alpha = min(1.0, (time.perf_counter() - snapshot["tick_time"]) * snapshot["snapshot_rate"])
+    return dict(snapshot, alpha=alpha)
+
+
+def is_in_view(frustum, x, y, z, radius, visible_cells=None):
+    """Culls an entity against the frustum and occlusion set, updating render_stats.
+
+    Only entities standing below the wall tops can be hidden by the walls, so
+    anything higher (e.g. drones) skips the occlusion test.
+    """
+    if (
+        visible_cells is not None
+        and z < WALL_HEIGHT
+        and (int(x // CELL_SIZE), int(y // CELL_SIZE)) not in visible_cells
+    ):
+        render_stats["entities_culled"] += 1
+        return False
+    if sphere_in_frustum(frustum, x, y, z, radius):
+        render_stats["entities_drawn"] += 1
+        return True
+    render_stats["entities_culled"] += 1
+    return False
+
+
+def display():
+    """The main GLUT display function."""
+    state = get_render_state()
+    win_w = viewport["width"]
+    win_h = viewport["height"]
+    glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+
+    if state["game_over"] or state["level_complete"] or state["upgrading"]:
+        glMatrixMode(GL_PROJECTION)
+        glLoadIdentity()
+        gluOrtho2D(0, win_w, 0, win_h)
+        glMatrixMode(GL_MODELVIEW)
+        glLoadIdentity()
+        glDisable(GL_DEPTH_TEST)
+        # Menu screens are composed once into a layer and reused until they change
+        if state["game_over"]:
+            draw_hud_layer(
+                "screen", ("game_over", state["level"], state["score"]),
+                lambda w, h: draw_game_over_screen(state), win_w, win_h,
+            )
+        elif state["level_complete"]:
+            draw_hud_layer(
+                "screen", ("level_complete",),
+                lambda w, h: draw_level_complete_screen(), win_w, win_h,
+            )
+        elif state["upgrading"]:
+            draw_hud_layer(
+                "screen", ("upgrade", state["points_available"]),
+                lambda w, h: draw_upgrade_menu(state), win_w, win_h,
+            )
+        glEnable(GL_DEPTH_TEST)
+    else:
+        # 3D Projection
+        glMatrixMode(GL_PROJECTION)
+        glLoadIdentity()
+        aspect_ratio = win_w / win_h if win_h > 0 else 1
+        camera_mode = state["camera_mode"]  # Only the simulation/input side writes the global
+        fov = 60 if camera_mode == "first" else 45
+        near_clip = 0.5 if camera_mode == "first" else 1.0
+        far_clip = FAR_CLIP
+        gluPerspective(fov, aspect_ratio, near_clip, far_clip)
+
+        # Draw from positions blended between the last two simulation ticks.
+        # Facing comes straight from the mouse, so the player keeps its live angle.
+        alpha = state["alpha"]
+        render_player = game.interpolate_entity(state["player"], alpha, with_angle=False)
+
+        # Camera View
+        glMatrixMode(GL_MODELVIEW)
+        glLoadIdentity()
+        player_center_z = render_player["z"] + 30
+
+        if camera_mode == "third":
+            # Calculate the base camera angle (player's facing angle) + orbit offset
+            total_orbit_angle = render_player["angle"] + state["camera_orbit_angle_offset"]
+            cam_angle_rad = math.radians(total_orbit_angle)
+            # Calculate camera position based on player pos, angle, distance, height
+            cam_distance = state["camera_current_distance"]
+            cam_x = render_player["x"] - cam_distance * math.cos(cam_angle_rad)
+            cam_y = render_player["y"] - cam_distance * math.sin(cam_angle_rad)
+            cam_z = player_center_z + state["camera_current_height"]
+            target_x = render_player["x"]
+            target_y = render_player["y"]
+            target_z = player_center_z
+            gluLookAt(cam_x, cam_y, cam_z, target_x, target_y, target_z, 0, 0, 1)
+            view_eye = (cam_x, cam_y, cam_z)
+            view_center = (target_x, target_y, target_z)
+        elif camera_mode == "first":
+          eye_x = render_player["x"]
+          eye_y = render_player["y"]
+          eye_z = render_player["z"] + CAMERA_HEIGHT_FIRST
+          # The interpolated copy keeps the live angle, so share the player's cached vectors
+          dir_x, dir_y, dir_z = game.get_direction_vectors(state["player"])[2]
+          look_dist = 100
+          center_x = eye_x + look_dist * dir_x
+          center_y = eye_y + look_dist * dir_y
+          center_z = eye_z + look_dist * dir_z
+          gluLookAt(eye_x, eye_y, eye_z, center_x, center_y, center_z, 0, 0, 1)
+          view_eye = (eye_x, eye_y, eye_z)
+          view_center = (center_x, center_y, center_z)
+
+        # Frustum matching the projection and view set up above
+        frustum = build_view_frustum(
+            view_eye, view_center, (0, 0, 1), fov, aspect_ratio, near_clip, far_clip
+        )
+        for stat in render_stats:
+            render_stats[stat] = 0
+
+        # Occlusion sets only hold while the eye is below the wall tops,
+        # which rules out the raised third person camera
+        visible_cells = None
+        visible_chunks = None
+        if view_eye[2] < WALL_HEIGHT and state["level"] <= len(LEVEL_LAYOUTS):
+            compiled = game.compile_level(state["level"] - 1)
+            eye_cell = (int(view_eye[0] // CELL_SIZE), int(view_eye[1] // CELL_SIZE))
+            visible_cells = compiled["pvs"].get(eye_cell)
+            visible_chunks = compiled["pvs_chunks"].get(eye_cell)
+
+        # Draw Scene
+        glEnable(GL_DEPTH_TEST)
+        draw_level(
+            view_eye[0], view_eye[1], far_clip, frustum, visible_chunks, state["level"]
+        )
+        draw_player(render_player, state["show_muzzle_flash_until"], state["sim_time"])
+        for other in state["remote_players"]:
+            other = game.interpolate_entity(other, alpha)
+            if is_in_view(
+                frustum, other["x"], other["y"], other["z"] + PLAYER_BODY_HEIGHT / 2,
+                PLAYER_BOUND_RADIUS, visible_cells,
+            ):
+                draw_player(other, other["flash_until"], state["sim_time"])
+        for enemy in state["enemies"]:
+            enemy = game.interpolate_entity(enemy, alpha)
+            archetype = game.enemy_archetypes[enemy["type_id"]]
+            size = archetype["size"]
+            if is_in_view(
+                frustum, enemy["x"], enemy["y"], enemy["z"] + size,
+                size * ENEMY_BOUND_RADIUS_SCALE, visible_cells,
+            ):
+                draw_enemy(
+                    enemy,
+                    get_lod_tier(
+                        game.distance_3d(*view_eye, enemy["x"], enemy["y"], enemy["z"]),
+                        archetype["lod_distances"],
+                    ),
+                )
+        for bullet in state["bullets"]:
+            bullet = game.interpolate_entity(bullet, alpha, with_angle=False)
+            if is_in_view(
+                frustum, bullet["x"], bullet["y"], bullet["z"], BULLET_SIZE, visible_cells
+            ):
+                draw_bullet(
+                    bullet,
+                    is_enemy=False,
+                    lod=get_lod_tier(
+                        game.distance_3d(*view_eye, bullet["x"], bullet["y"], bullet["z"]),
+                        BULLET_LOD_DISTANCES,
+                    ),
+                )
+        for bullet in state["enemy_bullets"]:
+            bullet = game.interpolate_entity(bullet, alpha, with_angle=False)
+            if is_in_view(
+                frustum, bullet["x"], bullet["y"], bullet["z"], BULLET_SIZE, visible_cells
+            ):
+                draw_bullet(
+                    bullet,
+                    is_enemy=True,
+                    lod=get_lod_tier(
+                        game.distance_3d(*view_eye, bullet["x"], bullet["y"], bullet["z"]),
+                        BULLET_LOD_DISTANCES,
+                    ),
+                )
+        for system in state["systems"]:
+            if is_in_view(
+                frustum, system["x"], system["y"], system["z"] + SYSTEM_SIZE / 2,
+                SYSTEM_BOUND_RADIUS, visible_cells,
+            ):
+                draw_system(system)
+        for powerup in state["powerups"]:
+            if is_in_view(
+                frustum, powerup["x"], powerup["y"], powerup["z"],
+                POWERUP_BOUND_RADIUS, visible_cells,
+            ):
+                draw_powerup(powerup)
+        flush_render_queue()
+        draw_ui(state)  # Draw UI overlay
+
+    swap_start = time.perf_counter()
+    glutSwapBuffers()
+    record_swap_time(time.perf_counter() - swap_start)
+
+
+def reshape(width, height):
+    """The GLUT reshape function: records the new window size and resizes the viewport.
+
+    display() rebuilds its projection from the viewport every frame, so the
+    aspect ratio and the 2D overlays follow the new size on the next redraw.
+    """
+    viewport["width"] = width
+    viewport["height"] = max(1, height)  # Avoid a zero aspect ratio when minimised
+    glViewport(0, 0, viewport["width"], viewport["height"])
+    glutPostRedisplay()
+
+
+def record_swap_time(swap_time):
+    """Tracks how long buffer swaps block to detect a vsync-paced driver."""
+    frame_pacing["swap_time"] += (swap_time - frame_pacing["swap_time"]) * 0.1
+    if TARGET_FPS > 0:
+        frame_pacing["vsync"] = (
+            frame_pacing["swap_time"] > VSYNC_SWAP_FRACTION / TARGET_FPS
+        )
+
+
+def precise_sleep_until(wake_time):
+    """Sleeps until wake_time (perf_counter seconds), spinning for the last moment."""
+    remaining = wake_time - time.perf_counter()
+    if remaining > SLEEP_SPIN_MARGIN:
+        time.sleep(remaining - SLEEP_SPIN_MARGIN)
+    while time.perf_counter() < wake_time:
+        pass
+
+
+def set_menu_idle(enabled):
+    """Switches between the running game loop and the input-driven menu mode."""
+    frame_pacing["menu_idle"] = enabled
+    if enabled:
+        glutIdleFunc(None)  # Block in the event loop until input arrives
+    else:
+        # Don't let the time spent in the menu reach the simulation
+        game.last_frame_time = time.perf_counter()
+        game.sim_accumulator = 0.0
+        frame_pacing["next_render_time"] = game.last_frame_time
+        glutIdleFunc(idle)
+    glutPostRedisplay()
+
+
+def pace_threaded_render():
+    """Idle work when the simulation runs on its own thread: just pace redraws."""
+    current_time = time.perf_counter()
+    in_menu = is_menu_open()
+    frame_interval = 1.0 / TARGET_FPS if TARGET_FPS > 0 else 0.0
+
+    # Menu snapshots only change on input, so only redraw when a new one lands
+    if in_menu and frame_pacing["drawn_sequence"] == game.sim_thread["sequence"]:
+        time.sleep(frame_interval or 1.0 / SIM_TICK_RATE)
+        return
+
+    if TARGET_FPS <= 0 or frame_pacing["vsync"]:
+        glutPostRedisplay()
+    elif current_time >= frame_pacing["next_render_time"]:
+        frame_pacing["next_render_time"] = max(
+            frame_pacing["next_render_time"] + frame_interval, current_time
+        )
+        glutPostRedisplay()
+    else:
+        precise_sleep_until(frame_pacing["next_render_time"])
+
+
+def idle():
+    """The GLUT idle function, called when no events are pending.
+
+    Runs the simulation in fixed SIM_TICK_RATE steps and, separately, paces
+    redraws to TARGET_FPS, sleeping between them instead of spinning.
+    """
+    if game.sim_thread["running"]:
+        pace_threaded_render()
+        return
+    if game.game_over or game.level_complete or game.upgrading:
+        set_menu_idle(True)
+        return
+
+    current_time = time.perf_counter()
+    game.sim_accumulator += min(current_time - game.last_frame_time, MAX_FRAME_DT)
+    game.last_frame_time = current_time
+
+    tick = 1.0 / SIM_TICK_RATE
+    steps = 0
+    while game.sim_accumulator >= tick:
+        if steps == MAX_SIM_STEPS_PER_FRAME:
+            game.sim_accumulator = 0.0
+            break
+        game.step_simulation(tick)
+        game.sim_accumulator -= tick
+        steps += 1
+        if game.game_over or game.level_complete or game.upgrading:
+            break
+
+    # With vsync the swap already blocks, so just redraw every pass
+    if TARGET_FPS <= 0 or frame_pacing["vsync"]:
+        glutPostRedisplay()
+        return
+
+    frame_interval = 1.0 / TARGET_FPS
+    if current_time >= frame_pacing["next_render_time"]:
+        # Keep a steady cadence, but don't try to catch up on missed frames
+        frame_pacing["next_render_time"] = max(
+            frame_pacing["next_render_time"] + frame_interval, current_time
+        )
+        glutPostRedisplay()
+    else:
+        next_tick_time = current_time + tick - game.sim_accumulator
+        precise_sleep_until(min(frame_pacing["next_render_time"], next_tick_time))
+
+
+# --- Main Function ---
+def init_gl_state():
+    """Sets the fixed GL state the game renders with, once a context exists."""
+    glEnable(GL_DEPTH_TEST)
+    glClearColor(0.1, 0.1, 0.2, 1.0)
+    glEnable(GL_CULL_FACE)
+    glCullFace(GL_BACK)
+    glShadeModel(GL_SMOOTH)
+
+
+def open_window(route_input):
+    """Creates the game window and registers its callbacks.
+
+    route_input wraps each input handler, e.g. to queue it for another thread.
+    """
+    glutInit()
+    glutInitDisplayMode(GLUT_DOUBLE | GLUT_RGB | GLUT_DEPTH)
+    glutInitWindowSize(WINDOW_WIDTH, WINDOW_HEIGHT)
+    glutInitWindowPosition(100, 100)
+    glutCreateWindow(b"Space Station Siege v3")  # Updated title
+    init_gl_state()
+
+    # Register GLUT callbacks
+    glutDisplayFunc(display)
+    glutReshapeFunc(reshape)
+    glutKeyboardFunc(route_input(keyboard_down))
+    glutKeyboardUpFunc(route_input(game.keyboard_up))
+    glutSpecialFunc(route_input(game.special_keys_down))  # Register special key down handler
+    glutSpecialUpFunc(route_input(game.special_keys_up))  # Register special key up handler
+    glutMouseFunc(route_input(game.mouse_click))
+    glutPassiveMotionFunc(mouse_passive_motion)
+    glutIdleFunc(idle)
+
+    glutSetCursor(GLUT_CURSOR_NONE)
+    game.precompile_levels = True  # reset_level builds each layout's visibility data
+
+
+def main():
+    # With a simulation thread, input is queued for it rather than applied here
+    open_window(game.queue_input if THREADED_SIMULATION else (lambda handler: handler))
+    game.reset_game()
+    if THREADED_SIMULATION:
+        game.start_simulation_thread()
+
+    print("--- Space Station Siege v3 ---")
+    print("Controls:")
+    print(" W/S: Move Forward/Backward | A/D: Strafe Left/Right")
+    print(" Mouse: Aim | Left Click: Shoot | Right Click: Toggle Camera")
+    print(" R (Hold): Repair System | Space: Continue/Skip Upgrade")
+    print(
+        " Arrow Keys (Third Person): Orbit (Left/Right), Zoom (Up/Down)"
+    )  # Updated controls
+    print(" 1/2/3/4: Select Upgrade | F3: Toggle Render Stats")
+    print("----------------------------")
+
+    glutMainLoop()
@@ -0,0 +1,458 @@
+"""Authoritative UDP game server for co-op Space Station Siege.
+
+Owns the players, enemies, bullets and systems of one session for up to
+NET_MAX_PLAYERS players and advances them at SIM_TICK_RATE with
+project.py's own update functions. Clients send an INPUT every tick;
+every NET_SNAPSHOT_INTERVAL ticks the world is packed once and the same
+datagram goes to every client (see net_protocol).
+
+project.py keeps one player in module globals, so each player's turn of
+a tick swaps that player's state into those globals (PLAYER_GLOBALS).
+Enemies and enemy bullets are split by nearest player, and each share is
+updated against that player. Player bullets, powerups, score and the
+level are shared. Co-op has no upgrade menu: the next level starts
+NET_MENU_DELAY seconds after the last system is repaired, and a wiped
+out team restarts from level 1 after the same delay.
+
+Example:
+    python server.py
+    python client.py --host 127.0.0.1  # In two more terminals
+"""
+
+import argparse
+import math
+import select
+import socket
+import time
+
+import net_protocol as net
+import project as game
+from game_data import *
+
+# Per-player values of project.py globals, swapped in for that player's turn
+PLAYER_GLOBALS = (
+    "player", "keys_pressed", "repairing", "repair_timer", "system_being_repaired",
+    "last_print_time", "last_player_enemy_collision_time", "ai_schedule",
+)
+
+# --- Server State ---
+clients = {}  # address -> client dict (see add_client)
+session = {
+    "level_start": (0.0, 0.0),  # Where reset_level put the player
+    "menu_until": None,  # Wall clock time the current menu screen ends
+    "next_net_id": 0,  # Next enemy or bullet id, wrapping at 65536
+    "snapshot_sequence": 0,
+    "ticks": 0,  # Server loop iterations, which keep running during menus
+}
+# Load since serve() started
+server_stats = {
+    "ticks": 0,  # Ticks with at least one player
+    "tick_seconds": 0.0,  # Simulation and broadcast time over those ticks
+    "max_tick_seconds": 0.0,
+    "snapshots": 0,
+    "bytes_sent": 0,
+    "bytes_received": 0,
+    "started": 0.0,
+}
+last_report = dict(server_stats)  # server_stats as of the last log_load
+
+
+def reset_stats():
+    """Zeroes server_stats."""
+    server_stats.update(
+        ticks=0, tick_seconds=0.0, max_tick_seconds=0.0, snapshots=0,
+        bytes_sent=0, bytes_received=0, started=time.perf_counter(),
+    )
+    last_report.update(server_stats)
+
+
+# --- Players ---
+def new_player_globals(player):
+    """Fresh per-player values for PLAYER_GLOBALS."""
+    return {
+        "player": player,
+        "keys_pressed": set(),
+        "repairing": False,
+        "repair_timer": 0.0,
+        "system_being_repaired": None,
+        "last_print_time": 0.0,
+        "last_player_enemy_collision_time": {},
+        "ai_schedule": {"cursor": 0},
+    }
+
+
+def place_player(client):
+    """Puts a client's player at the level start with full ammo and a fresh repair state."""
+    player = client["globals"]["player"]
+    player["x"], player["y"] = session["level_start"]
+    player["z"] = 0
+    player["angle"] = 0
+    player["ammo"] = player["max_ammo"]
+    if player["health"] <= 0:
+        player["health"] = player["max_health"]  # Downed players are back for the new level
+    client["globals"] = new_player_globals(player)
+    client["fired_at"] = -math.inf  # reset_game restarts the clock
+
+
+def enter_player(client):
+    """Swaps a client's player state into the project globals."""
+    for name, value in client["globals"].items():
+        setattr(game, name, value)
+
+
+def leave_player(client):
+    """Stores the project globals back into a client's player state."""
+    values = client["globals"]
+    for name in PLAYER_GLOBALS:
+        values[name] = getattr(game, name)
+
+
+def add_client(address):
+    """Creates a player for a new address; returns None when the server is full."""
+    used = {client["id"] for client in clients.values()}
+    free = [player_id for player_id in range(NET_MAX_PLAYERS) if player_id not in used]
+    if not free:
+        return None
+    client = {
+        "id": free[0],
+        "address": address,
+        "globals": new_player_globals(game.new_player()),
+        "sequence": None,  # Last INPUT sequence applied
+        "buttons": 0,
+        "shots": None,  # Last shot counter seen; a change pulls the trigger
+        "fire": False,
+        "fired_at": -math.inf,  # sim_time of the player's last shot
+        "last_heard": time.perf_counter(),
+    }
+    place_player(client)
+    clients[address] = client
+    game.log_event(
+        "info", "player_joined", "Player {id} joined from {address}.",
+        id=client["id"], address=f"{address[0]}:{address[1]}",
+    )
+    return client
+
+
+def remove_client(address, reason):
+    """Forgets a client and its player."""
+    client = clients.pop(address)
+    game.log_event("info", "player_left", "Player {id} left ({reason}).", id=client["id"], reason=reason)
+
+
+# --- Messages ---
+def handle_message(sock, data, address):
+    """Applies one client datagram."""
+    server_stats["bytes_received"] += len(data)
+    if not data:
+        return
+    kind = data[0]
+    client = clients.get(address)
+    if kind == net.MSG_JOIN:
+        if client is None:
+            client = add_client(address)
+        if client is None:
+            sock.sendto(net.TYPE.pack(net.MSG_FULL), address)
+        else:
+            client["last_heard"] = time.perf_counter()
+            sock.sendto(net.WELCOME.pack(net.MSG_WELCOME, client["id"]), address)
+    elif kind == net.MSG_INPUT and client is not None and len(data) == net.INPUT.size:
+        sequence, buttons, shots, angle, pitch = net.unpack_input(data)
+        client["last_heard"] = time.perf_counter()
+        # Drop reordered datagrams (sequence numbers wrap at 2**32)
+        if client["sequence"] is not None and (sequence - client["sequence"]) % 2**32 >= 2**31:
+            return
+        client["sequence"] = sequence
+        client["buttons"] = buttons
+        if client["shots"] is not None and shots != client["shots"]:
+            client["fire"] = True  # Pulled since the last input; mouse_click applies fire_rate
+        client["shots"] = shots
+        player = client["globals"]["player"]
+        player["angle"] = angle  # Aim is the client's; position is the server's
+        player["pitch"] = max(PITCH_MIN, min(PITCH_MAX, pitch))
+    elif kind == net.MSG_LEAVE and client is not None:
+        remove_client(address, "quit")
+
+
+def receive_messages(sock):
+    """Handles every datagram waiting on the socket."""
+    while True:
+        try:
+            data, address = sock.recvfrom(2048)
+        except BlockingIOError:
+            return
+        except ConnectionError:
+            continue  # ICMP error from an earlier send to a client that has gone
+        handle_message(sock, data, address)
+
+
+def drop_silent_clients():
+    """Removes clients that have sent nothing for NET_CLIENT_TIMEOUT."""
+    now = time.perf_counter()
+    for address in [a for a, c in clients.items() if now - c["last_heard"] > NET_CLIENT_TIMEOUT]:
+        remove_client(address, "timed out")
+
+
+# --- Simulation ---
+def assign_net_ids(entities):
+    """Gives enemies and bullets spawned since the last tick a snapshot id."""
+    next_id = session["next_net_id"]
+    for entity in entities:
+        if "net_id" not in entity:
+            entity["net_id"] = next_id
+            next_id = (next_id + 1) & 0xFFFF
+    session["next_net_id"] = next_id
+
+
+def split_by_nearest(players, entities):
+    """Returns one list per player of the entities closest to that player."""
+    shares = [[] for _ in players]
+    if len(players) == 1:
+        shares[0] = list(entities)
+        return shares
+    positions = [(p["x"], p["y"]) for p in players]
+    for entity in entities:
+        x = entity["x"]
+        y = entity["y"]
+        nearest = 0
+        nearest_dist_sq = math.inf
+        for k, (px, py) in enumerate(positions):
+            dist_sq = (px - x) ** 2 + (py - y) ** 2
+            if dist_sq < nearest_dist_sq:
+                nearest = k
+                nearest_dist_sq = dist_sq
+        shares[nearest].append(entity)
+    return shares
+
+
+def server_step(dt):
+    """Multi-player step_simulation: every active player takes a turn of the update pipeline."""
+    game.sim_time += dt
+    game.sim_ticks += 1
+    active = [c for c in clients.values() if c["globals"]["player"]["health"] > 0]
+    if not active:
+        game.game_over = True  # Everyone is down
+        return
+
+    # Players move, repair and fire in turn
+    for client in active:
+        enter_player(client)
+        if game.system_being_repaired is not None and game.system_being_repaired["repaired"]:
+            # A teammate finished this system first
+            game.repairing = False
+            game.repair_timer = 0.0
+            game.system_being_repaired = None
+        game.keys_pressed = net.buttons_to_keys(client["buttons"])
+        if client["fire"]:
+            client["fire"] = False
+            game.mouse_click(game.GLUT_LEFT_BUTTON, game.GLUT_DOWN, 0, 0)
+            if game.player["last_shot_time"] == game.sim_time:
+                client["fired_at"] = game.sim_time
+        game.update_player(dt)
+        leave_player(client)
+
+    # Enemies and their bullets, each share against its nearest player
+    enemies = game.enemies
+    enemy_bullets = game.enemy_bullets
+    bullets = game.bullets
+    players = [c["globals"]["player"] for c in active]
+    enemy_shares = split_by_nearest(players, enemies)
+    bullet_shares = split_by_nearest(players, enemy_bullets)
+    game.bullets = []  # Player bullets are updated once, below
+    kept_enemies = []
+    kept_enemy_bullets = []
+    for client, enemy_share, bullet_share in zip(active, enemy_shares, bullet_shares):
+        enter_player(client)
+        game.enemies = enemy_share
+        game.enemy_bullets = bullet_share
+        if enemy_share or bullet_share:
+            game.update_enemies(dt)
+            game.update_bullets(dt)  # Moves this share's enemy bullets, hits this player
+        kept_enemies += game.enemies
+        kept_enemy_bullets += game.enemy_bullets
+        leave_player(client)
+    enemies[:] = kept_enemies
+    enemy_bullets[:] = kept_enemy_bullets
+
+    # Player bullets against every enemy
+    game.enemies = enemies
+    game.bullets = bullets
+    game.enemy_bullets = []
+    game.update_bullets(dt)
+    game.enemy_bullets = enemy_bullets
+
+    # Powerups animate once and go to whoever reaches them first
+    for k, client in enumerate(active):
+        enter_player(client)
+        game.update_powerups(dt if k == 0 else 0.0)
+        leave_player(client)
+
+    # Any one death sets game_over; the session only ends when everyone is down
+    game.game_over = all(c["globals"]["player"]["health"] <= 0 for c in clients.values())
+    game.systems_remaining = sum(not s["repaired"] for s in game.systems)
+    assign_net_ids(enemies)
+    assign_net_ids(bullets)
+    assign_net_ids(enemy_bullets)
+
+
+def start_level():
+    """Places every player at the start of the level reset_level just built."""
+    session["level_start"] = (game.player["x"], game.player["y"])
+    for client in clients.values():
+        place_player(client)
+    assign_net_ids(game.enemies)
+
+
+def advance_menus():
+    """Moves on from the level complete or game over screen once NET_MENU_DELAY has passed."""
+    now = time.perf_counter()
+    if session["menu_until"] is None:
+        session["menu_until"] = now + NET_MENU_DELAY
+        return
+    if now < session["menu_until"]:
+        return
+    session["menu_until"] = None
+    if game.game_over:
+        game.reset_game()
+        for client in clients.values():
+            client["globals"]["player"] = game.new_player()
+        game.log_event("info", "session_restarted", "Everyone is down. Restarting from level 1.")
+    else:
+        game.level_complete = False
+        game.level += 1
+        if game.level > len(LEVEL_LAYOUTS):
+            game.log_event("info", "session_won", "All sectors cleared! Restarting from level 1.")
+            game.reset_game()
+        else:
+            game.reset_level()
+    start_level()
+
+
+# --- Snapshots ---
+def pack_world():
+    """Packs the current world into one SNAPSHOT datagram."""
+    flags = 0
+    if game.game_over:
+        flags |= net.SNAPSHOT_GAME_OVER
+    if game.level_complete:
+        flags |= net.SNAPSHOT_LEVEL_COMPLETE
+    since = game.sim_time - NET_SNAPSHOT_INTERVAL / SIM_TICK_RATE
+    player_records = []
+    for client in sorted(clients.values(), key=lambda c: c["id"]):
+        values = client["globals"]
+        player = values["player"]
+        player_flags = 0
+        if values["repairing"]:
+            player_flags |= net.PLAYER_REPAIRING
+        if player["health"] <= 0:
+            player_flags |= net.PLAYER_DOWN
+        if client["fired_at"] > since:
+            player_flags |= net.PLAYER_FIRED
+        player_records.append(
+            net.pack_player(client["id"], player_flags, player, values["repair_timer"])
+        )
+    session["snapshot_sequence"] += 1
+    return net.pack_snapshot(
+        session["snapshot_sequence"], game.sim_ticks, game.level, flags, game.score,
+        player_records, game.enemies, game.bullets, game.enemy_bullets,
+        game.systems, game.powerups,
+    )
+
+
+def broadcast(sock, data):
+    """Sends one datagram to every client."""
+    for address in clients:
+        try:
+            sock.sendto(data, address)
+        except OSError:
+            continue  # Unreachable right now; drop_silent_clients handles the rest
+        server_stats["bytes_sent"] += len(data)
+    server_stats["snapshots"] += 1
+
+
+# --- Main Loop ---
+def serve(port=NET_PORT, duration=None):
+    """Runs the server on a UDP port, forever or for duration seconds; returns server_stats."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(("", port))
+    sock.setblocking(False)
+    game.reset_game()
+    start_level()
+    reset_stats()
+
+    tick = 1.0 / SIM_TICK_RATE
+    start = time.perf_counter()
+    next_tick_time = start
+    next_report_time = start + NET_STATS_INTERVAL
+    try:
+        while duration is None or time.perf_counter() - start < duration:
+            receive_messages(sock)
+            drop_silent_clients()
+            if clients:
+                tick_start = time.perf_counter()
+                if game.game_over or game.level_complete:
+                    advance_menus()
+                else:
+                    server_step(tick)
+                session["ticks"] += 1
+                if session["ticks"] % NET_SNAPSHOT_INTERVAL == 0:
+                    broadcast(sock, pack_world())
+                tick_seconds = time.perf_counter() - tick_start
+                server_stats["ticks"] += 1
+                server_stats["tick_seconds"] += tick_seconds
+                server_stats["max_tick_seconds"] = max(server_stats["max_tick_seconds"], tick_seconds)
+
+            current_time = time.perf_counter()
+            if current_time >= next_report_time:
+                next_report_time = current_time + NET_STATS_INTERVAL
+                log_load()
+
+            # Sleep until the next tick, waking early to take in input
+            next_tick_time += tick
+            if next_tick_time < current_time - MAX_FRAME_DT:
+                next_tick_time = current_time  # Fell far behind; don't try to catch up
+            while True:
+                remaining = next_tick_time - time.perf_counter()
+                if remaining <= 0:
+                    break
+                if select.select([sock], [], [], remaining)[0]:
+                    receive_messages(sock)
+    finally:
+        sock.close()
+    return dict(server_stats)
+
+
+def log_load():
+    """Logs mean tick time and bandwidth since the last report."""
+    now = time.perf_counter()
+    ticks = server_stats["ticks"] - last_report["ticks"]
+    if ticks:
+        elapsed = now - last_report["started"]
+        tick_seconds = server_stats["tick_seconds"] - last_report["tick_seconds"]
+        game.log_event(
+            "info", "server_load",
+            "{players} players: tick {mean:.2f} ms mean; {out:.1f} KB/s out, {inbound:.1f} KB/s in",
+            players=len(clients),
+            mean=tick_seconds / ticks * 1000,
+            out=(server_stats["bytes_sent"] - last_report["bytes_sent"]) / elapsed / 1024,
+            inbound=(server_stats["bytes_received"] - last_report["bytes_received"]) / elapsed / 1024,
+        )
+    last_report.update(server_stats, started=now)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=NET_PORT)
+    parser.add_argument("--seed", type=int, help="seed for enemy spawns and powerups")
+    args = parser.parse_args(argv)
+
+    if args.seed is not None:
+        game.random.seed(args.seed)
+    game.log_event("info", "server_started", "Listening on UDP port {port}.", port=args.port)
+    try:
+        serve(args.port)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
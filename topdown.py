@@ -0,0 +1,206 @@
+"""Pure-NumPy top-down renderer for Space Station Siege.
+
+Rasterizes the level grid and every entity into a small RGB array without
+a GPU or a display. Bots can use the images as observations, and CI can
+compare them against golden images. Walls and floors are rendered once per
+level and cached. Each frame copies that background and stamps the
+systems, powerups, enemies, bullets and player on top as filled discs in
+the game's COLORS.
+
+Both the game's own state (render_game) and whole VecEnv batches
+(render_vec_env) are supported.
+
+Example:
+    python topdown.py level1.ppm --pixels-per-cell 12
+"""
+
+import argparse
+
+import numpy as np
+
+import project as game
+import vec_env
+
+
+def to_rgb8(color):
+    """Converts a 0..1 float colour to a uint8 RGB triple."""
+    return np.array([round(channel * 255) for channel in color[:3]], np.uint8)
+
+
+class TopDownRenderer:
+    """Renders game states to (H, W, 3) uint8 images, one cell per pixels_per_cell."""
+
+    def __init__(self, pixels_per_cell=8):
+        self.pixels_per_cell = pixels_per_cell
+        self.scale = pixels_per_cell / game.CELL_SIZE  # Pixels per world unit
+        self.backgrounds = {}  # level index -> static image
+        self.disc_offsets = {}  # radius in pixels -> (dy, dx) offsets
+
+    # --- Static background ---
+    def get_background(self, level_index):
+        """Returns the cached wall/floor image for a level, rendering it on first use."""
+        background = self.backgrounds.get(level_index)
+        if background is None:
+            layout = np.array(game.LEVEL_LAYOUTS[level_index])
+            rows, cols = np.indices(layout.shape)
+            # Same checkerboard and wall colours as draw_level_cells
+            cells = np.where(
+                ((rows + cols) % 2 == 0)[..., None],
+                to_rgb8(game.COLORS["floor1"]),
+                to_rgb8(game.COLORS["floor2"]),
+            )
+            cells[layout == 1] = to_rgb8(game.COLORS["wall"])
+            ppc = self.pixels_per_cell
+            background = np.repeat(np.repeat(cells, ppc, axis=0), ppc, axis=1)
+            self.backgrounds[level_index] = background
+        return background
+
+    # --- Primitives ---
+    def get_disc_offsets(self, radius):
+        """Returns the pixel offsets covered by a disc of the given pixel radius."""
+        offsets = self.disc_offsets.get(radius)
+        if offsets is None:
+            span = np.arange(-radius, radius + 1)
+            dy, dx = np.meshgrid(span, span, indexing="ij")
+            inside = dx**2 + dy**2 <= radius**2 + radius  # Rounder small discs
+            offsets = (dy[inside], dx[inside])
+            self.disc_offsets[radius] = offsets
+        return offsets
+
+    def stamp_discs(self, images, image_index, x, y, radius, color):
+        """Draws filled discs at world positions (x, y) into images[image_index].
+
+        image_index, x and y are equal-length arrays. radius is in world units.
+        """
+        if len(x) == 0:
+            return
+        height, width = images.shape[1:3]
+        dy, dx = self.get_disc_offsets(max(0, int(round(radius * self.scale))))
+        py = np.floor(np.asarray(y) * self.scale).astype(np.int64)[:, None] + dy
+        px = np.floor(np.asarray(x) * self.scale).astype(np.int64)[:, None] + dx
+        inside = (px >= 0) & (px < width) & (py >= 0) & (py < height)
+        index = np.broadcast_to(np.asarray(image_index)[:, None], px.shape)
+        images[index[inside], py[inside], px[inside]] = color
+
+    def stamp_dicts(self, images, items, radius, color):
+        """Draws a list of game entity dicts into a single image."""
+        if items:
+            x = np.array([item["x"] for item in items], float)
+            y = np.array([item["y"] for item in items], float)
+            self.stamp_discs(images, np.zeros(len(items), np.int64), x, y, radius, color)
+
+    def stamp_player(self, images, image_index, x, y, angle_degrees):
+        """Draws the player body with a gun dot showing the facing."""
+        angle = np.radians(angle_degrees)
+        self.stamp_discs(images, image_index, x, y, game.PLAYER_RADIUS, to_rgb8(game.COLORS["player_body"]))
+        gun_x = x + np.cos(angle) * game.PLAYER_RADIUS
+        gun_y = y + np.sin(angle) * game.PLAYER_RADIUS
+        self.stamp_discs(images, image_index, gun_x, gun_y, game.BULLET_SIZE, to_rgb8(game.COLORS["gun"]))
+
+    # --- Frames ---
+    def render(self, level_number, player, enemies, systems, powerups, bullets, enemy_bullets):
+        """Renders one game state given in project.py's dict/list format."""
+        level_index = min(level_number, len(game.LEVEL_LAYOUTS)) - 1
+        images = self.get_background(level_index)[None].copy()
+
+        for repaired in (False, True):
+            self.stamp_dicts(
+                images,
+                [s for s in systems if s["repaired"] == repaired],
+                game.SYSTEM_BOUND_RADIUS,
+                to_rgb8(game.COLORS["system_repaired" if repaired else "system"]),
+            )
+        for kind in ("health", "ammo"):
+            self.stamp_dicts(
+                images,
+                [p for p in powerups if p["type"] == kind],
+                game.POWERUP_BOUND_RADIUS,
+                to_rgb8(game.COLORS[kind + "_pack"]),
+            )
+        for archetype in game.enemy_archetypes:
+            self.stamp_dicts(
+                images,
+                [e for e in enemies if e["type_id"] == archetype["id"]],
+                archetype["radius"],
+                to_rgb8(archetype["color"]),
+            )
+        self.stamp_dicts(images, bullets, game.BULLET_SIZE, to_rgb8(game.COLORS["bullet"]))
+        self.stamp_dicts(images, enemy_bullets, game.BULLET_SIZE, to_rgb8(game.COLORS["enemy_bullet"]))
+        if player:
+            self.stamp_player(
+                images, np.zeros(1, np.int64), np.array([player["x"]], float),
+                np.array([player["y"]], float), player["angle"],
+            )
+        return images[0]
+
+    def render_game(self):
+        """Renders the live state of the project module."""
+        return self.render(
+            game.level, game.player, game.enemies, game.systems,
+            game.powerups, game.bullets, game.enemy_bullets,
+        )
+
+    def render_vec_env(self, env, indices=None):
+        """Renders VecEnv instances to an (n, H, W, 3) batch.
+
+        indices selects instances (all by default). Every stamp call covers the
+        whole batch, so the cost grows with entity count, not Python loops.
+        """
+        if indices is None:
+            indices = np.arange(env.num_envs)
+        indices = np.asarray(indices)
+        level_index = np.minimum(env.level[indices], env.num_levels) - 1
+        images = np.stack([self.get_background(i) for i in range(env.num_levels)])[level_index]
+
+        def stamp(alive, positions, radius, color):
+            batch, items = np.nonzero(alive[indices])
+            pos = positions[indices[batch], items]
+            self.stamp_discs(images, batch, pos[:, 0], pos[:, 1], radius, color)
+
+        system_pos = env.system_pos_table[level_index]
+        for batch_alive, key in (
+            (~env.system_repaired[indices], "system"),
+            (env.system_repaired[indices] & env.system_valid_table[level_index], "system_repaired"),
+        ):
+            batch, items = np.nonzero(batch_alive)
+            pos = system_pos[batch, items]
+            self.stamp_discs(
+                images, batch, pos[:, 0], pos[:, 1], game.SYSTEM_BOUND_RADIUS, to_rgb8(game.COLORS[key])
+            )
+        for kind, key in ((0, "health_pack"), (1, "ammo_pack")):
+            stamp(env.powerup_alive & (env.powerup_type == kind), env.powerup_pos,
+                  game.POWERUP_BOUND_RADIUS, to_rgb8(game.COLORS[key]))
+        for type_id, name in enumerate(vec_env.ENEMY_TYPE_NAMES):
+            archetype = game.enemy_archetypes[game.enemy_type_ids[name]]
+            stamp(env.enemy_alive & (env.enemy_type == type_id), env.enemy_pos,
+                  archetype["radius"], to_rgb8(archetype["color"]))
+        stamp(env.bullet_alive, env.bullet_pos, game.BULLET_SIZE, to_rgb8(game.COLORS["bullet"]))
+        stamp(env.enemy_bullet_alive, env.enemy_bullet_pos, game.BULLET_SIZE,
+              to_rgb8(game.COLORS["enemy_bullet"]))
+        pos = env.player_pos[indices]
+        self.stamp_player(images, np.arange(len(indices)), pos[:, 0], pos[:, 1], env.player_angle[indices])
+        return images
+
+
+def save_ppm(path, image):
+    """Writes an (H, W, 3) uint8 image as a binary PPM file."""
+    with open(path, "wb") as f:
+        f.write(b"P6 %d %d 255\n" % (image.shape[1], image.shape[0]))
+        f.write(np.ascontiguousarray(image).tobytes())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("output", help="PPM file to write")
+    parser.add_argument("--pixels-per-cell", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    game.set_event_log_level("off")
+    game.random.seed(args.seed)
+    game.reset_game()
+    save_ppm(args.output, TopDownRenderer(args.pixels_per_cell).render_game())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,525 @@
+"""Vectorized Space Station Siege environments for agent training.
+
+VecEnv steps N independent games in lockstep. Each game has its own player,
+enemies, bullets, powerups and level. All state lives in batched NumPy
+arrays, so a single step() call advances every instance. The rules follow
+project.py and use its tables (ENEMY_TYPES, SPAWN_COUNTS, LEVEL_LAYOUTS and
+the gameplay constants), with these simplifications:
+
+* The world is planar. Bullets hit on horizontal distance, so drones can be
+  shot without pitching the aim up.
+* Clearing a level moves straight on to the next one. There is no upgrade
+  menu.
+* A game that ends (death, victory or the step limit) is reset
+  automatically. step() then returns the first observation of the new game.
+
+Observations are cheap to build. Each one is a local grid crop around the
+player plus a few scalars.
+
+Example:
+    env = VecEnv(1024, seed=0)
+    obs = env.reset()
+    obs, rewards, dones, info = env.step(env.sample_actions())
+"""
+
+import numpy as np
+
+import project as game
+
+# Action columns: forward (-1..1), strafe (-1..1), turn (-1..1), fire (0/1), repair (0/1)
+ACTION_FORWARD, ACTION_STRAFE, ACTION_TURN, ACTION_FIRE, ACTION_REPAIR = range(5)
+NUM_ACTIONS = 5
+
+# Observation grid channels
+OBS_WALL, OBS_ENEMY, OBS_SYSTEM, OBS_POWERUP, OBS_ENEMY_BULLET = range(5)
+NUM_OBS_CHANNELS = 5
+
+ENEMY_TYPE_NAMES = sorted(game.ENEMY_TYPES)
+POWERUP_HEALTH, POWERUP_AMMO = 0, 1
+PLAYER_START = {
+    "health": 100,
+    "max_health": 100,
+    "ammo": 20,
+    "max_ammo": 20,
+    "fire_rate": 0.5,
+}
+SPAWN_CANDIDATES = 16  # Random cells tried per enemy before giving up, like spawn_enemy
+MIN_SPAWN_DISTANCE = game.CELL_SIZE * 4
+
+
+class VecEnv:
+    """N lockstep game instances backed by batched NumPy state."""
+
+    def __init__(
+        self,
+        num_envs,
+        seed=None,
+        view_radius=4,
+        max_bullets=16,
+        max_enemy_bullets=16,
+        max_powerups=16,
+        max_episode_steps=9000,
+        dt=None,
+    ):
+        self.num_envs = num_envs
+        self.view_radius = view_radius
+        self.view_size = view_radius * 2 + 1
+        self.max_episode_steps = max_episode_steps
+        self.dt = dt if dt is not None else 1.0 / game.SIM_TICK_RATE
+        self.rng = np.random.default_rng(seed)
+        self.env_index = np.arange(num_envs)
+
+        self._compile_levels()
+        self._compile_enemy_types()
+
+        n = num_envs
+        m = self.max_enemies
+        # Player
+        self.level = np.ones(n, np.int64)
+        self.score = np.zeros(n, np.int64)
+        self.time = np.zeros(n)
+        self.steps = np.zeros(n, np.int64)
+        self.player_pos = np.zeros((n, 2))
+        self.player_angle = np.zeros(n)
+        self.health = np.zeros(n)
+        self.ammo = np.zeros(n, np.int64)
+        self.last_shot_time = np.zeros(n)
+        self.repairing = np.zeros(n, bool)
+        self.repair_target = np.zeros(n, np.int64)
+        self.repair_timer = np.zeros(n)
+        # Systems
+        self.system_repaired = np.zeros((n, self.max_systems), bool)
+        # Enemies
+        self.enemy_alive = np.zeros((n, m), bool)
+        self.enemy_type = np.zeros((n, m), np.int64)
+        self.enemy_pos = np.zeros((n, m, 2))
+        self.enemy_health = np.zeros((n, m))
+        self.enemy_last_shot = np.zeros((n, m))
+        self.enemy_last_hit = np.full((n, m), -np.inf)
+        # Bullets
+        self.bullet_alive = np.zeros((n, max_bullets), bool)
+        self.bullet_pos = np.zeros((n, max_bullets, 2))
+        self.bullet_vel = np.zeros((n, max_bullets, 2))
+        self.enemy_bullet_alive = np.zeros((n, max_enemy_bullets), bool)
+        self.enemy_bullet_pos = np.zeros((n, max_enemy_bullets, 2))
+        self.enemy_bullet_vel = np.zeros((n, max_enemy_bullets, 2))
+        self.enemy_bullet_damage = np.zeros((n, max_enemy_bullets))
+        # Powerups
+        self.powerup_alive = np.zeros((n, max_powerups), bool)
+        self.powerup_pos = np.zeros((n, max_powerups, 2))
+        self.powerup_type = np.zeros((n, max_powerups), np.int64)
+
+    # --- Setup ---
+    def _compile_levels(self):
+        """Stacks the layouts and precomputes walls, open cells, starts and systems."""
+        layouts = np.array(game.LEVEL_LAYOUTS, np.int64)  # All layouts share a size
+        self.num_levels, self.rows, self.cols = layouts.shape
+        self.walls = layouts == 1
+        self.world_size = np.array([self.cols, self.rows]) * game.CELL_SIZE
+
+        # Walls padded by the view radius so crops near the edge stay in bounds
+        r = self.view_radius
+        self.padded_walls = np.pad(self.walls, ((0, 0), (r, r), (r, r)), constant_values=True)
+
+        open_cells = [np.argwhere(layout == 0)[:, ::-1] for layout in layouts]  # (x, y)
+        self.max_open = max(len(cells) for cells in open_cells)
+        self.open_cells = np.zeros((self.num_levels, self.max_open, 2), np.int64)
+        self.open_count = np.array([len(cells) for cells in open_cells])
+        for i, cells in enumerate(open_cells):
+            self.open_cells[i, : len(cells)] = cells
+        # reset_level puts the player in the first open cell, row by row
+        self.start_pos = (self.open_cells[:, 0] + 0.5) * game.CELL_SIZE
+
+        system_cells = [np.argwhere(layout == 2)[:, ::-1] for layout in layouts]
+        self.max_systems = max(len(cells) for cells in system_cells)
+        self.system_pos_table = np.zeros((self.num_levels, self.max_systems, 2))
+        self.system_valid_table = np.zeros((self.num_levels, self.max_systems), bool)
+        for i, cells in enumerate(system_cells):
+            self.system_pos_table[i, : len(cells)] = (cells + 0.5) * game.CELL_SIZE
+            self.system_valid_table[i, : len(cells)] = True
+
+    def _compile_enemy_types(self):
+        """Turns the compiled enemy archetypes and SPAWN_COUNTS into per-type arrays and spawn rosters."""
+        props = [game.enemy_archetypes[game.enemy_type_ids[name]] for name in ENEMY_TYPE_NAMES]
+        self.type_speed = np.array([p["speed"] for p in props])
+        self.type_health = np.array([p["health"] for p in props], float)
+        self.type_damage = np.array([p["damage"] for p in props], float)
+        self.type_points = np.array([p["points"] for p in props], np.int64)
+        self.type_radius = np.array([p["radius"] for p in props])
+        self.type_shoot_range = np.array([p["shoot_range"] for p in props], float)
+        self.type_fire_rate = np.array([p["fire_rate"] for p in props], float)
+        # Same split as project.ENEMY_BEHAVIORS: turrets stand and fire, chasers move
+        self.type_turret = np.array([p["behavior"] == "turret" for p in props])
+
+        rosters = []
+        for level in range(1, self.num_levels + 1):
+            roster = []
+            for name, (base, per_level) in game.SPAWN_COUNTS.items():
+                roster += [ENEMY_TYPE_NAMES.index(name)] * max(0, base + per_level * level)
+            rosters.append(roster)
+        self.max_enemies = max(1, max(len(roster) for roster in rosters))
+        # -1 marks an unused enemy slot
+        self.roster_table = np.full((self.num_levels, self.max_enemies), -1, np.int64)
+        for i, roster in enumerate(rosters):
+            self.roster_table[i, : len(roster)] = roster
+
+    # --- Helpers ---
+    def _is_wall(self, level_index, x, y):
+        """Vectorized is_wall: level_index, x and y broadcast together."""
+        cell_x = np.floor(x / game.CELL_SIZE).astype(np.int64)
+        cell_y = np.floor(y / game.CELL_SIZE).astype(np.int64)
+        inside = (cell_x >= 0) & (cell_x < self.cols) & (cell_y >= 0) & (cell_y < self.rows)
+        wall = self.walls[
+            level_index, np.clip(cell_y, 0, self.rows - 1), np.clip(cell_x, 0, self.cols - 1)
+        ]
+        return wall | ~inside
+
+    @staticmethod
+    def _first_free(alive):
+        """Returns (slot, has_free) for the first dead slot of each row."""
+        free = ~alive
+        return free.argmax(axis=1), free.any(axis=1)
+
+    def _apply_player_damage(self, damage):
+        """Applies damage per env. Shields were never bought, so health takes it all."""
+        self.health -= damage
+
+    # --- Reset ---
+    def reset(self):
+        """Resets every instance and returns the first observations."""
+        self._reset_games(np.ones(self.num_envs, bool))
+        return self.observe()
+
+    def _reset_games(self, mask):
+        """Starts new games from level 1 in the masked instances."""
+        self.level[mask] = 1
+        self.score[mask] = 0
+        self.steps[mask] = 0
+        self.health[mask] = PLAYER_START["health"]
+        self.last_shot_time[mask] = -np.inf
+        self._load_levels(mask)
+
+    def _load_levels(self, mask):
+        """Mirrors reset_level() for the masked instances."""
+        envs = np.flatnonzero(mask)
+        if len(envs) == 0:
+            return
+        level_index = self.level[envs] - 1
+        self.player_pos[envs] = self.start_pos[level_index]
+        self.player_angle[envs] = 0.0
+        self.ammo[envs] = PLAYER_START["max_ammo"]
+        self.repairing[envs] = False
+        self.repair_timer[envs] = 0.0
+        self.system_repaired[envs] = ~self.system_valid_table[level_index]
+        self.bullet_alive[envs] = False
+        self.enemy_bullet_alive[envs] = False
+        self.powerup_alive[envs] = False
+
+        # Enemies: try a few random open cells far enough from the player
+        roster = self.roster_table[level_index]  # (k, M)
+        picks = self.rng.integers(
+            0, self.open_count[level_index][:, None, None], (len(envs), self.max_enemies, SPAWN_CANDIDATES)
+        )
+        cells = self.open_cells[level_index[:, None, None], picks]  # (k, M, T, 2)
+        positions = (cells + 0.5) * game.CELL_SIZE
+        far_enough = (
+            np.linalg.norm(positions - self.player_pos[envs][:, None, None], axis=-1)
+            >= MIN_SPAWN_DISTANCE
+        )
+        choice = far_enough.argmax(axis=-1)
+        self.enemy_pos[envs] = np.take_along_axis(
+            positions, choice[..., None, None], axis=2
+        )[:, :, 0]
+        self.enemy_alive[envs] = (roster >= 0) & far_enough.any(axis=-1)
+        self.enemy_type[envs] = np.maximum(roster, 0)
+        self.enemy_health[envs] = self.type_health[self.enemy_type[envs]]
+        self.enemy_last_shot[envs] = -np.inf
+        self.enemy_last_hit[envs] = -np.inf
+
+    # --- Step ---
+    def sample_actions(self):
+        """Returns uniformly random actions for every instance."""
+        actions = self.rng.integers(-1, 2, (self.num_envs, NUM_ACTIONS))
+        actions[:, ACTION_FIRE:] = self.rng.integers(0, 2, (self.num_envs, 2))
+        return actions
+
+    def step(self, actions):
+        """Advances every instance by one tick.
+
+        actions is an (N, 5) integer array (see the ACTION_* columns). Returns
+        (observations, rewards, dones, info). Rewards are score gained this tick,
+        and info holds "won" and "final_score" arrays for the finished games.
+        """
+        actions = np.asarray(actions)
+        score_before = self.score.copy()
+        self.time += self.dt
+        self.steps += 1
+
+        self._update_player(actions)
+        self._update_enemies()
+        self._update_bullets()
+        self._update_powerups()
+        self._check_level_complete()
+
+        won = self.level > self.num_levels
+        dones = (self.health <= 0) | won | (self.steps >= self.max_episode_steps)
+        rewards = (self.score - score_before).astype(np.float32)
+        info = {"won": won, "final_score": np.where(dones, self.score, 0)}
+        if dones.any():
+            self._reset_games(dones)
+        return self.observe(), rewards, dones, info
+
+    def _update_player(self, actions):
+        """Turning, movement with wall sliding, shooting and repairs."""
+        dt = self.dt
+        level_index = self.level - 1
+        was_repairing = self.repairing.copy()
+
+        self.player_angle = (
+            self.player_angle + actions[:, ACTION_TURN] * game.PLAYER_TURN_SPEED * dt
+        ) % 360
+        angle = np.radians(self.player_angle)
+        forward = actions[:, ACTION_FORWARD]
+        strafe = actions[:, ACTION_STRAFE]
+        # Strafing moves along angle + 90 degrees, as in update_player
+        move_x = forward * np.cos(angle) - strafe * np.sin(angle)
+        move_y = forward * np.sin(angle) + strafe * np.cos(angle)
+        magnitude = np.hypot(move_x, move_y)
+        moving = (magnitude > 0) & ~was_repairing
+        scale = np.where(moving, game.PLAYER_SPEED * dt / np.maximum(magnitude, 1e-9), 0.0)
+        x, y = self.player_pos[:, 0], self.player_pos[:, 1]
+        new_x = x + move_x * scale
+        new_y = y + move_y * scale
+        full = ~self._is_wall(level_index, new_x, new_y)
+        only_x = ~full & ~self._is_wall(level_index, new_x, y)
+        only_y = ~full & ~only_x & ~self._is_wall(level_index, x, new_y)
+        self.player_pos[:, 0] = np.where(full | only_x, new_x, x)
+        self.player_pos[:, 1] = np.where(full | only_y, new_y, y)
+
+        # Shooting (blocked while repairing, like mouse_click)
+        fire = (
+            (actions[:, ACTION_FIRE] > 0)
+            & ~was_repairing
+            & (self.ammo > 0)
+            & (self.time - self.last_shot_time >= PLAYER_START["fire_rate"])
+        )
+        slot, has_free = self._first_free(self.bullet_alive)
+        fire &= has_free
+        envs = np.flatnonzero(fire)
+        self.bullet_alive[envs, slot[envs]] = True
+        self.bullet_pos[envs, slot[envs]] = self.player_pos[envs]
+        self.bullet_vel[envs, slot[envs], 0] = np.cos(angle[envs]) * game.BULLET_SPEED
+        self.bullet_vel[envs, slot[envs], 1] = np.sin(angle[envs]) * game.BULLET_SPEED
+        self.ammo[envs] -= 1
+        self.last_shot_time[envs] = self.time[envs]
+
+        # Repairs
+        holding = actions[:, ACTION_REPAIR] > 0
+        system_pos = self.system_pos_table[level_index]  # (N, S, 2)
+        system_dist = np.linalg.norm(system_pos - self.player_pos[:, None], axis=-1)
+        target_dist = system_dist[self.env_index, self.repair_target]
+        continuing = was_repairing & holding & (target_dist < game.SYSTEM_REPAIR_RADIUS)
+        self.repair_timer = np.where(continuing, self.repair_timer + dt, 0.0)
+        complete = continuing & (self.repair_timer >= game.REPAIR_TIME)
+        self.system_repaired[complete, self.repair_target[complete]] = True
+        self.repairing = continuing & ~complete
+        self.repair_timer[complete] = 0.0
+
+        candidate_dist = np.where(self.system_repaired, np.inf, system_dist)
+        nearest = candidate_dist.argmin(axis=1)
+        starting = (
+            ~was_repairing
+            & holding
+            & (candidate_dist[self.env_index, nearest] < game.SYSTEM_REPAIR_RADIUS)
+        )
+        self.repairing |= starting
+        self.repair_target = np.where(starting, nearest, self.repair_target)
+
+    def _update_enemies(self):
+        """Chasing, sniper fire and contact damage."""
+        dt = self.dt
+        level_index = self.level - 1
+        alive = self.enemy_alive
+        etype = self.enemy_type
+        delta = self.player_pos[:, None] - self.enemy_pos  # (N, M, 2)
+        dist = np.hypot(delta[..., 0], delta[..., 1])
+        radius = self.type_radius[etype]
+
+        # Chasers step straight at the player unless that lands in a wall
+        turrets = self.type_turret[etype]
+        chasing = alive & ~turrets & (dist > radius * 1.5)
+        step = np.where(chasing, self.type_speed[etype] * dt / np.maximum(dist, 1e-9), 0.0)
+        new_pos = self.enemy_pos + delta * step[..., None]
+        blocked = self._is_wall(level_index[:, None], new_pos[..., 0], new_pos[..., 1])
+        moved = chasing & ~blocked
+        self.enemy_pos[moved] = new_pos[moved]
+
+        # Turrets fire along the line to the player
+        firing = (
+            alive
+            & turrets
+            & (dist <= self.type_shoot_range[etype])
+            & (self.time[:, None] - self.enemy_last_shot >= self.type_fire_rate[etype])
+        )
+        if firing.any():
+            direction = delta / np.maximum(dist, 1e-9)[..., None]
+            for j in np.flatnonzero(firing.any(axis=0)):
+                slot, has_free = self._first_free(self.enemy_bullet_alive)
+                envs = np.flatnonzero(firing[:, j] & has_free)
+                slots = slot[envs]
+                self.enemy_bullet_alive[envs, slots] = True
+                self.enemy_bullet_pos[envs, slots] = self.enemy_pos[envs, j]
+                self.enemy_bullet_vel[envs, slots] = direction[envs, j] * game.ENEMY_BULLET_SPEED
+                self.enemy_bullet_damage[envs, slots] = self.type_damage[etype[envs, j]]
+                self.enemy_last_shot[envs, j] = self.time[envs]
+
+        # Contact damage, at most once per interval per enemy
+        touching = (
+            alive
+            & (dist < game.PLAYER_RADIUS + radius)
+            & (self.time[:, None] - self.enemy_last_hit > game.ENEMY_COLLISION_DAMAGE_INTERVAL)
+        )
+        self._apply_player_damage((touching * self.type_damage[etype]).sum(axis=1))
+        self.enemy_last_hit = np.where(touching, self.time[:, None], self.enemy_last_hit)
+
+    def _update_bullets(self):
+        """Moves bullets, resolves hits on enemies and the player."""
+        dt = self.dt
+        level_index = self.level - 1
+
+        # Player bullets
+        self.bullet_pos += self.bullet_vel * dt
+        self.bullet_alive &= ~self._is_wall(
+            level_index[:, None], self.bullet_pos[..., 0], self.bullet_pos[..., 1]
+        )
+        # Only live bullets are tested, against every enemy slot of their instance
+        envs, bullets = np.nonzero(self.bullet_alive)
+        offset = self.bullet_pos[envs, bullets][:, None] - self.enemy_pos[envs]  # (K, M, 2)
+        radius = self.type_radius[self.enemy_type[envs]]
+        hits = self.enemy_alive[envs] & (
+            offset[..., 0] ** 2 + offset[..., 1] ** 2 < radius**2
+        )
+        bullet_hit = hits.any(axis=1)
+        if bullet_hit.any():
+            envs = envs[bullet_hit]
+            target = hits[bullet_hit].argmax(axis=1)  # Each bullet damages one enemy
+            flat = envs * self.max_enemies + target
+            hit_count = np.bincount(flat, minlength=self.num_envs * self.max_enemies)
+            self.enemy_health -= hit_count.reshape(self.enemy_health.shape) * game.BULLET_DAMAGE
+            self.bullet_alive[envs, bullets[bullet_hit]] = False
+
+            killed = self.enemy_alive & (self.enemy_health <= 0)
+            self.score += (killed * self.type_points[self.enemy_type]).sum(axis=1)
+            self.enemy_alive &= ~killed
+            for j in np.flatnonzero(killed.any(axis=0)):
+                self._spawn_powerups(killed[:, j], self.enemy_pos[:, j])
+
+        # Enemy bullets
+        self.enemy_bullet_pos += self.enemy_bullet_vel * dt
+        self.enemy_bullet_alive &= ~self._is_wall(
+            level_index[:, None], self.enemy_bullet_pos[..., 0], self.enemy_bullet_pos[..., 1]
+        )
+        to_player = self.enemy_bullet_pos - self.player_pos[:, None]
+        hit_player = self.enemy_bullet_alive & (
+            (to_player**2).sum(axis=-1) < game.PLAYER_RADIUS**2
+        )
+        self._apply_player_damage((hit_player * self.enemy_bullet_damage).sum(axis=1))
+        self.enemy_bullet_alive &= ~hit_player
+
+    def _spawn_powerups(self, mask, positions):
+        """Drops a random powerup at positions[i] for every masked instance."""
+        slot, has_free = self._first_free(self.powerup_alive)
+        envs = np.flatnonzero(mask & has_free)
+        self.powerup_alive[envs, slot[envs]] = True
+        self.powerup_pos[envs, slot[envs]] = positions[envs]
+        self.powerup_type[envs, slot[envs]] = self.rng.integers(0, 2, len(envs))
+
+    def _update_powerups(self):
+        """Picks up powerups within reach of the player."""
+        offset = self.powerup_pos - self.player_pos[:, None]
+        picked = self.powerup_alive & (
+            (offset**2).sum(axis=-1) < game.POWERUP_PICKUP_RADIUS**2
+        )
+        health_packs = (picked & (self.powerup_type == POWERUP_HEALTH)).sum(axis=1)
+        ammo_packs = (picked & (self.powerup_type == POWERUP_AMMO)).sum(axis=1)
+        self.health = np.minimum(PLAYER_START["max_health"], self.health + 20 * health_packs)
+        self.ammo = np.minimum(PLAYER_START["max_ammo"], self.ammo + 10 * ammo_packs)
+        self.powerup_alive &= ~picked
+
+    def _check_level_complete(self):
+        """Awards the level bonus and loads the next level when all systems are fixed."""
+        complete = self.system_repaired.all(axis=1) & (self.health > 0)
+        if complete.any():
+            self.score += np.where(complete, self.level * 50, 0)
+            self.level += complete
+            self._load_levels(complete & (self.level <= self.num_levels))
+
+    # --- Observations ---
+    def observe(self):
+        """Returns {"grid": (N, C, K, K) float32, "vector": (N, 5) float32}.
+
+        The grid is a K x K cell crop centred on the player with wall, enemy,
+        unrepaired system, powerup and enemy bullet channels. The vector holds
+        health, ammo and repair progress fractions and the facing as sin/cos.
+        """
+        n = self.num_envs
+        k = self.view_size
+        r = self.view_radius
+        level_index = np.minimum(self.level, self.num_levels) - 1
+        player_cell = np.floor(self.player_pos / game.CELL_SIZE).astype(np.int64)
+        offsets = np.arange(k)
+        rows = player_cell[:, 1, None] + offsets  # Padded coordinates
+        cols = player_cell[:, 0, None] + offsets
+
+        walls = self.padded_walls[level_index[:, None, None], rows[:, :, None], cols[:, None, :]]
+
+        # Entity channels are counts, gathered into one flat bincount
+        flat_indices = []
+        for channel, positions, alive in (
+            (OBS_ENEMY, self.enemy_pos, self.enemy_alive),
+            (OBS_SYSTEM, self.system_pos_table[level_index], ~self.system_repaired),
+            (OBS_POWERUP, self.powerup_pos, self.powerup_alive),
+            (OBS_ENEMY_BULLET, self.enemy_bullet_pos, self.enemy_bullet_alive),
+        ):
+            envs, items = np.nonzero(alive)
+            cell = (
+                np.floor(positions[envs, items] / game.CELL_SIZE).astype(np.int64)
+                - player_cell[envs]
+                + r
+            )
+            inside = ((cell >= 0) & (cell < k)).all(axis=1)
+            envs, cell = envs[inside], cell[inside]
+            flat_indices.append(((envs * NUM_OBS_CHANNELS + channel) * k + cell[:, 1]) * k + cell[:, 0])
+        counts = np.bincount(np.concatenate(flat_indices), minlength=n * NUM_OBS_CHANNELS * k * k)
+        grid = counts.astype(np.float32).reshape(n, NUM_OBS_CHANNELS, k, k)
+        grid[:, OBS_WALL] = walls
+
+        angle = np.radians(self.player_angle)
+        vector = np.stack(
+            [
+                self.health / PLAYER_START["max_health"],
+                self.ammo / PLAYER_START["max_ammo"],
+                self.repair_timer / game.REPAIR_TIME,
+                np.sin(angle),
+                np.cos(angle),
+            ],
+            axis=1,
+        ).astype(np.float32)
+        return {"grid": grid, "vector": vector}
+
+
+def benchmark(num_envs=1024, steps=200, seed=0):
+    """Returns env-steps per second for random actions."""
+    import time
+
+    env = VecEnv(num_envs, seed=seed)
+    env.reset()
+    actions = [env.sample_actions() for _ in range(8)]
+    start = time.perf_counter()
+    for i in range(steps):
+        env.step(actions[i % len(actions)])
+    return num_envs * steps / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    print(f"{benchmark():,.0f} env-steps/sec")